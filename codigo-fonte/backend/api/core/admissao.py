@@ -0,0 +1,140 @@
+"""
+Controle de admissão por prioridade (noite de torneio).
+
+Quando a instância satura, reporte de resultado, ações de rodada e navegação/polling
+disputam os mesmos workers e tudo fica lento por igual. O AdmissaoMiddleware classifica cada
+requisição já roteada e limita quantas de cada classe ficam em andamento ao mesmo tempo:
+
+- alta: reporte/edição de resultado e transições de rodada e torneio (ACOES_ALTA);
+- baixa: feed de torneios, estatísticas e documentação da API (ACOES_BAIXA, ROTAS_BAIXA);
+- normal: o restante.
+
+Uma requisição cuja classe já está no limite (settings.ADMISSAO_LIMITES) é recusada na hora
+com 503 e `Retry-After`, sem esperar na fila. Sob pressão (ADMISSAO_PRESSAO requisições em
+andamento somando todas as classes), as de prioridade baixa são recusadas mesmo com vagas na
+própria classe, deixando a capacidade para os caminhos críticos. O stream SSE (conexão longa)
+não é controlado.
+
+Os contadores são por processo: o controle só tem efeito com workers que atendem várias
+requisições ao mesmo tempo (gunicorn gthread ou ASGI). Por isso o middleware só é instalado com
+ADMISSAO_ATIVA (ver settings).
+"""
+
+import threading
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import JsonResponse
+
+ALTA = 'alta'
+NORMAL = 'normal'
+BAIXA = 'baixa'
+
+# Ações (ViewSets do DRF) dos caminhos críticos
+ACOES_ALTA = {
+    'reportar_resultado', 'editar_manual', 'editar_jogadores',
+    'iniciar', 'proxima_rodada', 'finalizar',
+    'emparelhar_automatico', 'reemparelhar', 'editar_emparelhamento', 'iniciar_rodada',
+}
+
+# (basename do ViewSet, ação) de prioridade baixa; ação None vale para todas
+ACOES_BAIXA = {('torneio', 'list'), ('estatistica', None)}
+ROTAS_BAIXA = {'schema-json', 'schema-swagger-ui', 'schema-redoc'}
+
+# Rotas fora do controle (conexões longas)
+ROTAS_IGNORADAS = {'torneio-eventos'}
+
+ATRIBUTO_CLASSE = '_classe_admissao'
+
+
+def classificar(request, view_func):
+    """Classe de prioridade da requisição, ou None quando ela não é controlada."""
+    nome_rota = request.resolver_match.url_name if request.resolver_match else None
+    if nome_rota in ROTAS_IGNORADAS:
+        return None
+    if nome_rota in ROTAS_BAIXA:
+        return BAIXA
+
+    acoes = getattr(view_func, 'actions', None)
+    if acoes is None:
+        return NORMAL
+    acao = acoes.get(request.method.lower())
+    basename = getattr(view_func, 'initkwargs', {}).get('basename')
+    if acao in ACOES_ALTA:
+        return ALTA
+    if (basename, acao) in ACOES_BAIXA or (basename, None) in ACOES_BAIXA:
+        return BAIXA
+    return NORMAL
+
+
+class ControleAdmissao:
+    """Contadores de requisições em andamento por classe (thread-safe)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.em_andamento = {ALTA: 0, NORMAL: 0, BAIXA: 0}
+
+    def admitir(self, classe):
+        """Reserva uma vaga para a classe; retorna False se a requisição deve ser recusada."""
+        with self._lock:
+            if self.em_andamento[classe] >= settings.ADMISSAO_LIMITES[classe]:
+                return False
+            if classe == BAIXA and sum(self.em_andamento.values()) >= settings.ADMISSAO_PRESSAO:
+                return False
+            self.em_andamento[classe] += 1
+            return True
+
+    def liberar(self, classe):
+        with self._lock:
+            self.em_andamento[classe] -= 1
+
+
+controle = ControleAdmissao()
+
+
+class AdmissaoMiddleware:
+    """
+    Aplica o controle de admissão. A classificação usa a rota resolvida (process_view);
+    a vaga é liberada quando a resposta volta por este middleware.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        try:
+            return self.get_response(request)
+        finally:
+            self._liberar(request)
+
+    async def __acall__(self, request):
+        try:
+            return await self.get_response(request)
+        finally:
+            self._liberar(request)
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        classe = classificar(request, view_func)
+        if classe is None:
+            return None
+        if not controle.admitir(classe):
+            espera = settings.ADMISSAO_RETRY_AFTER[classe]
+            response = JsonResponse(
+                {"detail": f"Servidor sobrecarregado. Tente novamente em {espera} segundo(s)."}, status=503
+            )
+            response['Retry-After'] = str(espera)
+            return response
+        setattr(request, ATRIBUTO_CLASSE, classe)
+        return None
+
+    def _liberar(self, request):
+        classe = getattr(request, ATRIBUTO_CLASSE, None)
+        if classe is not None:
+            delattr(request, ATRIBUTO_CLASSE)
+            controle.liberar(classe)
@@ -5,6 +5,14 @@ It exposes the ASGI callable as a module-level variable named ``application``.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
+
+O stream SSE de eventos dos torneios (/api/v1/torneios/torneios/{id}/eventos/) é uma
+view assíncrona e só é servido por este módulo, por exemplo:
+
+    gunicorn core.asgi:application -k uvicorn.workers.UvicornWorker
+
+Sob WSGI (core/wsgi.py) a rota responde 404, pois cada conexão SSE aberta prenderia um
+worker inteiro.
 """
 
 import os
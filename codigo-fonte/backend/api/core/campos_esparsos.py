@@ -0,0 +1,147 @@
+"""
+Campos esparsos (sparse fieldsets) nas respostas de leitura.
+
+O cliente escolhe os campos da resposta pela query string:
+
+    GET /api/v1/torneios/?fields=id,nome,data_inicio,status
+    GET /api/v1/inscricoes/?omit=email,decklist
+
+- CamposEsparsosMixin (serializers): remove da saída os campos não solicitados. Só atua
+  em requisições GET/HEAD e no serializer principal da view (o que recebe o `request`
+  no contexto); serializers aninhados e a validação de escrita não mudam.
+- CamposEsparsosFilter (filter backend): remove do SELECT as colunas que nenhum campo
+  restante usa (`defer()`) e descarta joins (`select_related`) e prefetches que ficaram
+  sem uso. Atua em `list` e `retrieve`.
+
+SerializerMethodFields não têm `source`; quando dependem de colunas do model, declare-as
+em `Meta.campos_dependentes = {'campo': ('coluna', ...)}` para que não sejam adiadas.
+"""
+
+from rest_framework.filters import BaseFilterBackend
+from rest_framework.relations import RelatedField
+
+PARAMETRO_CAMPOS = 'fields'
+PARAMETRO_OMITIR = 'omit'
+
+METODOS_LEITURA = ('GET', 'HEAD')
+
+
+def _lista_parametro(request, nome):
+    valor = request.query_params.get(nome, '')
+    return {campo.strip() for campo in valor.split(',') if campo.strip()}
+
+
+def campos_solicitados(request):
+    """
+    Retorna (campos, omitidos) pedidos na query string, ou (None, set()) quando a
+    requisição não pede campos esparsos.
+    """
+    if request is None or request.method not in METODOS_LEITURA:
+        return None, set()
+    return _lista_parametro(request, PARAMETRO_CAMPOS) or None, _lista_parametro(request, PARAMETRO_OMITIR)
+
+
+class CamposEsparsosMixin:
+    """Mixin para ModelSerializers: aplica ?fields= e ?omit= à saída."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        campos, omitidos = campos_solicitados(self.context.get('request'))
+        if campos is None and not omitidos:
+            return
+
+        for nome in list(self.fields):
+            if (campos is not None and nome not in campos) or nome in omitidos:
+                self.fields.pop(nome)
+
+
+def _raiz(caminho):
+    return caminho.replace('.', '__').split('__')[0]
+
+
+def caminhos_necessarios(serializer):
+    """Primeiro nível dos caminhos (`source`) que os campos restantes do serializer leem."""
+    dependentes = getattr(getattr(serializer, 'Meta', None), 'campos_dependentes', {})
+    raizes = set()
+    for nome, campo in serializer.fields.items():
+        if isinstance(campo, RelatedField) and campo.use_pk_only_optimization():
+            # Lê apenas a coluna da FK (nunca adiada), sem carregar o objeto relacionado
+            continue
+        if campo.source == '*':
+            raizes.update(_raiz(caminho) for caminho in dependentes.get(nome, ()))
+        else:
+            raizes.add(_raiz(campo.source))
+    return raizes
+
+
+class CamposEsparsosFilter(BaseFilterBackend):
+    """
+    Filter backend que reduz o queryset aos campos pedidos em ?fields= / ?omit=.
+    Deve ser usado junto com serializers que herdam de CamposEsparsosMixin.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        campos, omitidos = campos_solicitados(request)
+        if (campos is None and not omitidos) or getattr(view, 'action', None) not in ('list', 'retrieve'):
+            return queryset
+
+        necessarios = caminhos_necessarios(view.get_serializer())
+        # Campos da ordenação por keyset são lidos do último registro para montar o cursor
+        necessarios.update(_raiz(campo.lstrip('-')) for campo in getattr(view, 'ordenacao_keyset', ()))
+
+        modelo = queryset.model
+        adiados = [
+            campo.name for campo in modelo._meta.concrete_fields
+            if not campo.primary_key and not campo.is_relation and campo.name not in necessarios
+        ]
+        if adiados:
+            queryset = queryset.defer(*adiados)
+
+        return self._remover_relacoes_sem_uso(queryset, necessarios)
+
+    def _remover_relacoes_sem_uso(self, queryset, necessarios):
+        select_related = queryset.query.select_related
+        if isinstance(select_related, dict) and set(select_related) - necessarios:
+            mantidos = [nome for nome in select_related if nome in necessarios]
+            queryset = queryset.select_related(None)
+            if mantidos:
+                queryset = queryset.select_related(*self._caminhos_select_related(select_related, mantidos))
+
+        prefetches = queryset._prefetch_related_lookups
+        mantidos = [
+            lookup for lookup in prefetches
+            if _raiz(getattr(lookup, 'prefetch_to', lookup)) in necessarios
+        ]
+        if len(mantidos) != len(prefetches):
+            queryset = queryset.prefetch_related(None).prefetch_related(*mantidos)
+        return queryset
+
+    def _caminhos_select_related(self, arvore, nomes, prefixo=''):
+        """Converte a árvore de query.select_related de volta em caminhos 'a__b'."""
+        caminhos = []
+        for nome in nomes:
+            caminho = f'{prefixo}{nome}'
+            filhos = arvore[nome]
+            if filhos:
+                caminhos.extend(self._caminhos_select_related(filhos, list(filhos), f'{caminho}__'))
+            else:
+                caminhos.append(caminho)
+        return caminhos
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': PARAMETRO_CAMPOS,
+                'required': False,
+                'in': 'query',
+                'description': 'Campos da resposta, separados por vírgula (ex.: id,nome,status)',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': PARAMETRO_OMITIR,
+                'required': False,
+                'in': 'query',
+                'description': 'Campos a remover da resposta, separados por vírgula',
+                'schema': {'type': 'string'},
+            },
+        ]
@@ -0,0 +1,152 @@
+"""
+Paginação por keyset (cursor) para os endpoints de listagem.
+
+Em vez de OFFSET e COUNT(*), cada página continua a partir dos valores de ordenação do
+último registro da página anterior (`WHERE (a, b, id) > (x, y, z)`), então o custo de
+uma página profunda é o mesmo da primeira.
+
+A paginação é opcional por cliente: sem os parâmetros `limite` ou `cursor`, a listagem
+continua retornando a lista completa, como antes. Com eles, a resposta passa a ser:
+
+    {"proximo": "<url da próxima página ou null>", "resultados": [...]}
+
+A view define a ordenação em `ordenacao_keyset`, que deve terminar em um campo único
+(normalmente `id`) para desempatar. Campos precedidos de '-' são decrescentes.
+Um cursor malformado ou adulterado responde 400.
+"""
+
+import base64
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldError, ValidationError as DjangoValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from rest_framework.exceptions import ParseError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class PaginacaoKeyset(BasePagination):
+    """Paginação por keyset, ativada quando o cliente envia `limite` ou `cursor`."""
+
+    parametro_cursor = 'cursor'
+    parametro_limite = 'limite'
+    limite_padrao = 50
+    limite_maximo = 200
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.parametro_cursor not in request.query_params and self.parametro_limite not in request.query_params:
+            return None
+
+        self.request = request
+        self.ordenacao = tuple(getattr(view, 'ordenacao_keyset', ('id',)))
+        self.limite = self._obter_limite(request)
+
+        queryset = queryset.order_by(*self.ordenacao)
+        cursor = request.query_params.get(self.parametro_cursor)
+        if cursor:
+            queryset = queryset.filter(self._filtro_apos(queryset, self._decodificar(cursor)))
+
+        # Busca um registro a mais só para saber se existe próxima página
+        resultados = list(queryset[:self.limite + 1])
+        self.tem_proxima = len(resultados) > self.limite
+        self.pagina = resultados[:self.limite]
+        return self.pagina
+
+    def get_paginated_response(self, data):
+        return Response({
+            'proximo': self._link_proximo(),
+            'resultados': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['resultados'],
+            'properties': {
+                'proximo': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'resultados': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.parametro_cursor,
+                'required': False,
+                'in': 'query',
+                'description': 'Cursor da página (valor retornado em "proximo")',
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.parametro_limite,
+                'required': False,
+                'in': 'query',
+                'description': f'Itens por página (padrão {self.limite_padrao}, máximo {self.limite_maximo})',
+                'schema': {'type': 'integer'},
+            },
+        ]
+
+    def _obter_limite(self, request):
+        try:
+            limite = int(request.query_params[self.parametro_limite])
+        except (KeyError, ValueError):
+            return self.limite_padrao
+        return min(max(limite, 1), self.limite_maximo)
+
+    def _campos(self):
+        """Pares (nome do campo, decrescente) da ordenação."""
+        return [(campo.lstrip('-'), campo.startswith('-')) for campo in self.ordenacao]
+
+    def _filtro_apos(self, queryset, valores):
+        """
+        Monta (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND id > z),
+        respeitando a direção de cada campo.
+        """
+        campos = self._campos()
+        if len(valores) != len(campos):
+            raise ParseError('Cursor inválido.')
+
+        try:
+            valores = [
+                queryset.query.resolve_ref(nome).output_field.to_python(valor)
+                for (nome, _), valor in zip(campos, valores)
+            ]
+        except (DjangoValidationError, FieldError, TypeError, ValueError):
+            raise ParseError('Cursor inválido.')
+
+        condicoes = []
+        for i, (nome, decrescente) in enumerate(campos):
+            iguais = {campos[j][0]: valores[j] for j in range(i)}
+            operador = 'lt' if decrescente else 'gt'
+            condicoes.append(Q(**iguais, **{f'{nome}__{operador}': valores[i]}))
+        return reduce(or_, condicoes)
+
+    def _link_proximo(self):
+        if not self.tem_proxima:
+            return None
+
+        url = self.request.build_absolute_uri()
+        ultimo = self.pagina[-1]
+        valores = [getattr(ultimo, nome) for nome, _ in self._campos()]
+        url = replace_query_param(url, self.parametro_limite, self.limite)
+        return replace_query_param(url, self.parametro_cursor, self._codificar(valores))
+
+    def _codificar(self, valores):
+        # isoformat() mantém os microssegundos (o DjangoJSONEncoder trunca em milissegundos)
+        valores = [valor.isoformat() if hasattr(valor, 'isoformat') else valor for valor in valores]
+        conteudo = json.dumps(valores, cls=DjangoJSONEncoder, separators=(',', ':'))
+        return base64.urlsafe_b64encode(conteudo.encode()).decode().rstrip('=')
+
+    def _decodificar(self, cursor):
+        try:
+            conteudo = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            valores = json.loads(conteudo)
+        except (ValueError, TypeError):
+            raise ParseError('Cursor inválido.')
+        if not isinstance(valores, list):
+            raise ParseError('Cursor inválido.')
+        return valores
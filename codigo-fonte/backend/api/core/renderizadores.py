@@ -0,0 +1,109 @@
+"""
+Renderers e parsers do Django Rest Framework com serialização mais rápida.
+
+- ORJSONRenderer / ORJSONParser: JSON via orjson (implementado em Rust), bem mais rápido que
+  o `json` da biblioteca padrão usado pelo JSONRenderer do DRF. datetime, date, time e UUID
+  são serializados nativamente; Decimal e os demais tipos seguem as mesmas regras do
+  encoder do DRF.
+- MessagePackRenderer / MessagePackParser: formato binário compacto. O cliente escolhe pelo
+  cabeçalho `Accept: application/msgpack` (ver REST_FRAMEWORK em settings.py).
+
+Compare tamanho e tempo de renderização com `python manage.py benchmark_renderizacao`.
+"""
+
+import datetime
+import decimal
+import uuid
+
+import msgpack
+import orjson
+from django.db.models.query import QuerySet
+from django.utils.encoding import force_str
+from django.utils.functional import Promise
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+from rest_framework.renderers import BaseRenderer
+
+
+def _converter(obj):
+    """Tipos que o orjson/msgpack não serializam nativamente (mesmas regras do encoder do DRF)."""
+    if isinstance(obj, Promise):
+        return force_str(obj)
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, QuerySet):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if hasattr(obj, '__getitem__') and hasattr(obj, 'keys'):
+        return dict(obj)
+    if hasattr(obj, '__iter__'):
+        return list(obj)
+    raise TypeError(f'Tipo não serializável: {type(obj).__name__}')
+
+
+def _converter_msgpack(obj):
+    """msgpack também não conhece datas e UUID: usa o mesmo formato do JSON."""
+    if isinstance(obj, datetime.datetime):
+        representacao = obj.isoformat()
+        return representacao[:-6] + 'Z' if representacao.endswith('+00:00') else representacao
+    if isinstance(obj, (datetime.date, datetime.time)):
+        return obj.isoformat()
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    return _converter(obj)
+
+
+class ORJSONRenderer(BaseRenderer):
+    """Renderer JSON usando orjson. Aceita `; indent=N` no Accept, como o JSONRenderer do DRF."""
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        opcoes = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+        if accepted_media_type and 'indent=' in accepted_media_type:
+            opcoes |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_converter, option=opcoes)
+
+
+class ORJSONParser(BaseParser):
+    """Parser JSON usando orjson."""
+    media_type = 'application/json'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """Renderer MessagePack (binário)."""
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_converter_msgpack, use_bin_type=True)
+
+
+class MessagePackParser(BaseParser):
+    """Parser MessagePack."""
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except Exception as exc:
+            raise ParseError(f'MessagePack parse error - {exc}')
@@ -69,6 +69,13 @@ else:
     EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
     DEFAULT_FROM_EMAIL = env('EMAIL_USER', default='noreply@commander150.com')
 
+# Caixa de saída de e-mails (ver usuarios/caixa_saida.py): as views enfileiram e o envio pelo
+# EMAIL_BACKEND é feito fora da requisição. Intervalo em segundos da thread de envio no processo
+# web (além de acordar a cada e-mail enfileirado); 0 desativa (use o comando enviar_emails)
+CAIXA_SAIDA_INTERVALO = env.int('CAIXA_SAIDA_INTERVALO', default=60)
+# Dias que os e-mails enviados ou descartados ficam na tabela (limpeza no comando enviar_emails)
+CAIXA_SAIDA_RETENCAO_DIAS = env.int('CAIXA_SAIDA_RETENCAO_DIAS', default=30)
+
 # Configuração do CORS e CSRF
 CORS_ALLOW_ALL_ORIGINS = False
 CORS_ALLOWED_ORIGINS = env.list('CORS_ALLOWED_ORIGINS', default=[])
@@ -86,12 +93,19 @@ SESSION_COOKIE_DOMAIN = None  # Permite que o cookie funcione com diferentes dom
 # das requisições. Já que estamos trabalhando com uma API e não um site, é aceitável.
 SESSION_COOKIE_SAMESITE = 'None'
 SESSION_COOKIE_AGE = 1209600  # 2 semanas em segundos (opcional)
-SESSION_SAVE_EVERY_REQUEST = True  # Renova a sessão a cada request
-SESSION_ENGINE = "django.contrib.sessions.backends.db"
+# Renovação fracionada da sessão (ver usuarios/sessoes.py): a expiração é renovada quando passa
+# SESSOES_FRACAO_RENOVACAO de SESSION_COOKIE_AGE desde a última renovação, em vez de um UPDATE
+# em django_session a cada request. O engine é escolhido após CACHES (abaixo). Sessões
+# expiradas: agende `python manage.py clearsessions`.
+SESSION_SAVE_EVERY_REQUEST = False
+SESSOES_FRACAO_RENOVACAO = env.float('SESSOES_FRACAO_RENOVACAO', default=0.1)
+SESSOES_CACHE_TEMPO = env.int('SESSOES_CACHE_TEMPO', default=300)  # segundos de uma sessão no cache
 
 # Configuração do modelo de usuário customizado
 AUTH_USER_MODEL = 'usuarios.Usuario'
 
+# Autenticação: o backend com cache do usuário é escolhido após CACHES (abaixo)
+
 # Garantir que createsuperuser defina tipo=ADMIN
 DJANGO_SUPERUSER_TIPO = 'ADMIN'
 
@@ -103,7 +117,78 @@ REST_FRAMEWORK = {
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
     ],
+    # JSON via orjson e MessagePack (Accept: application/msgpack); ver core/renderizadores.py
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderizadores.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+        "core.renderizadores.MessagePackRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.renderizadores.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+        "core.renderizadores.MessagePackParser",
+    ],
+}
+
+# Cache (cache de respostas dos endpoints públicos e snapshots de torneio)
+# Padrão em memória do processo; para compartilhar entre workers use, por exemplo,
+# CACHE_URL=filecache:///var/tmp/commander150 ou um Redis/Memcached.
+CACHES = {
+    'default': env.cache('CACHE_URL', default='locmemcache://commander150'),
+}
+# Cache visto por todos os workers (mesma regra de usuarios/checks.py)
+CACHE_COMPARTILHADO = CACHES['default']['BACKEND'] not in (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+# Sessões em banco com cache na frente (cached_db) só com cache compartilhado: com cache por
+# processo, um logout em um worker não valeria nos outros
+SESSION_ENGINE = "usuarios.sessoes" if CACHE_COMPARTILHADO else "django.contrib.sessions.backends.db"
+
+# Usuário da sessão em cache, sem SELECT em usuarios_usuario a cada request (ver
+# usuarios/backends.py), também só com cache compartilhado: a invalidação após troca de senha,
+# de tipo ou desativação precisa valer em todos os workers. O ModelBackend continua na lista
+# para as sessões abertas antes da troca de backend, que ficam válidas até o próximo login.
+AUTHENTICATION_BACKENDS = [
+    *(['usuarios.backends.ModelBackendComCache'] if CACHE_COMPARTILHADO else []),
+    'django.contrib.auth.backends.ModelBackend',
+]
+USUARIO_CACHE_TEMPO = env.int('USUARIO_CACHE_TEMPO', default=300)  # segundos
+# Cache de respostas (ver torneios/cache_respostas.py); o feed de torneios só é guardado com
+# CACHE_COMPARTILHADO, pois sua invalidação fica no próprio cache
+CACHE_RESPOSTAS_TEMPO = env.int('CACHE_RESPOSTAS_TEMPO', default=300)  # segundos
+
+# Eventos em tempo real (SSE) dos torneios
+# BackendLocal entrega eventos apenas dentro do mesmo processo. Para vários workers,
+# configure um backend compartilhado que implemente a mesma interface.
+EVENTOS_BACKEND = env('EVENTOS_BACKEND', default='torneios.eventos.BackendLocal')
+EVENTOS_SSE_KEEP_ALIVE = 15  # segundos entre comentários de keep-alive no stream
+EVENTOS_TAMANHO_FILA = 100  # eventos pendentes por conexão antes de descartar (cliente lento)
+
+# Importação em lote de jogadores (ver usuarios/importacao.py)
+# Processos do pool de hashing de senhas do comando importar_jogadores; 0 usa todos os núcleos,
+# 1 calcula no próprio processo. O endpoint sempre calcula no próprio processo (~0,3 s por senha),
+# então o limite por requisição mantém o pior caso em poucos segundos, longe do timeout do worker
+# (30 s no gunicorn). Planilhas maiores: use o comando.
+IMPORTACAO_PROCESSOS = env.int('IMPORTACAO_PROCESSOS', default=0)
+MAXIMO_IMPORTACAO_REQUISICAO = 10  # linhas por requisição no endpoint
+
+# Controle de admissão por prioridade (ver core/admissao.py). Os contadores são por processo:
+# só tem efeito com workers que atendem várias requisições ao mesmo tempo (ASGI, como no
+# comando de início do Render, ou gunicorn gthread). Com workers síncronos (uma requisição por
+# processo) os limites nunca são atingidos, por isso o middleware só entra com ADMISSAO_ATIVA.
+ADMISSAO_ATIVA = env.bool('ADMISSAO_ATIVA', default=False)
+# Máximo de requisições em andamento por classe; acima disso responde 503 com Retry-After
+ADMISSAO_LIMITES = {
+    'alta': env.int('ADMISSAO_LIMITE_ALTA', default=16),
+    'normal': env.int('ADMISSAO_LIMITE_NORMAL', default=8),
+    'baixa': env.int('ADMISSAO_LIMITE_BAIXA', default=4),
 }
+# Total em andamento (todas as classes) a partir do qual as de prioridade baixa são recusadas
+ADMISSAO_PRESSAO = env.int('ADMISSAO_PRESSAO', default=6)
+ADMISSAO_RETRY_AFTER = {'alta': 1, 'normal': 2, 'baixa': 5}  # segundos
 
 # Aplicações instaladas
 INSTALLED_APPS = [
@@ -125,10 +210,13 @@ INSTALLED_APPS = [
 # Middlewares
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    # Controle de admissão por prioridade (ver ADMISSAO_ATIVA acima)
+    *(['core.admissao.AdmissaoMiddleware'] if ADMISSAO_ATIVA else []),
     'django.contrib.sessions.middleware.SessionMiddleware',
     'corsheaders.middleware.CorsMiddleware',  # Deve vir antes de CommonMiddleware
     'django.middleware.common.CommonMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'usuarios.sessoes.RenovacaoSessaoMiddleware',  # Depois do SessionMiddleware
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -155,6 +243,7 @@ TEMPLATES = [
 
 # WSGI Application
 WSGI_APPLICATION = 'core.wsgi.application'
+ASGI_APPLICATION = 'core.asgi.application'
 
 # Validação de senha
 AUTH_PASSWORD_VALIDATORS = [
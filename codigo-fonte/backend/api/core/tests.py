@@ -0,0 +1,79 @@
+import datetime
+import io
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from usuarios.models import Usuario
+from . import admissao
+from .renderizadores import MessagePackParser, MessagePackRenderer, ORJSONParser, ORJSONRenderer
+
+
+class RenderizadoresTests(SimpleTestCase):
+    """
+    Testes de ida e volta dos renderers/parsers (core/renderizadores.py): Decimal vira número
+    e datetime vira texto ISO 8601 em UTC com 'Z', como no JSONRenderer do DRF.
+    """
+
+    dados = {
+        'omw': Decimal('0.3333'),
+        'criado_em': datetime.datetime(2025, 10, 4, 18, 30, 15, tzinfo=datetime.timezone.utc),
+        'data': datetime.date(2025, 10, 4),
+        'jogadores': [1, 2],
+    }
+    esperado = {
+        'omw': 0.3333,
+        'criado_em': '2025-10-04T18:30:15Z',
+        'data': '2025-10-04',
+        'jogadores': [1, 2],
+    }
+
+    def test_ida_e_volta_json(self):
+        conteudo = ORJSONRenderer().render(self.dados, 'application/json')
+
+        self.assertEqual(ORJSONParser().parse(io.BytesIO(conteudo)), self.esperado)
+
+    def test_ida_e_volta_msgpack(self):
+        conteudo = MessagePackRenderer().render(self.dados, 'application/msgpack')
+
+        self.assertEqual(MessagePackParser().parse(io.BytesIO(conteudo)), self.esperado)
+
+
+# Middleware instalado como em settings com ADMISSAO_ATIVA (logo após o SecurityMiddleware)
+@override_settings(MIDDLEWARE=[settings.MIDDLEWARE[0], 'core.admissao.AdmissaoMiddleware', *settings.MIDDLEWARE[1:]])
+class AdmissaoTests(TestCase):
+    """
+    Testes do controle de admissão por prioridade (core/admissao.py).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.jogador = Usuario.objects.create_user(
+            email='jogador@teste.com', username='jogador', password='senha', tipo='JOGADOR'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.jogador)
+
+    def test_sob_pressao_recusa_apenas_prioridade_baixa(self):
+        # Simula requisições de prioridade normal em andamento até o limite de pressão
+        for _ in range(settings.ADMISSAO_PRESSAO):
+            self.assertTrue(admissao.controle.admitir(admissao.NORMAL))
+        try:
+            feed = self.client.get('/api/v1/torneios/torneios/')
+            detalhe = self.client.get('/api/v1/auth/validar-sessao/')
+        finally:
+            for _ in range(settings.ADMISSAO_PRESSAO):
+                admissao.controle.liberar(admissao.NORMAL)
+
+        self.assertEqual(feed.status_code, 503)
+        self.assertEqual(feed['Retry-After'], '5')
+        self.assertEqual(detalhe.status_code, 200)
+        # Vagas liberadas ao fim de cada requisição
+        self.assertEqual(admissao.controle.em_andamento, {'alta': 0, 'normal': 0, 'baixa': 0})
+        self.assertEqual(self.client.get('/api/v1/torneios/torneios/').status_code, 200)
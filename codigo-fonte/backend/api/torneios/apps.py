@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class TorneiosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'torneios'
+
+    def ready(self):
+        # Registra os receivers que mantêm a versão dos torneios
+        from . import signals  # noqa: F401
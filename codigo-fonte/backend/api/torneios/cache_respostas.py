@@ -0,0 +1,88 @@
+"""
+Cache de respostas dos endpoints públicos de leitura (Django cache framework).
+
+A chave combina o endpoint, os parâmetros da requisição, o papel de quem consulta e um
+marcador de invalidação:
+
+- Endpoints de um torneio (ranking, mesas) usam a `versao` do torneio (ver versoes.py),
+  que já é incrementada por todas as gravações que o afetam. Uma alteração gera chaves
+  novas e as antigas apenas expiram.
+- O feed de torneios usa uma geração guardada no próprio cache, avançada (cache.incr) a cada
+  incremento de versão de torneio (ver versoes.py) e a cada alteração de loja, cujo nome o
+  feed exibe (ver signals.py). Ler a geração não consulta o banco. Como o avanço só é visto
+  por quem compartilha o cache, o feed só é guardado com CACHE_COMPARTILHADO.
+
+O papel entra na chave porque a visibilidade muda por usuário: lojas só enxergam os
+próprios torneios, os demais tipos enxergam o mesmo conteúdo entre si.
+"""
+
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import urlencode
+from rest_framework import status
+from rest_framework.response import Response
+
+CHAVE_GERACAO_FEED = 'respostas:geracao_feed'
+
+
+def _tempo():
+    return getattr(settings, 'CACHE_RESPOSTAS_TEMPO', 300)
+
+
+def papel(usuario):
+    """Papel do usuário para a chave de cache (lojas têm visibilidade própria)."""
+    if not usuario.is_authenticated:
+        return 'anonimo'
+    if usuario.tipo == 'LOJA':
+        return f'LOJA:{usuario.pk}'
+    return usuario.tipo
+
+
+def _iniciar_geracao_feed():
+    # Começa de um valor novo (não de 0): se a chave foi descartada do cache, as respostas
+    # guardadas com gerações antigas não voltam a ser usadas
+    cache.add(CHAVE_GERACAO_FEED, time.time_ns(), None)
+
+
+def geracao_feed():
+    """Geração atual do feed de torneios (uma leitura no cache, sem query)."""
+    geracao = cache.get(CHAVE_GERACAO_FEED)
+    if geracao is None:
+        _iniciar_geracao_feed()
+        geracao = cache.get(CHAVE_GERACAO_FEED)
+    return geracao
+
+
+def avancar_geracao_feed():
+    """Invalida as respostas do feed guardadas até aqui."""
+    try:
+        cache.incr(CHAVE_GERACAO_FEED)
+    except ValueError:
+        _iniciar_geracao_feed()
+
+
+def chave(endpoint, request, *partes):
+    """Chave de cache a partir do endpoint, do marcador de invalidação, do papel e dos parâmetros."""
+    parametros = urlencode(sorted(request.query_params.lists()), doseq=True)
+    resumo = hashlib.md5(
+        '|'.join([*map(str, partes), papel(request.user), parametros]).encode()
+    ).hexdigest()
+    return f'respostas:{endpoint}:{resumo}'
+
+
+def resposta_em_cache(chave_cache, gerar_resposta):
+    """
+    Retorna a resposta guardada em `chave_cache` ou chama `gerar_resposta()`.
+    Apenas respostas 200 são guardadas (erros e 404 sempre passam pela view).
+    """
+    dados = cache.get(chave_cache)
+    if dados is not None:
+        return Response(dados)
+
+    response = gerar_resposta()
+    if response.status_code == status.HTTP_200_OK:
+        cache.set(chave_cache, response.data, _tempo())
+    return response
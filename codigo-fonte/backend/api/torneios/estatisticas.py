@@ -0,0 +1,252 @@
+"""
+Estatísticas dos jogadores acumuladas entre todos os torneios.
+
+Em vez de recalcular a partir de MesaJogador/Mesa/RodadaJogador a cada consulta (um JOIN grande
+para jogadores ativos), os totais ficam em EstatisticaJogador e ConfrontoJogador e são ajustados
+incrementalmente a cada alteração:
+
+- resultado reportado ou editado (reportar_resultado, editar_manual): remove a contribuição do
+  resultado anterior e soma a do novo;
+- jogadores trocados em mesa com resultado (editar_jogadores): idem, com os assentos antigos e novos;
+- mesas, rodadas ou torneios removidos e assentos alterados nas demais rotas (emparelhamento,
+  exclusões): `alteracao_de_rodadas` tira a contribuição das rodadas afetadas antes da alteração
+  e soma a que restou depois;
+- rodada finalizada: byes dos jogadores do snapshot que ficaram sem mesa;
+- torneio finalizado: +1 torneio disputado para quem participou de alguma rodada.
+
+Os ajustes são gravados após o commit da transação que os causou (fora da transação do report,
+que é o caminho mais concorrido), com um único INSERT ... ON CONFLICT DO UPDATE por tabela.
+Se os totais divergirem (ex.: falha entre o commit e o ajuste), reconstrua-os com
+`python manage.py reconstruir_estatisticas`.
+"""
+
+import logging
+from collections import defaultdict
+from contextlib import contextmanager
+from itertools import combinations
+
+from django.db import connection, transaction
+from django.db.models import F
+
+from .models import ConfrontoJogador, EstatisticaJogador, Mesa, MesaJogador, RodadaJogador
+
+logger = logging.getLogger(__name__)
+
+CAMPOS_JOGADOR = ('torneios_disputados', 'partidas', 'vitorias', 'empates', 'derrotas', 'byes')
+CAMPOS_CONFRONTO = ('partidas_como_parceiro', 'partidas_como_oponente')
+
+TAMANHO_LOTE = 1000
+
+
+class _Acumulador:
+    """Variações de estatísticas por jogador e por par de jogadores, antes de gravar."""
+
+    def __init__(self):
+        self.jogadores = defaultdict(lambda: dict.fromkeys(CAMPOS_JOGADOR, 0))
+        self.confrontos = defaultdict(lambda: dict.fromkeys(CAMPOS_CONFRONTO, 0))
+
+    def partida(self, assentos, time_vencedor, sinal=1):
+        """Contribuição de uma mesa com resultado. `assentos`: pares (usuario_id, time)."""
+        if time_vencedor is None:
+            return
+        for usuario_id, time in assentos:
+            totais = self.jogadores[usuario_id]
+            totais['partidas'] += sinal
+            if time_vencedor == 0:
+                totais['empates'] += sinal
+            elif time_vencedor == time:
+                totais['vitorias'] += sinal
+            else:
+                totais['derrotas'] += sinal
+
+        for (usuario_a, time_a), (usuario_b, time_b) in combinations(assentos, 2):
+            campo = 'partidas_como_parceiro' if time_a == time_b else 'partidas_como_oponente'
+            self.confrontos[(usuario_a, usuario_b)][campo] += sinal
+            self.confrontos[(usuario_b, usuario_a)][campo] += sinal
+
+    def somar(self, usuario_id, campo, quantidade=1):
+        self.jogadores[usuario_id][campo] += quantidade
+
+    def _linhas(self, totais_por_chave):
+        return {chave: totais for chave, totais in totais_por_chave.items() if any(totais.values())}
+
+    def gravar(self):
+        """Soma as variações aos totais gravados (cria as linhas que ainda não existem)."""
+        with transaction.atomic():
+            _incrementar(EstatisticaJogador, ('id_usuario',), CAMPOS_JOGADOR, self._linhas(self.jogadores))
+            _incrementar(ConfrontoJogador, ('id_usuario', 'id_outro'), CAMPOS_CONFRONTO, self._linhas(self.confrontos))
+
+    def gravar_apos_commit(self):
+        if self.jogadores or self.confrontos:
+            transaction.on_commit(self.gravar, robust=True)
+
+
+def _incrementar(modelo, chaves, campos, linhas):
+    """
+    UPSERT somando `campos` nas linhas identificadas por `chaves` (FKs).
+    `linhas`: {(valores das chaves): {campo: variação}}.
+    """
+    if not linhas:
+        return
+    if connection.vendor not in ('postgresql', 'sqlite'):
+        _incrementar_por_linha(modelo, chaves, campos, linhas)
+        return
+
+    nome = connection.ops.quote_name
+    tabela = nome(modelo._meta.db_table)
+    colunas_chave = [nome(modelo._meta.get_field(chave).column) for chave in chaves]
+    colunas_campos = [nome(modelo._meta.get_field(campo).column) for campo in campos]
+    linhas = list(linhas.items())
+
+    for inicio in range(0, len(linhas), TAMANHO_LOTE):
+        lote = linhas[inicio:inicio + TAMANHO_LOTE]
+        marcadores = ', '.join(['(' + ', '.join(['%s'] * (len(chaves) + len(campos))) + ')'] * len(lote))
+        parametros = []
+        for chave, totais in lote:
+            chave = chave if isinstance(chave, tuple) else (chave,)
+            parametros.extend(chave)
+            parametros.extend(totais[campo] for campo in campos)
+
+        sql = (
+            f"INSERT INTO {tabela} ({', '.join(colunas_chave + colunas_campos)}) VALUES {marcadores} "
+            f"ON CONFLICT ({', '.join(colunas_chave)}) DO UPDATE SET "
+            + ', '.join(f'{coluna} = {tabela}.{coluna} + excluded.{coluna}' for coluna in colunas_campos)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute(sql, parametros)
+
+
+def _incrementar_por_linha(modelo, chaves, campos, linhas):
+    """Alternativa portável ao UPSERT (uma query por linha), para outros bancos."""
+    for chave, totais in linhas.items():
+        chave = chave if isinstance(chave, tuple) else (chave,)
+        filtro = {f'{nome}_id': valor for nome, valor in zip(chaves, chave)}
+        modelo.objects.get_or_create(**filtro)
+        modelo.objects.filter(**filtro).update(**{campo: F(campo) + totais[campo] for campo in campos})
+
+
+def _pares(assentos):
+    return [(assento.id_usuario_id, assento.time) for assento in assentos]
+
+
+def registrar_alteracao_mesa(assentos_antes, vencedor_antes, assentos_depois, vencedor_depois):
+    """
+    Ajusta as estatísticas quando o resultado ou os jogadores de uma mesa mudam.
+    Deve ser chamada dentro da transação da alteração; grava após o commit.
+    """
+    acumulador = _Acumulador()
+    acumulador.partida(_pares(assentos_antes), vencedor_antes, sinal=-1)
+    acumulador.partida(_pares(assentos_depois), vencedor_depois)
+    acumulador.gravar_apos_commit()
+
+
+def registrar_rodada_finalizada(rodada):
+    """Byes da rodada: jogadores do snapshot (RodadaJogador) que não ocuparam nenhuma mesa."""
+    em_mesas = MesaJogador.objects.filter(id_mesa__id_rodada=rodada).values('id_usuario_id')
+    com_bye = RodadaJogador.objects.filter(id_rodada=rodada).exclude(
+        id_usuario_id__in=em_mesas
+    ).values_list('id_usuario_id', flat=True)
+
+    acumulador = _Acumulador()
+    for usuario_id in com_bye:
+        acumulador.somar(usuario_id, 'byes')
+    acumulador.gravar_apos_commit()
+
+
+def registrar_torneio_finalizado(torneio):
+    """+1 torneio disputado para cada jogador que esteve no snapshot de alguma rodada."""
+    participantes = RodadaJogador.objects.filter(
+        id_rodada__id_torneio=torneio
+    ).order_by().values_list('id_usuario_id', flat=True).distinct()
+
+    acumulador = _Acumulador()
+    for usuario_id in participantes:
+        acumulador.somar(usuario_id, 'torneios_disputados')
+    acumulador.gravar_apos_commit()
+
+
+def _somar_contribuicoes(acumulador, rodadas=None, torneios=None, sinal=1):
+    """
+    Soma ao acumulador (com `sinal`) as estatísticas que as mesas, rodadas e torneios gravados
+    produzem: partidas das mesas com resultado e byes das rodadas finalizadas (das `rodadas`
+    informadas) e torneios disputados dos torneios finalizados (dos `torneios` informados).
+    None considera todos.
+    """
+    mesas = Mesa.objects.filter(time_vencedor__isnull=False)
+    assentos = MesaJogador.objects.filter(id_mesa__time_vencedor__isnull=False)
+    snapshots = RodadaJogador.objects.filter(id_rodada__status='Finalizada')
+    em_mesas = MesaJogador.objects.filter(id_mesa__id_rodada__status='Finalizada')
+    participantes = RodadaJogador.objects.filter(id_rodada__id_torneio__status='Finalizado')
+    if rodadas is not None:
+        mesas = mesas.filter(id_rodada_id__in=rodadas)
+        assentos = assentos.filter(id_mesa__id_rodada_id__in=rodadas)
+        snapshots = snapshots.filter(id_rodada_id__in=rodadas)
+        em_mesas = em_mesas.filter(id_mesa__id_rodada_id__in=rodadas)
+    if torneios is not None:
+        participantes = participantes.filter(id_rodada__id_torneio_id__in=torneios)
+
+    # Partidas: assentos das mesas com resultado, agrupados por mesa
+    vencedores = dict(mesas.values_list('id', 'time_vencedor'))
+    assentos_por_mesa = defaultdict(list)
+    for mesa_id, usuario_id, time in assentos.values_list('id_mesa_id', 'id_usuario_id', 'time').iterator():
+        assentos_por_mesa[mesa_id].append((usuario_id, time))
+    for mesa_id, pares in assentos_por_mesa.items():
+        acumulador.partida(pares, vencedores[mesa_id], sinal)
+
+    # Byes: snapshot das rodadas finalizadas menos quem ocupou mesa
+    ocupados = set(em_mesas.values_list('id_mesa__id_rodada_id', 'id_usuario_id').iterator())
+    for rodada_id, usuario_id in snapshots.values_list('id_rodada_id', 'id_usuario_id').iterator():
+        if (rodada_id, usuario_id) not in ocupados:
+            acumulador.somar(usuario_id, 'byes', sinal)
+
+    # Torneios disputados: torneios finalizados em que o jogador esteve em algum snapshot
+    for usuario_id, _ in participantes.order_by().values_list(
+        'id_usuario_id', 'id_rodada__id_torneio_id'
+    ).distinct().iterator():
+        acumulador.somar(usuario_id, 'torneios_disputados', sinal)
+
+
+@contextmanager
+def alteracao_de_rodadas(rodadas):
+    """
+    Ajusta as estatísticas pelas alterações feitas dentro do bloco nas mesas e assentos das
+    `rodadas` (QuerySet de Rodada), inclusive remoções de mesas, das próprias rodadas ou do
+    torneio: a contribuição das rodadas (e dos seus torneios) antes do bloco é retirada e a que
+    restar depois é somada. Deve ser usado dentro da transação da alteração; grava após o commit.
+    """
+    ids = dict(rodadas.values_list('id', 'id_torneio_id'))
+    rodada_ids, torneio_ids = list(ids), list(set(ids.values()))
+
+    acumulador = _Acumulador()
+    _somar_contribuicoes(acumulador, rodada_ids, torneio_ids, sinal=-1)
+    yield
+    _somar_contribuicoes(acumulador, rodada_ids, torneio_ids)
+    acumulador.gravar_apos_commit()
+
+
+def reconstruir_estatisticas():
+    """
+    Recalcula todas as estatísticas a partir das mesas, rodadas e torneios.
+    Retorna (jogadores, pares) gravados.
+    """
+    acumulador = _Acumulador()
+    _somar_contribuicoes(acumulador)
+
+    jogadores = acumulador._linhas(acumulador.jogadores)
+    confrontos = acumulador._linhas(acumulador.confrontos)
+    with transaction.atomic():
+        EstatisticaJogador.objects.all().delete()
+        ConfrontoJogador.objects.all().delete()
+        EstatisticaJogador.objects.bulk_create(
+            [EstatisticaJogador(id_usuario_id=usuario_id, **totais) for usuario_id, totais in jogadores.items()],
+            batch_size=TAMANHO_LOTE,
+        )
+        ConfrontoJogador.objects.bulk_create(
+            [
+                ConfrontoJogador(id_usuario_id=usuario_id, id_outro_id=outro_id, **totais)
+                for (usuario_id, outro_id), totais in confrontos.items()
+            ],
+            batch_size=TAMANHO_LOTE,
+        )
+    logger.info("Estatísticas reconstruídas: %s jogador(es), %s par(es)", len(jogadores), len(confrontos))
+    return len(jogadores), len(confrontos)
@@ -0,0 +1,116 @@
+"""
+Publicação de eventos de torneio para o stream SSE (Server-Sent Events).
+
+Os endpoints de escrita publicam eventos (rodada criada, emparelhamento publicado,
+resultado reportado, rodada finalizada) e o endpoint de stream os repassa, em tempo real,
+para os clientes conectados ao torneio. Assim o frontend não precisa ficar consultando
+`minha_mesa_na_rodada` ou `RodadaViewSet.mesas` periodicamente.
+
+O backend de pub/sub é configurável em `settings.EVENTOS_BACKEND`. O padrão é o
+`BackendLocal`, em memória do processo: com vários workers, cada processo entrega apenas
+os eventos publicados por ele mesmo. Um backend compartilhado (ex.: Redis pub/sub ou
+LISTEN/NOTIFY do Postgres) pode substituí-lo implementando a mesma interface
+(`assinar`, `cancelar` e `publicar`).
+"""
+
+import asyncio
+import itertools
+import threading
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+
+# Tipos de evento publicados
+RODADA_CRIADA = 'rodada_criada'
+EMPARELHAMENTO_PUBLICADO = 'emparelhamento_publicado'
+RESULTADO_REPORTADO = 'resultado_reportado'
+RODADA_FINALIZADA = 'rodada_finalizada'
+
+
+class Assinatura:
+    """
+    Assinatura de um cliente SSE nos eventos de um torneio.
+    Os eventos chegam em uma asyncio.Queue ligada ao event loop de quem assinou.
+    """
+
+    def __init__(self, torneio_id, loop, tamanho_fila):
+        self.torneio_id = torneio_id
+        self.loop = loop
+        self.fila = asyncio.Queue(maxsize=tamanho_fila)
+
+    def entregar(self, evento):
+        """Executado no event loop do assinante. Descarta o evento se o cliente estiver lento."""
+        try:
+            self.fila.put_nowait(evento)
+        except asyncio.QueueFull:
+            pass
+
+
+class BackendLocal:
+    """
+    Pub/sub em memória do processo, por torneio.
+
+    `publicar` pode ser chamado de qualquer thread (views síncronas rodam em threads
+    separadas do event loop); a entrega usa `call_soon_threadsafe` no loop de cada assinante.
+    """
+
+    def __init__(self):
+        self._assinantes = {}
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+
+    def assinar(self, torneio_id):
+        assinatura = Assinatura(
+            torneio_id,
+            asyncio.get_running_loop(),
+            getattr(settings, 'EVENTOS_TAMANHO_FILA', 100)
+        )
+        with self._lock:
+            self._assinantes.setdefault(torneio_id, set()).add(assinatura)
+        return assinatura
+
+    def cancelar(self, assinatura):
+        with self._lock:
+            assinantes = self._assinantes.get(assinatura.torneio_id)
+            if assinantes is not None:
+                assinantes.discard(assinatura)
+                if not assinantes:
+                    del self._assinantes[assinatura.torneio_id]
+
+    def publicar(self, torneio_id, tipo, dados):
+        evento = {'id': next(self._ids), 'tipo': tipo, 'torneio_id': torneio_id, 'dados': dados}
+
+        with self._lock:
+            assinantes = list(self._assinantes.get(torneio_id, ()))
+
+        for assinatura in assinantes:
+            try:
+                assinatura.loop.call_soon_threadsafe(assinatura.entregar, evento)
+            except RuntimeError:
+                # Event loop já encerrado: a assinatura será removida quando o stream fechar
+                pass
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def obter_backend():
+    """Retorna a instância (única por processo) do backend configurado."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                caminho = getattr(settings, 'EVENTOS_BACKEND', 'torneios.eventos.BackendLocal')
+                _backend = import_string(caminho)()
+    return _backend
+
+
+def publicar_evento(torneio_id, tipo, dados=None):
+    """
+    Publica um evento do torneio após o commit da transação atual.
+    Fora de transação, publica imediatamente. Se a transação falhar, nada é publicado.
+    """
+    transaction.on_commit(lambda: obter_backend().publicar(torneio_id, tipo, dados or {}))
@@ -0,0 +1,43 @@
+"""
+Expiração automática de torneios 'Aberto' cujo horário de início já passou.
+
+Um torneio 'Aberto' que não foi iniciado até `TOLERANCIA_EXPIRACAO` depois de `data_inicio`
+passa para o status terminal 'Expirado'. A transição é feita em lote (um único UPDATE) pelo
+comando `python manage.py expirar_torneios`, agendado via cron ou, com `--continuo`, rodando
+como worker dedicado. Como o UPDATE é idempotente, execuções simultâneas apenas não
+encontram nada para expirar.
+"""
+
+from datetime import timedelta
+
+from django.db.models import F
+from django.utils import timezone
+
+from . import cache_respostas
+from .models import Torneio
+
+# Tolerância após o horário de início (permite inscrições de última hora e pequenos atrasos)
+TOLERANCIA_EXPIRACAO = timedelta(hours=1)
+
+
+def expirar_torneios_abertos(agora=None):
+    """
+    Move para 'Expirado' os torneios 'Aberto' com início há mais de TOLERANCIA_EXPIRACAO.
+    Retorna a quantidade de torneios expirados.
+    """
+    limite = (agora or timezone.now()) - TOLERANCIA_EXPIRACAO
+
+    # Filtra pela prioridade (indexada com data_inicio) em vez do texto do status
+    expirados = Torneio.objects.filter(
+        prioridade=Torneio.PRIORIDADE_ABERTO,
+        status='Aberto',
+        data_inicio__lt=limite,
+    ).update(
+        status='Expirado',
+        prioridade=Torneio.PRIORIDADE_EXPIRADO,
+        # UPDATE em lote não dispara signals: incrementa a versão (ETag e feed) no próprio UPDATE
+        versao=F('versao') + 1,
+    )
+    if expirados:
+        cache_respostas.avancar_geracao_feed()
+    return expirados
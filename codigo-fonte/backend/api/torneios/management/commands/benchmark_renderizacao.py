@@ -0,0 +1,95 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Count, Prefetch
+from rest_framework.renderers import JSONRenderer
+
+from core.renderizadores import ORJSONRenderer, MessagePackRenderer
+from torneios.models import Mesa, MesaJogador, RankingParcial
+from torneios.serializers import MesaDetailSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara tamanho do payload e tempo de renderização (JSON do DRF, orjson e MessagePack) "
+        "usando o ranking e as mesas reais de um torneio."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--torneio', type=int,
+            help="ID do torneio (padrão: o torneio com o maior ranking parcial salvo)"
+        )
+        parser.add_argument('--repeticoes', type=int, default=200, help="Renderizações por medição")
+
+    def handle(self, *args, **options):
+        torneio_id = options['torneio'] or self._torneio_com_maior_ranking()
+        if torneio_id is None:
+            raise CommandError("Nenhum ranking parcial salvo. Informe --torneio ou finalize uma rodada.")
+
+        payloads = {
+            'ranking': self._payload_ranking(torneio_id),
+            'mesas': self._payload_mesas(torneio_id),
+        }
+
+        renderers = [('json (DRF)', JSONRenderer()), ('orjson', ORJSONRenderer()), ('msgpack', MessagePackRenderer())]
+
+        repeticoes = options['repeticoes']
+        self.stdout.write(f"Torneio {torneio_id}, {repeticoes} renderizações por medição\n")
+        for nome_payload, dados in payloads.items():
+            self.stdout.write(self.style.MIGRATE_HEADING(f"{nome_payload} ({self._itens(dados)} itens)"))
+            referencia = None
+            for nome, renderer in renderers:
+                conteudo = renderer.render(dados, renderer.media_type)
+                inicio = time.perf_counter()
+                for _ in range(repeticoes):
+                    renderer.render(dados, renderer.media_type)
+                media_ms = (time.perf_counter() - inicio) * 1000 / repeticoes
+                referencia = referencia or media_ms
+                self.stdout.write(
+                    f"  {nome:<12} {len(conteudo):>10} bytes  {media_ms:8.3f} ms  "
+                    f"({referencia / media_ms:.1f}x)"
+                )
+
+    def _torneio_com_maior_ranking(self):
+        return RankingParcial.objects.values('id_torneio').annotate(
+            total=Count('id')
+        ).order_by('-total').values_list('id_torneio', flat=True).first()
+
+    def _payload_ranking(self, torneio_id):
+        """Mesmo formato da resposta de ranking_rodada, para a última rodada com ranking salvo."""
+        ultima = RankingParcial.objects.filter(id_torneio_id=torneio_id).order_by('-rodada_numero').first()
+        if ultima is None:
+            return {'rodada_numero': None, 'ranking': []}
+
+        itens = RankingParcial.objects.filter(
+            id_torneio_id=torneio_id, rodada_numero=ultima.rodada_numero
+        ).select_related('id_usuario').order_by('posicao')
+        return {
+            'rodada_numero': ultima.rodada_numero,
+            'ranking': [
+                {
+                    'posicao': item.posicao,
+                    'jogador_id': item.id_usuario.id,
+                    'jogador_nome': item.id_usuario.username,
+                    'pontos': item.pontos_totais,
+                    'mw_percentage': float(item.mw_percentage),
+                    'omw_percentage': float(item.omw_percentage),
+                    'pmw_percentage': float(item.pmw_percentage),
+                    'balanco': float(item.balanco)
+                }
+                for item in itens
+            ],
+        }
+
+    def _payload_mesas(self, torneio_id):
+        """Todas as mesas do torneio serializadas como em RodadaViewSet.mesas."""
+        mesas = Mesa.objects.filter(id_rodada__id_torneio_id=torneio_id).select_related(
+            'id_rodada__id_torneio'
+        ).prefetch_related(
+            Prefetch('jogadores_na_mesa', queryset=MesaJogador.objects.select_related('id_usuario').order_by('id'))
+        ).order_by('id_rodada_id', 'numero_mesa')
+        return MesaDetailSerializer(mesas, many=True).data
+
+    def _itens(self, dados):
+        return len(dados['ranking']) if isinstance(dados, dict) else len(dados)
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from torneios.expiracao import TOLERANCIA_EXPIRACAO, expirar_torneios_abertos
+
+
+class Command(BaseCommand):
+    help = (
+        "Move para 'Expirado' os torneios 'Aberto' cujo horário de início passou há mais "
+        "que a tolerância. Pode ser agendado via cron ou, com --continuo, rodar como worker dedicado."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--continuo', action='store_true', help="Não termina: expira a cada --intervalo")
+        parser.add_argument('--intervalo', type=float, default=300, help="Segundos entre execuções no modo contínuo")
+
+    def handle(self, *args, **options):
+        while True:
+            expirados = expirar_torneios_abertos()
+            if expirados or not options['continuo']:
+                self.stdout.write(self.style.SUCCESS(
+                    f"{expirados} torneio(s) expirado(s) (tolerância de {TOLERANCIA_EXPIRACAO})."
+                ))
+            if not options['continuo']:
+                return
+            close_old_connections()
+            time.sleep(options['intervalo'])
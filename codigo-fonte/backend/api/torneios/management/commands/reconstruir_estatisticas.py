@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from torneios.estatisticas import reconstruir_estatisticas
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula do zero as estatísticas dos jogadores (EstatisticaJogador e ConfrontoJogador) "
+        "a partir das mesas, rodadas e torneios. Use se os totais incrementais divergirem."
+    )
+
+    def handle(self, *args, **options):
+        jogadores, pares = reconstruir_estatisticas()
+        self.stdout.write(self.style.SUCCESS(
+            f"Estatísticas reconstruídas: {jogadores} jogador(es), {pares} par(es) de jogadores."
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneios', '0002_rodadajogador'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mesa',
+            name='versao',
+            field=models.PositiveIntegerField(default=0, help_text='Incrementada a cada gravação de resultado (controle de concorrência otimista)'),
+        ),
+    ]
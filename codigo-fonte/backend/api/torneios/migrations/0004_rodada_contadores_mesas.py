@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:52
+
+from django.db import migrations, models
+
+
+def preencher_contadores(apps, schema_editor):
+    """Preenche os contadores das rodadas existentes a partir das mesas."""
+    Rodada = apps.get_model('torneios', 'Rodada')
+    rodadas = list(Rodada.objects.annotate(
+        contagem_total=models.Count('mesas'),
+        contagem_reportadas=models.Count('mesas', filter=models.Q(mesas__time_vencedor__isnull=False)),
+    ))
+    for rodada in rodadas:
+        rodada.total_mesas = rodada.contagem_total
+        rodada.mesas_reportadas = rodada.contagem_reportadas
+    Rodada.objects.bulk_update(rodadas, ['total_mesas', 'mesas_reportadas'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneios', '0003_mesa_versao'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='rodada',
+            name='mesas_reportadas',
+            field=models.PositiveIntegerField(default=0, help_text='Quantidade de mesas com resultado reportado'),
+        ),
+        migrations.AddField(
+            model_name='rodada',
+            name='total_mesas',
+            field=models.PositiveIntegerField(default=0, help_text='Quantidade de mesas da rodada (mantida no emparelhamento)'),
+        ),
+        migrations.RunPython(preencher_contadores, migrations.RunPython.noop),
+    ]
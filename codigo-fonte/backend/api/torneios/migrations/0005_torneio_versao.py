@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneios', '0004_rodada_contadores_mesas'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='torneio',
+            name='versao',
+            field=models.PositiveBigIntegerField(default=0, help_text='Incrementada a cada alteração do torneio ou de seus dados (ETag)'),
+        ),
+    ]
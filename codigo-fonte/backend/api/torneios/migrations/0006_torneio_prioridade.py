@@ -0,0 +1,37 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def preencher_prioridade(apps, schema_editor):
+    """Preenche a prioridade dos torneios existentes a partir do status."""
+    Torneio = apps.get_model('torneios', 'Torneio')
+    Torneio.objects.filter(status='Em Andamento').update(prioridade=1)
+    Torneio.objects.filter(status='Aberto').update(prioridade=2)
+    Torneio.objects.exclude(status__in=['Em Andamento', 'Aberto']).update(prioridade=3)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneios', '0005_torneio_versao'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='torneio',
+            name='prioridade',
+            field=models.PositiveSmallIntegerField(default=2, editable=False, help_text='Prioridade na listagem derivada do status (1: Em Andamento, 2: Aberto, 3: outros)'),
+        ),
+        migrations.RunPython(preencher_prioridade, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='torneio',
+            index=models.Index(fields=['prioridade', 'data_inicio', 'id'], name='torneio_prioridade_data_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='torneio',
+            index=models.Index(fields=['id_loja', 'prioridade', 'data_inicio', 'id'], name='torneio_loja_prioridade_idx'),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:03
+
+from datetime import timedelta
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def expirar_torneios_existentes(apps, schema_editor):
+    """Expira os torneios 'Aberto' que a listagem já ocultava (início há mais de 1h)."""
+    Torneio = apps.get_model('torneios', 'Torneio')
+    Torneio.objects.filter(
+        status='Aberto',
+        data_inicio__lt=timezone.now() - timedelta(hours=1),
+    ).update(status='Expirado', prioridade=4)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneios', '0006_torneio_prioridade'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='torneio',
+            name='prioridade',
+            field=models.PositiveSmallIntegerField(default=2, editable=False, help_text='Prioridade na listagem derivada do status (1: Em Andamento, 2: Aberto, 3: outros, 4: Expirado)'),
+        ),
+        migrations.AlterField(
+            model_name='torneio',
+            name='status',
+            field=models.CharField(default='Aberto', help_text='Ex: Aberto, Em Andamento, Finalizado, Cancelado, Expirado', max_length=50),
+        ),
+        migrations.RunPython(expirar_torneios_existentes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:23
+
+from collections import defaultdict
+from itertools import combinations
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def preencher_estatisticas(apps, schema_editor):
+    """
+    Calcula as estatísticas dos torneios já disputados (mesmas regras do comando
+    reconstruir_estatisticas, copiadas aqui para a migration não depender do código atual).
+    """
+    Mesa = apps.get_model('torneios', 'Mesa')
+    MesaJogador = apps.get_model('torneios', 'MesaJogador')
+    RodadaJogador = apps.get_model('torneios', 'RodadaJogador')
+    EstatisticaJogador = apps.get_model('torneios', 'EstatisticaJogador')
+    ConfrontoJogador = apps.get_model('torneios', 'ConfrontoJogador')
+
+    jogadores = defaultdict(lambda: defaultdict(int))
+    confrontos = defaultdict(lambda: defaultdict(int))
+
+    # Partidas das mesas com resultado
+    vencedores = dict(Mesa.objects.filter(time_vencedor__isnull=False).values_list('id', 'time_vencedor'))
+    assentos_por_mesa = defaultdict(list)
+    for mesa_id, usuario_id, time in MesaJogador.objects.filter(
+        id_mesa__time_vencedor__isnull=False
+    ).values_list('id_mesa_id', 'id_usuario_id', 'time').iterator():
+        assentos_por_mesa[mesa_id].append((usuario_id, time))
+    for mesa_id, assentos in assentos_por_mesa.items():
+        vencedor = vencedores[mesa_id]
+        for usuario_id, time in assentos:
+            jogadores[usuario_id]['partidas'] += 1
+            if vencedor == 0:
+                jogadores[usuario_id]['empates'] += 1
+            elif vencedor == time:
+                jogadores[usuario_id]['vitorias'] += 1
+            else:
+                jogadores[usuario_id]['derrotas'] += 1
+        for (usuario_a, time_a), (usuario_b, time_b) in combinations(assentos, 2):
+            campo = 'partidas_como_parceiro' if time_a == time_b else 'partidas_como_oponente'
+            confrontos[(usuario_a, usuario_b)][campo] += 1
+            confrontos[(usuario_b, usuario_a)][campo] += 1
+
+    # Byes: snapshot das rodadas finalizadas menos quem ocupou mesa
+    em_mesas = set(MesaJogador.objects.filter(
+        id_mesa__id_rodada__status='Finalizada'
+    ).values_list('id_mesa__id_rodada_id', 'id_usuario_id').iterator())
+    for rodada_id, usuario_id in RodadaJogador.objects.filter(
+        id_rodada__status='Finalizada'
+    ).values_list('id_rodada_id', 'id_usuario_id').iterator():
+        if (rodada_id, usuario_id) not in em_mesas:
+            jogadores[usuario_id]['byes'] += 1
+
+    # Torneios finalizados em que o jogador esteve em algum snapshot
+    for usuario_id, _ in RodadaJogador.objects.filter(
+        id_rodada__id_torneio__status='Finalizado'
+    ).order_by().values_list('id_usuario_id', 'id_rodada__id_torneio_id').distinct().iterator():
+        jogadores[usuario_id]['torneios_disputados'] += 1
+
+    EstatisticaJogador.objects.bulk_create(
+        [EstatisticaJogador(id_usuario_id=usuario_id, **totais) for usuario_id, totais in jogadores.items()],
+        batch_size=1000,
+    )
+    ConfrontoJogador.objects.bulk_create(
+        [
+            ConfrontoJogador(id_usuario_id=usuario_id, id_outro_id=outro_id, **totais)
+            for (usuario_id, outro_id), totais in confrontos.items()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('torneios', '0007_torneio_status_expirado'),
+        ('usuarios', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EstatisticaJogador',
+            fields=[
+                ('id_usuario', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='estatisticas', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('torneios_disputados', models.IntegerField(default=0, help_text='Torneios finalizados em que o jogador participou de alguma rodada')),
+                ('partidas', models.IntegerField(default=0, help_text='Partidas com resultado (não inclui byes)')),
+                ('vitorias', models.IntegerField(default=0, help_text='Partidas vencidas')),
+                ('empates', models.IntegerField(default=0, help_text='Partidas empatadas')),
+                ('derrotas', models.IntegerField(default=0, help_text='Partidas perdidas')),
+                ('byes', models.IntegerField(default=0, help_text='Rodadas finalizadas em que o jogador ficou sem mesa')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ConfrontoJogador',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('partidas_como_parceiro', models.IntegerField(default=0, help_text='Partidas no mesmo time')),
+                ('partidas_como_oponente', models.IntegerField(default=0, help_text='Partidas em times opostos')),
+                ('id_outro', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('id_usuario', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='confrontos', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['id_usuario', 'partidas_como_parceiro'], name='confronto_parceiro_idx'), models.Index(fields=['id_usuario', 'partidas_como_oponente'], name='confronto_oponente_idx')],
+                'unique_together': {('id_usuario', 'id_outro')},
+            },
+        ),
+        migrations.RunPython(preencher_estatisticas, migrations.RunPython.noop),
+    ]
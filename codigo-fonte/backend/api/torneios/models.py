@@ -7,6 +7,17 @@ class Torneio(models.Model):
     Armazena as informações principais de um torneio.
     Cada torneio é criado e gerenciado por um usuário do tipo 'LOJA'.
     """
+    # Prioridade de exibição na listagem, derivada do status
+    PRIORIDADE_EM_ANDAMENTO = 1
+    PRIORIDADE_ABERTO = 2
+    PRIORIDADE_OUTROS = 3
+    PRIORIDADE_EXPIRADO = 4
+    PRIORIDADE_POR_STATUS = {
+        'Em Andamento': PRIORIDADE_EM_ANDAMENTO,
+        'Aberto': PRIORIDADE_ABERTO,
+        'Expirado': PRIORIDADE_EXPIRADO,
+    }
+
     id_loja = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -15,7 +26,7 @@ class Torneio(models.Model):
     )
     nome = models.CharField(max_length=255, help_text="Nome do torneio")
     descricao = models.TextField(blank=True, null=True, help_text="Descrição detalhada do torneio")
-    status = models.CharField(max_length=50, default='Aberto', help_text="Ex: Aberto, Em Andamento, Finalizado")
+    status = models.CharField(max_length=50, default='Aberto', help_text="Ex: Aberto, Em Andamento, Finalizado, Cancelado, Expirado")
     regras = models.TextField(help_text="Regras específicas do torneio")
     banner = models.CharField(max_length=255, blank=True, null=True, help_text="Nome do arquivo do banner (ex: b1.png, b2.png)")
     vagas_limitadas = models.BooleanField(default=True, help_text="Se o torneio tem limite de vagas")
@@ -28,10 +39,35 @@ class Torneio(models.Model):
     pontuacao_bye = models.PositiveIntegerField(default=3, help_text="Pontos por bye")
     quantidade_rodadas = models.PositiveIntegerField(blank=True, null=True, help_text="Quantidade de rodadas do torneio")
     data_inicio = models.DateTimeField(help_text="Data e hora de início do torneio")
+    versao = models.PositiveBigIntegerField(default=0, help_text="Incrementada a cada alteração do torneio ou de seus dados (ETag)")
+    prioridade = models.PositiveSmallIntegerField(
+        default=PRIORIDADE_ABERTO,
+        editable=False,
+        help_text="Prioridade na listagem derivada do status (1: Em Andamento, 2: Aberto, 3: outros, 4: Expirado)"
+    )
+
+    class Meta:
+        indexes = [
+            # Feed público e listagem por loja: ordenados por prioridade, data de início e id
+            models.Index(fields=['prioridade', 'data_inicio', 'id'], name='torneio_prioridade_data_idx'),
+            models.Index(fields=['id_loja', 'prioridade', 'data_inicio', 'id'], name='torneio_loja_prioridade_idx'),
+        ]
 
     def __str__(self):
         return self.nome
 
+    @classmethod
+    def prioridade_do_status(cls, status):
+        return cls.PRIORIDADE_POR_STATUS.get(status, cls.PRIORIDADE_OUTROS)
+
+    def save(self, *args, **kwargs):
+        """Mantém a prioridade sincronizada com o status a cada gravação."""
+        self.prioridade = self.prioridade_do_status(self.status)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and 'status' in update_fields and 'prioridade' not in update_fields:
+            kwargs['update_fields'] = [*update_fields, 'prioridade']
+        super().save(*args, **kwargs)
+
 
 class Inscricao(models.Model):
     """
@@ -67,6 +103,8 @@ class Rodada(models.Model):
     id_torneio = models.ForeignKey(Torneio, on_delete=models.CASCADE, related_name='rodadas')
     numero_rodada = models.IntegerField()
     status = models.CharField(max_length=50, default='Pendente', help_text="Ex: Pendente, Em Andamento, Finalizada")
+    total_mesas = models.PositiveIntegerField(default=0, help_text="Quantidade de mesas da rodada (mantida no emparelhamento)")
+    mesas_reportadas = models.PositiveIntegerField(default=0, help_text="Quantidade de mesas com resultado reportado")
 
     class Meta:
         unique_together = ('id_torneio', 'numero_rodada')
@@ -74,6 +112,31 @@ class Rodada(models.Model):
     def __str__(self):
         return f'Rodada {self.numero_rodada} do {self.id_torneio.nome}'
 
+    @property
+    def mesas_pendentes(self):
+        """Mesas ainda sem resultado, a partir dos contadores (sem consultar as mesas)."""
+        return self.total_mesas - self.mesas_reportadas
+
+    def atualizar_contadores(self, total_mesas, mesas_reportadas=0):
+        """
+        Define os contadores após um (re)emparelhamento.
+        Mesas recém-criadas ainda não têm resultado, por isso o padrão é 0 reportadas.
+        """
+        self.total_mesas = total_mesas
+        self.mesas_reportadas = mesas_reportadas
+        self.save(update_fields=['total_mesas', 'mesas_reportadas'])
+
+    def recalcular_contadores(self):
+        """
+        Recalcula os contadores a partir das mesas da rodada.
+        Usado em edições manuais de mesas, que são raras e fora do fluxo quente.
+        """
+        contagem = self.mesas.aggregate(
+            total=models.Count('id'),
+            reportadas=models.Count('id', filter=models.Q(time_vencedor__isnull=False))
+        )
+        self.atualizar_contadores(contagem['total'], contagem['reportadas'])
+
 
 class RodadaJogador(models.Model):
     """
@@ -104,6 +167,7 @@ class Mesa(models.Model):
     time_vencedor = models.IntegerField(null=True, blank=True, help_text="1=Time 1, 2=Time 2, 0=Empate")
     pontuacao_time_1 = models.IntegerField(default=0, help_text="Placar do time 1 (ex: 2 vitórias parciais)")
     pontuacao_time_2 = models.IntegerField(default=0, help_text="Placar do time 2 (ex: 1 vitória parcial)")
+    versao = models.PositiveIntegerField(default=0, help_text="Incrementada a cada gravação de resultado (controle de concorrência otimista)")
 
     def __str__(self):
         return f'Mesa {self.numero_mesa} da {self.id_rodada}'
@@ -175,3 +239,49 @@ class RankingParcial(models.Model):
 
     def __str__(self):
         return f'{self.id_usuario.username} - {self.posicao}º (Rodada {self.rodada_numero} - {self.id_torneio.nome})'
+
+
+class EstatisticaJogador(models.Model):
+    """
+    Estatísticas do jogador acumuladas entre todos os torneios.
+    Mantidas incrementalmente a cada resultado (ver estatisticas.py); podem ser
+    reconstruídas com `python manage.py reconstruir_estatisticas`.
+    """
+    id_usuario = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, primary_key=True, related_name='estatisticas'
+    )
+    torneios_disputados = models.IntegerField(default=0, help_text="Torneios finalizados em que o jogador participou de alguma rodada")
+    partidas = models.IntegerField(default=0, help_text="Partidas com resultado (não inclui byes)")
+    vitorias = models.IntegerField(default=0, help_text="Partidas vencidas")
+    empates = models.IntegerField(default=0, help_text="Partidas empatadas")
+    derrotas = models.IntegerField(default=0, help_text="Partidas perdidas")
+    byes = models.IntegerField(default=0, help_text="Rodadas finalizadas em que o jogador ficou sem mesa")
+
+    @property
+    def taxa_vitoria(self):
+        """Vitórias / partidas, ou None sem partidas."""
+        return round(self.vitorias / self.partidas, 4) if self.partidas else None
+
+    def __str__(self):
+        return f'Estatísticas de {self.id_usuario_id}'
+
+
+class ConfrontoJogador(models.Model):
+    """
+    Quantas partidas um jogador disputou ao lado de (parceiro) ou contra (oponente) outro jogador.
+    Cada par é gravado nos dois sentidos, para consultar pelo jogador com um único índice.
+    """
+    id_usuario = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='confrontos')
+    id_outro = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='+')
+    partidas_como_parceiro = models.IntegerField(default=0, help_text="Partidas no mesmo time")
+    partidas_como_oponente = models.IntegerField(default=0, help_text="Partidas em times opostos")
+
+    class Meta:
+        unique_together = ('id_usuario', 'id_outro')
+        indexes = [
+            models.Index(fields=['id_usuario', 'partidas_como_parceiro'], name='confronto_parceiro_idx'),
+            models.Index(fields=['id_usuario', 'partidas_como_oponente'], name='confronto_oponente_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.id_usuario_id} x {self.id_outro_id}'
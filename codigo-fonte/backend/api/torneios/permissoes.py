@@ -94,11 +94,24 @@ class IsOwnerOrAdmin(BasePermission):
 
 
 class IsJogadorNaMesa(permissions.BasePermission):
-    """Permissão para jogadores que estão na mesa específica"""
+    """
+    Permissão para jogadores que estão na mesa específica.
+
+    Se os assentos da mesa já foram carregados (prefetch de `jogadores_na_mesa`),
+    a verificação é feita em memória; caso contrário, consulta o banco.
+    """
+    def has_permission(self, request, view):
+        return bool(request.user and request.user.is_authenticated)
+
     def has_object_permission(self, request, view, obj):
         if not request.user.is_authenticated:
             return False
+
+        assentos = getattr(obj, '_prefetched_objects_cache', {}).get('jogadores_na_mesa')
+        if assentos is not None:
+            return any(assento.id_usuario_id == request.user.id for assento in assentos)
+
         return MesaJogador.objects.filter(
             id_mesa=obj,
             id_usuario=request.user
-        ).exists()
\ No newline at end of file
+        ).exists()
@@ -19,7 +19,10 @@ Otimizações implementadas:
 
 from decimal import Decimal, ROUND_HALF_UP
 from typing import Dict, Set, Optional, List, Tuple
-from django.db import transaction
+import threading
+from contextlib import contextmanager
+
+from django.db import connection, transaction
 
 from .models import Torneio, Rodada, Mesa, MesaJogador, Inscricao, RankingParcial, RodadaJogador
 
@@ -371,6 +374,9 @@ def calcular_e_salvar_ranking_parcial(torneio: Torneio, rodada_numero: int) -> L
     )
 
     # 5. Salvar no banco (bulk insert)
+    # Serializa gravações concorrentes do mesmo ranking (evita violar o unique_together)
+    _travar_ranking_no_banco(torneio.id, rodada_numero)
+
     # Deletar registros antigos desta rodada
     RankingParcial.objects.filter(
         id_torneio=torneio,
@@ -394,6 +400,10 @@ def calcular_e_salvar_ranking_parcial(torneio: Torneio, rodada_numero: int) -> L
 
     RankingParcial.objects.bulk_create(objetos)
 
+    # Sem tocar a versão do torneio: o ranking é derivado das rodadas finalizadas, e quem as
+    # altera (finalização da rodada, reporte/edição de resultado) já incrementa a versão. Assim
+    # o cálculo sob demanda de um GET (garantir_ranking_parcial) não invalida ETags nem caches.
+
     return ranking_ordenado
 
 
@@ -413,3 +423,68 @@ def obter_jogadores_ativos(torneio: Torneio) -> List[int]:
             status='Inscrito'
         ).values_list('id_usuario_id', flat=True)
     )
+
+
+# Single-flight do cálculo sob demanda: uma requisição calcula o ranking de (torneio, rodada)
+# enquanto as demais aguardam e depois apenas leem o resultado salvo.
+_travas_locais = {}
+_travas_locais_lock = threading.Lock()
+
+
+@contextmanager
+def _trava_local(torneio_id: int, rodada_numero: int):
+    """Lock por (torneio, rodada) entre as threads do processo, removido quando ninguém mais o usa."""
+    chave = (torneio_id, rodada_numero)
+    with _travas_locais_lock:
+        trava = _travas_locais.setdefault(chave, [threading.Lock(), 0])
+        trava[1] += 1
+    try:
+        with trava[0]:
+            yield
+    finally:
+        with _travas_locais_lock:
+            trava[1] -= 1
+            if trava[1] == 0:
+                del _travas_locais[chave]
+
+
+def _travar_ranking_no_banco(torneio_id: int, rodada_numero: int) -> None:
+    """
+    Advisory lock transacional do PostgreSQL por (torneio, rodada), liberado no fim da transação.
+    Coordena processos/workers diferentes. Em outros bancos não faz nada (o SQLite já
+    serializa as escritas).
+    """
+    if connection.vendor != 'postgresql':
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT pg_advisory_xact_lock(hashtext(%s))",
+            [f'ranking_parcial:{torneio_id}:{rodada_numero}']
+        )
+
+
+def garantir_ranking_parcial(torneio: Torneio, rodada_numero: int) -> bool:
+    """
+    Garante que o RankingParcial de (torneio, rodada) existe, calculando-o no máximo uma vez
+    mesmo com várias requisições simultâneas (lock no processo + advisory lock no banco).
+    Quem chega depois aguarda o cálculo em andamento e apenas encontra as linhas prontas.
+
+    Returns:
+        bool: True se esta chamada calculou o ranking, False se ele já existia
+    """
+    def existe():
+        return RankingParcial.objects.filter(id_torneio=torneio, rodada_numero=rodada_numero).exists()
+
+    if existe():
+        return False
+
+    with _trava_local(torneio.id, rodada_numero):
+        if existe():
+            return False
+        with transaction.atomic():
+            _travar_ranking_no_banco(torneio.id, rodada_numero)
+            # Outro processo pode ter concluído o cálculo enquanto aguardávamos o lock
+            if existe():
+                return False
+            calcular_e_salvar_ranking_parcial(torneio, rodada_numero)
+    return True
@@ -2,7 +2,8 @@ from rest_framework import serializers
 from django.utils import timezone
 import pytz
 
-from .models import Torneio, Inscricao, Rodada, Mesa, MesaJogador
+from core.campos_esparsos import CamposEsparsosMixin
+from .models import Torneio, Inscricao, Rodada, Mesa, MesaJogador, EstatisticaJogador
 
 
 class IniciarRodadaSerializer(serializers.Serializer):
@@ -18,16 +19,36 @@ class IniciarRodadaSerializer(serializers.Serializer):
 # em formatos que podem ser transmitidos pela web, como JSON.
 # Eles também fazem o caminho inverso: validam e convertem JSON em objetos.
 
-class TorneioSerializer(serializers.ModelSerializer):
+class TorneioSerializer(CamposEsparsosMixin, serializers.ModelSerializer):
     """Serializer para o modelo Torneio."""
     # Campos da loja para exibição
     loja_nome = serializers.CharField(source='id_loja.username', read_only=True)
     loja_email = serializers.CharField(source='id_loja.email', read_only=True)
     loja_tipo = serializers.CharField(source='id_loja.tipo', read_only=True)
+    # Ocupação do torneio (anotada na listagem; calculada aqui apenas fora dela)
+    inscritos_ativos = serializers.SerializerMethodField()
+    vagas_restantes = serializers.SerializerMethodField()
 
     class Meta:
         model = Torneio
         fields = '__all__'
+        read_only_fields = ['versao']
+        # Colunas lidas pelos SerializerMethodFields (ver core/campos_esparsos.py)
+        campos_dependentes = {'vagas_restantes': ('vagas_limitadas', 'qnt_vagas')}
+
+    def get_inscritos_ativos(self, obj):
+        """Inscrições não canceladas. Usa a anotação do queryset quando disponível."""
+        if not hasattr(obj, 'inscritos_ativos'):
+            obj.inscritos_ativos = obj.inscritos.exclude(status='Cancelado').count()
+        return obj.inscritos_ativos
+
+    def get_vagas_restantes(self, obj):
+        """Vagas ainda disponíveis, ou None quando o torneio não limita vagas."""
+        if hasattr(obj, 'vagas_restantes'):
+            return obj.vagas_restantes
+        if not obj.vagas_limitadas or obj.qnt_vagas is None:
+            return None
+        return max(obj.qnt_vagas - self.get_inscritos_ativos(obj), 0)
 
     def validate_data_inicio(self, value):
         """
@@ -53,7 +74,7 @@ class TorneioSerializer(serializers.ModelSerializer):
         return value
 
 
-class InscricaoSerializer(serializers.ModelSerializer):
+class InscricaoSerializer(CamposEsparsosMixin, serializers.ModelSerializer):
     """
     Serializer padrão para modelo Inscricao.
     Usado para operações de leitura e atualização.
@@ -88,6 +109,16 @@ class InscricaoSerializer(serializers.ModelSerializer):
         return data
 
 
+class InscricaoResumoSerializer(InscricaoSerializer):
+    """
+    Serializer de listagem de inscrições sem a decklist (que pode ter vários KB por inscrição).
+    A decklist é incluída com ?incluir_decklist=true ou nos detalhes da inscrição.
+    """
+    class Meta(InscricaoSerializer.Meta):
+        fields = ['id', 'id_usuario', 'username', 'email', 'id_torneio', 'nome_torneio',
+                  'status', 'data_inscricao']
+
+
 class InscricaoCreateSerializer(serializers.ModelSerializer):
     """
     Serializer específico para criação de inscrições por jogadores.
@@ -220,20 +251,22 @@ class InscricaoLojaSerializer(serializers.ModelSerializer):
         return data
 
 
-class RodadaSerializer(serializers.ModelSerializer):
+class RodadaSerializer(CamposEsparsosMixin, serializers.ModelSerializer):
     """Serializer para o modelo Rodada."""
 
     class Meta:
         model = Rodada
         fields = '__all__'
+        read_only_fields = ['total_mesas', 'mesas_reportadas']
 
 
-class MesaSerializer(serializers.ModelSerializer):
+class MesaSerializer(CamposEsparsosMixin, serializers.ModelSerializer):
     """Serializer para o modelo Mesa."""
 
     class Meta:
         model = Mesa
         fields = '__all__'
+        read_only_fields = ['versao']
 
 
 class MesaJogadorSerializer(serializers.ModelSerializer):
@@ -246,7 +279,7 @@ class MesaJogadorSerializer(serializers.ModelSerializer):
         fields = ['id', 'id_usuario', 'username', 'email', 'time']
 
 
-class MesaDetailSerializer(serializers.ModelSerializer):
+class MesaDetailSerializer(CamposEsparsosMixin, serializers.ModelSerializer):
     """Serializer detalhado para mesas com jogadores e informações completas"""
     jogadores = MesaJogadorSerializer(source='jogadores_na_mesa', many=True, read_only=True)
     numero_rodada = serializers.IntegerField(source='id_rodada.numero_rodada', read_only=True)
@@ -257,7 +290,7 @@ class MesaDetailSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'id_rodada', 'numero_rodada', 'nome_torneio',
             'numero_mesa', 'time_vencedor', 'pontuacao_time_1',
-            'pontuacao_time_2', 'jogadores'
+            'pontuacao_time_2', 'versao', 'jogadores'
         ]
 
 class ReportarResultadoSerializer(serializers.Serializer):
@@ -269,6 +302,11 @@ class ReportarResultadoSerializer(serializers.Serializer):
         max_value=2,
         help_text="0=Empate, 1=Time 1, 2=Time 2"
     )
+    versao = serializers.IntegerField(
+        min_value=0,
+        required=False,
+        help_text="Versão da mesa vista pelo jogador. Se outra gravação ocorreu depois dela, o report é recusado (409)."
+    )
 
     def validate(self, data):
         if data['time_vencedor'] == 1 and data['pontuacao_time_1'] <= data['pontuacao_time_2']:
@@ -306,7 +344,7 @@ class EditarJogadoresMesaSerializer(serializers.Serializer):
         return value
 
 
-class VisualizacaoMesaJogadorSerializer(serializers.ModelSerializer):
+class VisualizacaoMesaJogadorSerializer(CamposEsparsosMixin, serializers.ModelSerializer):
     """Serializer para visualização da mesa no formato 2x2"""
     id_torneio = serializers.IntegerField(source='id_rodada.id_torneio.id', read_only=True)
     nome_torneio = serializers.CharField(source='id_rodada.id_torneio.nome', read_only=True)
@@ -322,23 +360,42 @@ class VisualizacaoMesaJogadorSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'numero_mesa', 'id_torneio', 'nome_torneio',
             'numero_rodada', 'status_rodada', 'pontuacao_time_1',
-            'pontuacao_time_2', 'time_vencedor', 'time_1', 'time_2'
+            'pontuacao_time_2', 'time_vencedor', 'versao', 'time_1', 'time_2'
         ]
 
     def get_time_1(self, obj):
         """Retorna os 2 jogadores do time 1"""
-        jogadores_time_1 = obj.jogadores_na_mesa.filter(time=1).order_by('id')
-        return MesaJogadorSerializer(jogadores_time_1, many=True).data
+        return MesaJogadorSerializer(self._jogadores_do_time(obj, 1), many=True).data
 
     def get_time_2(self, obj):
         """Retorna os 2 jogadores do time 2"""
-        jogadores_time_2 = obj.jogadores_na_mesa.filter(time=2).order_by('id')
-        return MesaJogadorSerializer(jogadores_time_2, many=True).data
+        return MesaJogadorSerializer(self._jogadores_do_time(obj, 2), many=True).data
+
+    def _jogadores_do_time(self, obj, time):
+        """
+        Separa os times em Python a partir de `jogadores_na_mesa.all()`, que usa os assentos
+        pré-carregados (prefetch) quando disponíveis em vez de uma query por time.
+        """
+        return sorted(
+            (assento for assento in obj.jogadores_na_mesa.all() if assento.time == time),
+            key=lambda assento: assento.id
+        )
 
 
 # Serializers para respostas padrão
 
 
+class EstatisticaJogadorSerializer(serializers.ModelSerializer):
+    """Estatísticas acumuladas do jogador entre todos os torneios."""
+    username = serializers.CharField(source='id_usuario.username', read_only=True)
+    taxa_vitoria = serializers.FloatField(read_only=True, help_text="Vitórias / partidas (null sem partidas)")
+
+    class Meta:
+        model = EstatisticaJogador
+        fields = ['id_usuario', 'username', 'torneios_disputados', 'partidas', 'vitorias',
+                  'empates', 'derrotas', 'byes', 'taxa_vitoria']
+
+
 class InscricaoResponseSerializer(serializers.Serializer):
     """Response padrão para operações de inscrição"""
     message = serializers.CharField(help_text="Mensagem de sucesso")
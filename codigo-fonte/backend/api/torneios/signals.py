@@ -0,0 +1,46 @@
+"""
+Receivers que mantêm a versão dos torneios (ver versoes.py) a cada gravação. Cada incremento
+de versão também avança a geração do feed de torneios (ver cache_respostas.py), assim como a
+alteração de uma loja, cujo nome aparece no feed.
+
+Cobrem save()/delete() de Torneio, Inscricao, Rodada e Mesa. Escritas em massa
+(QuerySet.update, bulk_create) e alterações de assentos (MesaJogador) não disparam
+signals de forma barata; nesses pontos as views chamam `versoes.tocar_*` explicitamente.
+"""
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from . import cache_respostas, versoes
+from .models import Torneio, Inscricao, Rodada, Mesa
+
+
+@receiver([post_save, post_delete], sender=Torneio)
+def torneio_alterado(sender, instance, **kwargs):
+    versoes.tocar_torneio(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Inscricao)
+def inscricao_alterada(sender, instance, **kwargs):
+    # Também invalida o feed, que exibe inscritos e vagas restantes
+    versoes.tocar_torneio(instance.id_torneio_id)
+
+
+@receiver([post_save, post_delete], sender=Rodada)
+def rodada_alterada(sender, instance, **kwargs):
+    versoes.tocar_torneio(instance.id_torneio_id)
+
+
+@receiver([post_save, post_delete], sender=Mesa)
+def mesa_alterada(sender, instance, **kwargs):
+    # Usa apenas o id da rodada para não disparar uma query por mesa
+    versoes.tocar_rodada(instance.id_rodada_id)
+
+
+@receiver([post_save, post_delete], sender=settings.AUTH_USER_MODEL)
+def loja_alterada(sender, instance, **kwargs):
+    # O feed exibe nome, e-mail e tipo da loja de cada torneio
+    if instance.tipo == 'LOJA':
+        transaction.on_commit(cache_respostas.avancar_geracao_feed)
@@ -1,3 +1,1215 @@
-from django.test import TestCase
+import base64
+import io
+import threading
+from datetime import timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from usuarios.models import Usuario
+from . import estatisticas, eventos, ranking_utils, versoes
+from .models import (
+    Torneio, Inscricao, Rodada, RodadaJogador, Mesa, MesaJogador, EstatisticaJogador, ConfrontoJogador,
+    RankingParcial
+)
+
+
+class ReportarResultadoTests(TestCase):
+    """
+    Testes do endpoint de reporte de resultado (MesaViewSet.reportar_resultado).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        cls.jogadores = [
+            Usuario.objects.create_user(
+                email=f'jogador{i}@teste.com', username=f'jogador{i}', password='senha', tipo='JOGADOR'
+            )
+            for i in range(5)
+        ]
+        cls.torneio = Torneio.objects.create(
+            id_loja=cls.loja,
+            nome='Torneio Teste',
+            regras='Regras',
+            status='Em Andamento',
+            data_inicio=timezone.now() + timedelta(days=1),
+        )
+        cls.rodada = Rodada.objects.create(
+            id_torneio=cls.torneio, numero_rodada=1, status='Em Andamento', total_mesas=1
+        )
+        cls.mesa = Mesa.objects.create(id_rodada=cls.rodada, numero_mesa=1)
+        for j, jogador in enumerate(cls.jogadores[:4]):
+            MesaJogador.objects.create(id_mesa=cls.mesa, id_usuario=jogador, time=1 if j < 2 else 2)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = f'/api/v1/torneios/mesas/{self.mesa.id}/reportar_resultado/'
+        self.payload = {'pontuacao_time_1': 2, 'pontuacao_time_2': 1, 'time_vencedor': 1}
+
+    def test_reporte_com_numero_constante_de_queries(self):
+        """
+        Leitura da mesa com rodada e dos assentos, o UPDATE condicional (compare-and-set)
+        e o incremento do contador da rodada, mais o savepoint do atomic.
+        A resposta é serializada com os dados já carregados.
+        """
+        self.client.force_authenticate(self.jogadores[0])
+
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, self.payload, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['mesa']['jogadores']), 4)
+        self.assertEqual(response.data['mesa']['nome_torneio'], 'Torneio Teste')
+        self.mesa.refresh_from_db()
+        self.assertEqual(self.mesa.time_vencedor, 1)
+        self.assertEqual(self.mesa.versao, 1)
+        self.rodada.refresh_from_db()
+        self.assertEqual(self.rodada.mesas_reportadas, 1)
+
+    def test_report_com_versao_desatualizada_retorna_conflito(self):
+        self.client.force_authenticate(self.jogadores[0])
+        self.client.post(self.url, dict(self.payload, versao=0), format='json')
+
+        self.client.force_authenticate(self.jogadores[2])
+        response = self.client.post(
+            self.url,
+            {'pontuacao_time_1': 0, 'pontuacao_time_2': 2, 'time_vencedor': 2, 'versao': 0},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['mesa']['time_vencedor'], 1)
+        self.assertEqual(response.data['mesa']['versao'], 1)
+        self.mesa.refresh_from_db()
+        self.assertEqual(self.mesa.time_vencedor, 1)
+
+    def test_segundo_report_sem_versao_retorna_conflito(self):
+        self.client.force_authenticate(self.jogadores[0])
+        self.assertEqual(self.client.post(self.url, self.payload, format='json').status_code, 200)
+
+        # O segundo jogador reporta depois do commit do primeiro, sem informar a versão
+        self.client.force_authenticate(self.jogadores[2])
+        response = self.client.post(
+            self.url, {'pontuacao_time_1': 0, 'pontuacao_time_2': 2, 'time_vencedor': 2}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.data['mesa']['time_vencedor'], 1)
+        self.mesa.refresh_from_db()
+        self.assertEqual((self.mesa.time_vencedor, self.mesa.versao), (1, 1))
+
+    def test_jogador_fora_da_mesa_nao_reporta(self):
+        self.client.force_authenticate(self.jogadores[4])
+
+        response = self.client.post(self.url, self.payload, format='json')
+
+        self.assertEqual(response.status_code, 403)
+        self.mesa.refresh_from_db()
+        self.assertIsNone(self.mesa.time_vencedor)
+
+    def test_reporte_atualiza_estatisticas_sem_contar_duas_vezes(self):
+        self.client.force_authenticate(self.jogadores[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(self.url, self.payload, format='json')
+        # Novo resultado para a mesma mesa substitui a contribuição do anterior
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                self.url, {'pontuacao_time_1': 0, 'pontuacao_time_2': 2, 'time_vencedor': 2, 'versao': 1},
+                format='json'
+            )
+
+        estatistica = EstatisticaJogador.objects.get(pk=self.jogadores[0].pk)
+        self.assertEqual((estatistica.partidas, estatistica.vitorias, estatistica.derrotas), (1, 0, 1))
+        self.assertEqual(EstatisticaJogador.objects.get(pk=self.jogadores[2].pk).vitorias, 1)
+        confronto = ConfrontoJogador.objects.get(id_usuario=self.jogadores[0], id_outro=self.jogadores[1])
+        self.assertEqual((confronto.partidas_como_parceiro, confronto.partidas_como_oponente), (1, 0))
+
+    def test_edicao_manual_com_versao_desatualizada_nao_sobrescreve_report(self):
+        self.client.force_authenticate(self.jogadores[0])
+        self.client.post(self.url, dict(self.payload, versao=0), format='json')
+
+        # A loja editou a partir da versão 0, antes de ver o report dos jogadores
+        self.client.force_authenticate(self.loja)
+        response = self.client.patch(
+            f'/api/v1/torneios/mesas/{self.mesa.id}/editar_manual/',
+            {'pontuacao_time_1': 0, 'pontuacao_time_2': 2, 'time_vencedor': 2, 'versao': 0},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 409)
+        self.mesa.refresh_from_db()
+        self.assertEqual((self.mesa.time_vencedor, self.mesa.versao), (1, 1))
+
+        # Com a versão atual a edição é gravada
+        response = self.client.patch(
+            f'/api/v1/torneios/mesas/{self.mesa.id}/editar_manual/',
+            {'pontuacao_time_1': 0, 'pontuacao_time_2': 2, 'time_vencedor': 2, 'versao': 1},
+            format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        self.mesa.refresh_from_db()
+        self.assertEqual((self.mesa.time_vencedor, self.mesa.versao), (2, 2))
+
+    def test_mesa_inexistente(self):
+        self.client.force_authenticate(self.jogadores[0])
+
+        response = self.client.post('/api/v1/torneios/mesas/999999/reportar_resultado/', self.payload, format='json')
+
+        self.assertEqual(response.status_code, 404)
+
+
+class EstatisticasIncrementaisTests(TestCase):
+    """
+    Testes dos totais incrementais de estatísticas (torneios/estatisticas.py): após cada rota
+    que altera ou remove mesas, rodadas e torneios, os totais devem ser iguais aos do
+    reconstruir_estatisticas.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        cls.jogadores = [
+            Usuario.objects.create_user(
+                email=f'jogador{i}@teste.com', username=f'jogador{i}', password='senha', tipo='JOGADOR'
+            )
+            for i in range(5)
+        ]
+        cls.torneio = Torneio.objects.create(
+            id_loja=cls.loja, nome='Torneio Teste', regras='Regras', status='Em Andamento',
+            data_inicio=timezone.now() + timedelta(days=1),
+        )
+        cls.rodada = Rodada.objects.create(
+            id_torneio=cls.torneio, numero_rodada=1, status='Em Andamento', total_mesas=1
+        )
+        cls.mesa = Mesa.objects.create(id_rodada=cls.rodada, numero_mesa=1)
+        for j, jogador in enumerate(cls.jogadores[:4]):
+            MesaJogador.objects.create(id_mesa=cls.mesa, id_usuario=jogador, time=1 if j < 2 else 2)
+        # O quinto jogador está no snapshot da rodada sem mesa (bye)
+        for jogador in cls.jogadores:
+            Inscricao.objects.create(id_torneio=cls.torneio, id_usuario=jogador, status='Inscrito')
+            RodadaJogador.objects.create(id_rodada=cls.rodada, id_usuario=jogador)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.jogadores[0])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                f'/api/v1/torneios/mesas/{self.mesa.id}/reportar_resultado/',
+                {'pontuacao_time_1': 2, 'pontuacao_time_2': 1, 'time_vencedor': 1}, format='json'
+            )
+        self.client.force_authenticate(self.loja)
+
+    def _totais(self):
+        jogadores = {
+            linha[0]: linha[1:] for linha in EstatisticaJogador.objects.values_list(
+                'id_usuario_id', 'torneios_disputados', 'partidas', 'vitorias', 'empates', 'derrotas', 'byes'
+            ) if any(linha[1:])
+        }
+        confrontos = {
+            linha[:2]: linha[2:] for linha in ConfrontoJogador.objects.values_list(
+                'id_usuario_id', 'id_outro_id', 'partidas_como_parceiro', 'partidas_como_oponente'
+            ) if any(linha[2:])
+        }
+        return jogadores, confrontos
+
+    def _estatistica(self, jogador):
+        return EstatisticaJogador.objects.filter(pk=jogador.pk).values(
+            'torneios_disputados', 'partidas', 'vitorias', 'byes'
+        ).first()
+
+    def assertIgualAReconstrucao(self):
+        incrementais = self._totais()
+        estatisticas.reconstruir_estatisticas()
+        self.assertEqual(incrementais, self._totais())
+
+    def _finalizar(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/v1/torneios/torneios/{self.torneio.id}/finalizar/')
+        self.assertEqual(response.status_code, 200)
+
+    def test_finalizar_conta_bye_e_torneio_disputado(self):
+        self._finalizar()
+
+        self.assertEqual(
+            self._estatistica(self.jogadores[4]),
+            {'torneios_disputados': 1, 'partidas': 0, 'vitorias': 0, 'byes': 1}
+        )
+        self.assertEqual(
+            self._estatistica(self.jogadores[0]),
+            {'torneios_disputados': 1, 'partidas': 1, 'vitorias': 1, 'byes': 0}
+        )
+        self.assertIgualAReconstrucao()
+
+    def test_remover_mesa_reportada_retira_partidas(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/v1/torneios/mesas/{self.mesa.id}/')
+        self.assertEqual(response.status_code, 204)
+
+        self.assertEqual(self._estatistica(self.jogadores[0])['partidas'], 0)
+        self.assertFalse(ConfrontoJogador.objects.exclude(partidas_como_parceiro=0, partidas_como_oponente=0).exists())
+        self.assertIgualAReconstrucao()
+
+    def test_remover_mesa_de_rodada_finalizada_vira_bye(self):
+        self._finalizar()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f'/api/v1/torneios/mesas/{self.mesa.id}/')
+
+        # Sem mesa na rodada finalizada, todos os jogadores do snapshot ficam com bye
+        self.assertEqual(
+            self._estatistica(self.jogadores[0]),
+            {'torneios_disputados': 1, 'partidas': 0, 'vitorias': 0, 'byes': 1}
+        )
+        self.assertIgualAReconstrucao()
+
+    def test_troca_de_assento_em_mesa_reportada(self):
+        Rodada.objects.filter(pk=self.rodada.pk).update(status='Emparelhamento')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/torneios/rodadas/alterar_jogador_mesa/', {
+                'mesa_id': self.mesa.id, 'jogador_id': self.jogadores[4].id, 'time': 1, 'position': 1
+            }, format='json')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self._estatistica(self.jogadores[0])['partidas'], 0)
+        self.assertEqual(self._estatistica(self.jogadores[4])['vitorias'], 1)
+        self.assertIgualAReconstrucao()
+
+    def test_reemparelhar_rodada_com_resultado(self):
+        Rodada.objects.filter(pk=self.rodada.pk).update(status='Emparelhamento')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/v1/torneios/rodadas/{self.rodada.id}/reemparelhar/')
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(self._estatistica(self.jogadores[0])['partidas'], 0)
+        self.assertIgualAReconstrucao()
+
+    def test_excluir_torneio_finalizado_retira_tudo(self):
+        self._finalizar()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/v1/torneios/torneios/{self.torneio.id}/')
+        self.assertEqual(response.status_code, 204)
+
+        self.assertEqual(self._totais(), ({}, {}))
+        self.assertIgualAReconstrucao()
+
+
+class GetCondicionalTests(TestCase):
+    """
+    Testes do GET condicional (ETag / If-None-Match) nas leituras de torneio.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        cls.torneio = Torneio.objects.create(
+            id_loja=cls.loja,
+            nome='Torneio Teste',
+            regras='Regras',
+            data_inicio=timezone.now() + timedelta(days=1),
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.loja)
+        self.url = f'/api/v1/torneios/torneios/{self.torneio.id}/'
+
+    def test_etag_igual_retorna_304_com_uma_query(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.assertNumQueries(1):
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+    def test_alteracao_do_torneio_muda_etag(self):
+        etag = self.client.get(self.url)['ETag']
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.torneio.nome = 'Novo nome'
+            self.torneio.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response.data['nome'], 'Novo nome')
+
+    def test_etag_de_torneio_de_outra_loja_nao_retorna_304(self):
+        outra_loja = Usuario.objects.create_user(
+            email='outra@teste.com', username='outra', password='senha', tipo='LOJA'
+        )
+        self.client.force_authenticate(outra_loja)
+        versao = Torneio.objects.get(pk=self.torneio.pk).versao
+
+        # Mesmo com a ETag adivinhada (torneio, versão e usuário), o torneio continua invisível
+        etag = versoes.gerar_etag(self.torneio.id, versao, outra_loja.id)
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=etag).status_code, 404)
+        self.assertEqual(
+            self.client.get(f'{self.url}ranking_rodada/?rodada_id=1', HTTP_IF_NONE_MATCH=etag).status_code, 404
+        )
+        etag_snapshot = versoes.gerar_etag(self.torneio.id, versao, 'snapshot')
+        self.assertEqual(self.client.get(f'{self.url}snapshot/', HTTP_IF_NONE_MATCH=etag_snapshot).status_code, 404)
+
+
+class EventosTorneioTests(TestCase):
+    """
+    Testes do stream SSE de eventos do torneio (eventos_torneio), via AsyncClient (ASGI).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        cls.jogador = Usuario.objects.create_user(
+            email='jogador@teste.com', username='jogador', password='senha', tipo='JOGADOR'
+        )
+        cls.torneio = Torneio.objects.create(
+            id_loja=cls.loja,
+            nome='Torneio Teste',
+            regras='Regras',
+            status='Em Andamento',
+            data_inicio=timezone.now() + timedelta(days=1),
+        )
+
+    def setUp(self):
+        self.url = f'/api/v1/torneios/torneios/{self.torneio.id}/eventos/'
+
+    async def test_sem_autenticacao_retorna_403(self):
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 403)
+
+    async def test_evento_publicado_chega_ao_stream(self):
+        await self.async_client.aforce_login(self.jogador)
+        response = await self.async_client.get(self.url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        conteudo = aiter(response.streaming_content)
+        self.assertEqual(await anext(conteudo), b'retry: 3000\n\n')
+
+        eventos.obter_backend().publicar(self.torneio.id, eventos.RESULTADO_REPORTADO, {'mesa_id': 1})
+        mensagem = (await anext(conteudo)).decode()
+        await conteudo.aclose()
+
+        self.assertIn('event: resultado_reportado\n', mensagem)
+        self.assertIn('"mesa_id": 1', mensagem)
+
+    def test_sob_wsgi_retorna_404(self):
+        client = Client()
+        client.force_login(self.jogador)
+
+        self.assertEqual(client.get(self.url).status_code, 404)
+
+
+class RankingParcialSobDemandaTests(TransactionTestCase):
+    """
+    Testes do cálculo sob demanda do ranking parcial (garantir_ranking_parcial).
+    TransactionTestCase: as threads usam conexões próprias e precisam ver os dados commitados.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        jogadores = [
+            Usuario.objects.create_user(
+                email=f'jogador{i}@teste.com', username=f'jogador{i}', password='senha', tipo='JOGADOR'
+            )
+            for i in range(4)
+        ]
+        self.torneio = Torneio.objects.create(
+            id_loja=self.loja,
+            nome='Torneio Teste',
+            regras='Regras',
+            status='Em Andamento',
+            data_inicio=timezone.now() + timedelta(days=1),
+        )
+        self.rodada = Rodada.objects.create(
+            id_torneio=self.torneio, numero_rodada=1, status='Finalizada', total_mesas=1
+        )
+        mesa = Mesa.objects.create(
+            id_rodada=self.rodada, numero_mesa=1, pontuacao_time_1=2, pontuacao_time_2=1, time_vencedor=1
+        )
+        for j, jogador in enumerate(jogadores):
+            Inscricao.objects.create(id_torneio=self.torneio, id_usuario=jogador)
+            MesaJogador.objects.create(id_mesa=mesa, id_usuario=jogador, time=1 if j < 2 else 2)
+
+    def test_chamadas_simultaneas_calculam_uma_vez(self):
+        calcular = ranking_utils.calcular_e_salvar_ranking_parcial
+        chamadas = []
+
+        def calcular_devagar(torneio, rodada_numero):
+            chamadas.append(rodada_numero)
+            threading.Event().wait(0.2)  # Mantém o cálculo em andamento enquanto os outros chegam
+            return calcular(torneio, rodada_numero)
+
+        largada = threading.Barrier(4)
+        resultados = []
+
+        def requisicao():
+            try:
+                largada.wait()
+                resultados.append(ranking_utils.garantir_ranking_parcial(self.torneio, 1))
+            finally:
+                connection.close()
+
+        with mock.patch.object(ranking_utils, 'calcular_e_salvar_ranking_parcial', calcular_devagar):
+            threads = [threading.Thread(target=requisicao) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        self.assertEqual(chamadas, [1])
+        self.assertEqual(sorted(resultados), [False, False, False, True])
+        self.assertEqual(RankingParcial.objects.filter(id_torneio=self.torneio, rodada_numero=1).count(), 4)
+
+    def test_calculo_sob_demanda_no_get_nao_altera_versao(self):
+        client = APIClient()
+        client.force_authenticate(self.loja)
+        versao = Torneio.objects.get(pk=self.torneio.pk).versao
+
+        response = client.get(
+            f'/api/v1/torneios/torneios/{self.torneio.id}/ranking_rodada/', {'rodada_id': self.rodada.id}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(RankingParcial.objects.filter(id_torneio=self.torneio, rodada_numero=1).exists())
+        self.assertEqual(Torneio.objects.get(pk=self.torneio.pk).versao, versao)
+
+
+class VersoesTests(TestCase):
+    """
+    Testes do acúmulo dos incrementos de versão por transação (versoes.tocar_*).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        cls.torneios = [
+            Torneio.objects.create(
+                id_loja=loja, nome=f'Torneio {i}', regras='Regras', data_inicio=timezone.now() + timedelta(days=1)
+            )
+            for i in range(2)
+        ]
+        cls.rodada = Rodada.objects.create(id_torneio=cls.torneios[0], numero_rodada=1, total_mesas=1)
+
+    def _versoes(self):
+        return [Torneio.objects.get(pk=torneio.pk).versao for torneio in self.torneios]
+
+    def test_varias_marcacoes_geram_um_incremento_apos_commit(self):
+        antes = self._versoes()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                for _ in range(3):
+                    versoes.tocar_torneio(self.torneios[0].id)
+                versoes.tocar_rodada(self.rodada.id)
+                self.assertEqual(self._versoes(), antes)
+
+        self.assertEqual(self._versoes(), [antes[0] + 1, antes[1]])
+
+    def test_savepoint_desfeito_descarta_suas_marcacoes(self):
+        antes = self._versoes()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                versoes.tocar_torneio(self.torneios[0].id)
+                try:
+                    with transaction.atomic():
+                        versoes.tocar_torneio(self.torneios[1].id)
+                        raise IntegrityError
+                except IntegrityError:
+                    pass
+                versoes.tocar_torneio(self.torneios[0].id)
+
+        self.assertEqual(self._versoes(), [antes[0] + 1, antes[1]])
+
+
+class ParticipantesTests(TestCase):
+    """
+    Testes do acesso à lista de participantes (TorneioViewSet.participantes).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        cls.outra_loja = Usuario.objects.create_user(
+            email='outra@teste.com', username='outra', password='senha', tipo='LOJA'
+        )
+        cls.admin = Usuario.objects.create_user(
+            email='admin@teste.com', username='admin', password='senha', tipo='ADMIN'
+        )
+        jogador = Usuario.objects.create_user(
+            email='jogador@teste.com', username='jogador', password='senha', tipo='JOGADOR'
+        )
+        cls.torneio = Torneio.objects.create(
+            id_loja=cls.loja, nome='Torneio Teste', regras='Regras', data_inicio=timezone.now() + timedelta(days=1)
+        )
+        Inscricao.objects.create(id_torneio=cls.torneio, id_usuario=jogador)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = f'/api/v1/torneios/torneios/{self.torneio.id}/participantes/'
+
+    def test_loja_dona_e_admin_veem_participantes(self):
+        for usuario in (self.loja, self.admin):
+            self.client.force_authenticate(usuario)
+            response = self.client.get(self.url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual([p['username'] for p in response.data['participantes']], ['jogador'])
+
+    def test_outra_loja_recebe_403(self):
+        self.client.force_authenticate(self.outra_loja)
+
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_anonimo_recebe_403(self):
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+@override_settings(CACHE_COMPARTILHADO=True)
+class ListagemTorneiosTests(TestCase):
+    """
+    Testes da listagem de torneios (TorneioViewSet.list). O cache do feed exige cache
+    compartilhado; aqui o locmem basta (um único processo).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.jogadores = [
+            Usuario.objects.create_user(
+                email=f'jogador{i}@teste.com', username=f'jogador{i}', password='senha', tipo='JOGADOR'
+            )
+            for i in range(3)
+        ]
+        for i in range(6):
+            loja = Usuario.objects.create_user(
+                email=f'loja{i}@teste.com', username=f'loja{i}', password='senha', tipo='LOJA'
+            )
+            torneio = Torneio.objects.create(
+                id_loja=loja,
+                nome=f'Torneio {i}',
+                regras='Regras',
+                qnt_vagas=4,
+                data_inicio=timezone.now() + timedelta(days=1),
+            )
+            for jogador in cls.jogadores[:i % 3]:
+                Inscricao.objects.create(id_usuario=jogador, id_torneio=torneio)
+
+        Inscricao.objects.filter(id_usuario=cls.jogadores[0]).update(status='Cancelado')
+
+    def setUp(self):
+        cache.clear()
+
+    def test_listagem_com_loja_e_vagas_sem_query_por_torneio(self):
+        client = APIClient()
+        client.force_authenticate(self.jogadores[0])
+
+        # Só a listagem (loja e vagas na mesma query); a geração do feed vem do cache
+        with self.assertNumQueries(1):
+            response = client.get('/api/v1/torneios/torneios/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 6)
+        por_nome = {torneio['nome']: torneio for torneio in response.data}
+        self.assertEqual(por_nome['Torneio 2']['loja_nome'], 'loja2')
+        self.assertEqual(por_nome['Torneio 2']['inscritos_ativos'], 1)
+        self.assertEqual(por_nome['Torneio 2']['vagas_restantes'], 3)
+
+    def test_listagem_servida_do_cache_ate_alteracao(self):
+        client = APIClient()
+        client.force_authenticate(self.jogadores[1])
+        client.get('/api/v1/torneios/torneios/')
+
+        with self.assertNumQueries(0):
+            response = client.get('/api/v1/torneios/torneios/')
+        self.assertEqual(len(response.data), 6)
+
+        # A inscrição incrementa a versão do torneio após o commit, avançando a geração do feed
+        with self.captureOnCommitCallbacks(execute=True):
+            Inscricao.objects.filter(id_usuario=self.jogadores[1]).update(status='Cancelado')
+            Inscricao.objects.filter(id_usuario=self.jogadores[1]).first().save()
+
+        with self.assertNumQueries(1):
+            response = client.get('/api/v1/torneios/torneios/')
+        por_nome = {torneio['nome']: torneio for torneio in response.data}
+        self.assertEqual(por_nome['Torneio 2']['inscritos_ativos'], 0)
+
+    def test_alteracao_da_loja_invalida_feed(self):
+        client = APIClient()
+        client.get('/api/v1/torneios/torneios/')
+
+        loja = Usuario.objects.get(username='loja2')
+        with self.captureOnCommitCallbacks(execute=True):
+            loja.username = 'loja-renomeada'
+            loja.save()
+
+        response = client.get('/api/v1/torneios/torneios/')
+        por_nome = {torneio['nome']: torneio for torneio in response.data}
+        self.assertEqual(por_nome['Torneio 2']['loja_nome'], 'loja-renomeada')
+
+    @override_settings(CACHE_COMPARTILHADO=False)
+    def test_sem_cache_compartilhado_feed_nao_e_guardado(self):
+        client = APIClient()
+        client.get('/api/v1/torneios/torneios/')
+
+        with self.assertNumQueries(1):
+            self.assertEqual(client.get('/api/v1/torneios/torneios/').status_code, 200)
+
+    def test_campos_esparsos_reduzem_resposta_e_colunas(self):
+        client = APIClient()
+        client.force_authenticate(self.jogadores[0])
+
+        with self.assertNumQueries(1) as consultas:
+            response = client.get('/api/v1/torneios/torneios/', {'fields': 'id,nome,vagas_restantes'})
+
+        self.assertEqual(set(response.data[0]), {'id', 'nome', 'vagas_restantes'})
+        sql = consultas.captured_queries[0]['sql']
+        self.assertNotIn('"regras"', sql)
+        self.assertNotIn('usuarios_usuario', sql)
+
+        response = client.get('/api/v1/torneios/torneios/', {'omit': 'regras,descricao,loja_email'})
+        self.assertNotIn('regras', response.data[0])
+        self.assertIn('loja_nome', response.data[0])
+
+
+class PrioridadeTorneioTests(TestCase):
+    """
+    Testes da prioridade do feed (Torneio.save), que acompanha o status inclusive em gravações
+    com update_fields, como as de cancelar, iniciar e finalizar.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        cls.jogadores = [
+            Usuario.objects.create_user(
+                email=f'jogador{i}@teste.com', username=f'jogador{i}', password='senha', tipo='JOGADOR'
+            )
+            for i in range(4)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.loja)
+        self.torneio = Torneio.objects.create(
+            id_loja=self.loja, nome='Torneio Teste', regras='Regras', data_inicio=timezone.now() + timedelta(days=1)
+        )
+
+    def assertPrioridadeGravada(self, status, prioridade):
+        self.assertEqual(
+            Torneio.objects.filter(pk=self.torneio.pk).values_list('status', 'prioridade').get(), (status, prioridade)
+        )
+
+    def test_save_com_update_fields_grava_a_prioridade(self):
+        self.assertPrioridadeGravada('Aberto', Torneio.PRIORIDADE_ABERTO)
+
+        for status_torneio, prioridade in [
+            ('Em Andamento', Torneio.PRIORIDADE_EM_ANDAMENTO),
+            ('Expirado', Torneio.PRIORIDADE_EXPIRADO),
+            ('Finalizado', Torneio.PRIORIDADE_OUTROS),
+        ]:
+            self.torneio.status = status_torneio
+            self.torneio.save(update_fields=['status'])
+            self.assertPrioridadeGravada(status_torneio, prioridade)
+
+    def test_cancelar_grava_a_prioridade(self):
+        response = self.client.post(
+            f'/api/v1/torneios/torneios/{self.torneio.id}/cancelar/', {'confirmacao': True}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertPrioridadeGravada('Cancelado', Torneio.PRIORIDADE_OUTROS)
+
+    def test_iniciar_e_finalizar_gravam_a_prioridade(self):
+        for jogador in self.jogadores:
+            Inscricao.objects.create(id_usuario=jogador, id_torneio=self.torneio)
+
+        response = self.client.post(f'/api/v1/torneios/torneios/{self.torneio.id}/iniciar/')
+        self.assertEqual(response.status_code, 200)
+        self.assertPrioridadeGravada('Em Andamento', Torneio.PRIORIDADE_EM_ANDAMENTO)
+
+        mesa = Mesa.objects.get(id_rodada__id_torneio=self.torneio)
+        jogador = APIClient()
+        jogador.force_authenticate(mesa.jogadores_na_mesa.first().id_usuario)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = jogador.post(
+                f'/api/v1/torneios/mesas/{mesa.id}/reportar_resultado/',
+                {'pontuacao_time_1': 2, 'pontuacao_time_2': 0, 'time_vencedor': 1},
+                format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/v1/torneios/torneios/{self.torneio.id}/finalizar/')
+        self.assertEqual(response.status_code, 200)
+        self.assertPrioridadeGravada('Finalizado', Torneio.PRIORIDADE_OUTROS)
+
+
+class PaginacaoKeysetTests(TestCase):
+    """
+    Testes da paginação por keyset (PaginacaoKeyset) na listagem de torneios,
+    ordenada por (prioridade, data_inicio, id).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        inicio = timezone.now() + timedelta(days=1)
+        # Quatro torneios empatados em (prioridade, data_inicio) e um que vem antes de todos
+        cls.empatados = [
+            Torneio.objects.create(id_loja=cls.loja, nome=f'Empatado {i}', regras='Regras', data_inicio=inicio)
+            for i in range(4)
+        ]
+        cls.primeiro = Torneio.objects.create(
+            id_loja=cls.loja, nome='Primeiro', regras='Regras', data_inicio=inicio - timedelta(hours=1)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.loja)
+        self.url = '/api/v1/torneios/torneios/'
+
+    def _percorrer(self, limite):
+        """Segue os links `proximo` e retorna os ids de cada página."""
+        paginas = []
+        response = self.client.get(self.url, {'limite': limite})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            paginas.append([torneio['id'] for torneio in response.data['resultados']])
+            if response.data['proximo'] is None:
+                return paginas
+            response = self.client.get(response.data['proximo'])
+
+    def test_empates_na_ordenacao_sem_repetir_nem_pular(self):
+        esperado = [self.primeiro.id] + [torneio.id for torneio in self.empatados]
+
+        paginas = self._percorrer(2)
+
+        self.assertEqual([len(pagina) for pagina in paginas], [2, 2, 1])
+        self.assertEqual(sum(paginas, []), esperado)
+
+    def test_pagina_exata_nao_tem_proxima(self):
+        self.assertEqual([len(pagina) for pagina in self._percorrer(5)], [5])
+        self.assertEqual([len(pagina) for pagina in self._percorrer(4)], [4, 1])
+
+    def test_cursor_malformado_retorna_400(self):
+        def codificar(valor):
+            return base64.urlsafe_b64encode(valor.encode()).decode()
+
+        cursores = [
+            'nao-e-base64!!',
+            codificar('nao e json'),
+            codificar('{"id": 1}'),
+            codificar('[1]'),
+            codificar('["a", "b", "c"]'),
+        ]
+        for cursor in cursores:
+            response = self.client.get(self.url, {'cursor': cursor})
+            self.assertEqual(response.status_code, 400, cursor)
+            self.assertEqual(response.data['detail'], 'Cursor inválido.')
+
+
+class ExpiracaoTorneiosTests(TestCase):
+    """
+    Testes da expiração de torneios 'Aberto' não iniciados (comando expirar_torneios).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        cls.antigo = Torneio.objects.create(
+            id_loja=cls.loja, nome='Antigo', regras='Regras', status='Aberto',
+            data_inicio=timezone.now() - timedelta(hours=2)
+        )
+        cls.na_tolerancia = Torneio.objects.create(
+            id_loja=cls.loja, nome='Na tolerância', regras='Regras', status='Aberto',
+            data_inicio=timezone.now() - timedelta(minutes=30)
+        )
+
+    def setUp(self):
+        cache.clear()
+
+    def test_torneio_aberto_antigo_expira_e_sai_da_listagem(self):
+        client = APIClient()
+        client.force_authenticate(self.loja)
+        self.assertEqual(len(client.get('/api/v1/torneios/torneios/').data), 2)
+
+        call_command('expirar_torneios', stdout=io.StringIO())
+
+        self.antigo.refresh_from_db()
+        self.na_tolerancia.refresh_from_db()
+        self.assertEqual(self.antigo.status, 'Expirado')
+        self.assertEqual(self.na_tolerancia.status, 'Aberto')
+        response = client.get('/api/v1/torneios/torneios/')
+        self.assertEqual([torneio['nome'] for torneio in response.data], ['Na tolerância'])
+
+
+class SnapshotTests(TestCase):
+    """
+    Testes do snapshot agregado do torneio (TorneioViewSet.snapshot).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        cls.jogadores = [
+            Usuario.objects.create_user(
+                email=f'jogador{i}@teste.com', username=f'jogador{i}', password='senha', tipo='JOGADOR'
+            )
+            for i in range(5)
+        ]
+        cls.torneio = Torneio.objects.create(
+            id_loja=cls.loja,
+            nome='Torneio Teste',
+            regras='Regras',
+            status='Em Andamento',
+            data_inicio=timezone.now() + timedelta(days=1),
+        )
+        for jogador in cls.jogadores:
+            Inscricao.objects.create(id_torneio=cls.torneio, id_usuario=jogador)
+        for numero in (1, 2):
+            rodada = Rodada.objects.create(
+                id_torneio=cls.torneio, numero_rodada=numero, status='Em Andamento', total_mesas=1
+            )
+            mesa = Mesa.objects.create(id_rodada=rodada, numero_mesa=1)
+            for j, jogador in enumerate(cls.jogadores[:4]):
+                MesaJogador.objects.create(id_mesa=mesa, id_usuario=jogador, time=1 if j < 2 else 2)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.jogadores[0])
+        self.url = f'/api/v1/torneios/torneios/{self.torneio.id}/snapshot/'
+
+    def test_snapshot_com_numero_fixo_de_queries(self):
+        """
+        Versão e torneio; rodadas, mesas, assentos, inscrições e ranking (um por tipo, não por
+        rodada). Em cache ou com a ETag: só a versão (lida já com a visibilidade do torneio).
+        """
+        with self.assertNumQueries(7):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['rodadas']), 2)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url).data, response.data)
+
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304)
+
+    def test_snapshot_sem_emails_dos_jogadores(self):
+        response = self.client.get(self.url)
+
+        rodada = response.data['rodadas'][0]
+        self.assertEqual(rodada['sobressalentes'], [{'id': self.jogadores[4].id, 'username': 'jogador4'}])
+        self.assertNotIn('email', rodada['mesas'][0]['jogadores'][0])
+        self.assertNotIn(b'jogador0@teste.com', response.content)
+
+
+class MesasDaRodadaTests(TestCase):
+    """
+    Testes das leituras de mesas de uma rodada (RodadaViewSet.mesas e minha_mesa_na_rodada).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        cls.jogadores = [
+            Usuario.objects.create_user(
+                email=f'jogador{i}@teste.com', username=f'jogador{i}', password='senha', tipo='JOGADOR'
+            )
+            for i in range(12)
+        ]
+        torneio = Torneio.objects.create(
+            id_loja=cls.loja,
+            nome='Torneio Teste',
+            regras='Regras',
+            status='Em Andamento',
+            data_inicio=timezone.now() + timedelta(days=1),
+        )
+        cls.rodada = Rodada.objects.create(id_torneio=torneio, numero_rodada=1, status='Em Andamento', total_mesas=3)
+        for numero in range(3):
+            mesa = Mesa.objects.create(id_rodada=cls.rodada, numero_mesa=numero + 1)
+            for j, jogador in enumerate(cls.jogadores[numero * 4:numero * 4 + 4]):
+                MesaJogador.objects.create(id_mesa=mesa, id_usuario=jogador, time=1 if j < 2 else 2)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.jogadores[0])
+
+    def test_mesas_da_rodada_com_numero_fixo_de_queries(self):
+        """Versão do torneio, mesas com rodada/torneio e assentos com usuários."""
+        with self.assertNumQueries(3):
+            response = self.client.get(f'/api/v1/torneios/rodadas/{self.rodada.id}/mesas/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 3)
+        self.assertEqual([len(mesa['jogadores']) for mesa in response.data], [4, 4, 4])
+
+    def test_minha_mesa_separa_times_sem_query_por_time(self):
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                '/api/v1/torneios/mesas/minha_mesa_na_rodada/', {'rodada_id': self.rodada.id}
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([j['username'] for j in response.data['time_1']], ['jogador0', 'jogador1'])
+        self.assertEqual([j['username'] for j in response.data['time_2']], ['jogador2', 'jogador3'])
+        self.assertEqual(response.data['meu_time'], 1)
+
+    def test_painel_do_jogador_com_numero_fixo_de_queries(self):
+        """Inscrições, rodadas atuais, assentos da mesa e ranking: 4 queries para qualquer quantidade de torneios."""
+        Inscricao.objects.create(id_usuario=self.jogadores[0], id_torneio=self.rodada.id_torneio)
+        outro = Torneio.objects.create(
+            id_loja=self.loja, nome='Outro', regras='Regras', data_inicio=timezone.now() + timedelta(days=2)
+        )
+        Inscricao.objects.create(id_usuario=self.jogadores[0], id_torneio=outro)
+
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/v1/torneios/inscricoes/painel/')
+
+        self.assertEqual(response.status_code, 200)
+        atual, aberto = response.data['inscricoes']
+        self.assertEqual(atual['rodada_atual']['id'], self.rodada.id)
+        self.assertEqual([j['username'] for j in atual['mesa_atual']['companheiros']], ['jogador1'])
+        self.assertEqual([j['username'] for j in atual['mesa_atual']['oponentes']], ['jogador2', 'jogador3'])
+        self.assertIsNone(aberto['mesa_atual'])
+
+
+class ContadoresRodadaTests(TestCase):
+    """
+    Testes dos contadores de mesas da rodada (total_mesas/mesas_reportadas) e de RodadaViewSet.progresso
+    ao longo do fluxo: iniciar, reportar, próxima rodada, reemparelhar, editar emparelhamento e remover mesa.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        jogadores = [
+            Usuario.objects.create_user(
+                email=f'jogador{i}@teste.com', username=f'jogador{i}', password='senha', tipo='JOGADOR'
+            )
+            for i in range(9)
+        ]
+        cls.torneio = Torneio.objects.create(
+            id_loja=cls.loja,
+            nome='Torneio Teste',
+            regras='Regras',
+            data_inicio=timezone.now() + timedelta(days=1),
+        )
+        for jogador in jogadores:
+            Inscricao.objects.create(id_usuario=jogador, id_torneio=cls.torneio)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.loja)
+
+    def progresso(self, rodada):
+        response = self.client.get(f'/api/v1/torneios/rodadas/{rodada.id}/progresso/')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def assertContadores(self, rodada, total, reportadas):
+        """Contadores gravados e resposta de progresso batem com as mesas existentes."""
+        rodada.refresh_from_db()
+        self.assertEqual((rodada.total_mesas, rodada.mesas_reportadas), (total, reportadas))
+        self.assertEqual(rodada.mesas.count(), total)
+        self.assertEqual(rodada.mesas.filter(time_vencedor__isnull=False).count(), reportadas)
+        dados = self.progresso(rodada)
+        self.assertEqual(
+            (dados['total_mesas'], dados['mesas_reportadas'], dados['mesas_pendentes'], dados['completa']),
+            (total, reportadas, total - reportadas, total == reportadas)
+        )
+
+    def iniciar(self):
+        response = self.client.post(f'/api/v1/torneios/torneios/{self.torneio.id}/iniciar/')
+        self.assertEqual(response.status_code, 200)
+        return Rodada.objects.get(id_torneio=self.torneio, numero_rodada=1)
+
+    def reportar(self, mesa):
+        jogador = mesa.jogadores_na_mesa.first().id_usuario
+        cliente = APIClient()
+        cliente.force_authenticate(jogador)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = cliente.post(
+                f'/api/v1/torneios/mesas/{mesa.id}/reportar_resultado/',
+                {'pontuacao_time_1': 2, 'pontuacao_time_2': 0, 'time_vencedor': 1},
+                format='json'
+            )
+        self.assertEqual(response.status_code, 200)
+
+    def test_progresso_acompanha_iniciar_e_reportes(self):
+        rodada = self.iniciar()
+        self.assertContadores(rodada, 2, 0)
+
+        primeira, segunda = rodada.mesas.order_by('numero_mesa')
+        self.reportar(primeira)
+        self.assertContadores(rodada, 2, 1)
+        self.reportar(segunda)
+        self.assertContadores(rodada, 2, 2)
+
+    def test_progresso_de_rodada_inexistente_retorna_404(self):
+        response = self.client.get('/api/v1/torneios/rodadas/999999/progresso/')
+        self.assertEqual(response.status_code, 404)
+
+    def test_proxima_rodada_e_reemparelhar_recontam_mesas(self):
+        rodada = self.iniciar()
+        for mesa in rodada.mesas.all():
+            self.reportar(mesa)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/v1/torneios/torneios/{self.torneio.id}/proxima_rodada/')
+        self.assertEqual(response.status_code, 200)
+        segunda = Rodada.objects.get(id_torneio=self.torneio, numero_rodada=2)
+        self.assertContadores(rodada, 2, 2)
+        self.assertContadores(segunda, 2, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.delete(f'/api/v1/torneios/mesas/{segunda.mesas.get(numero_mesa=2).id}/')
+        self.assertContadores(segunda, 1, 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(f'/api/v1/torneios/rodadas/{segunda.id}/reemparelhar/')
+        self.assertEqual(response.status_code, 200)
+        self.assertContadores(segunda, 2, 0)
+
+    def test_editar_emparelhamento_mantem_contadores(self):
+        rodada = self.iniciar()
+        Rodada.objects.filter(pk=rodada.pk).update(status='Pronto_Para_Iniciar')
+        primeira, segunda = rodada.mesas.order_by('numero_mesa')
+        jogador = primeira.jogadores_na_mesa.first().id_usuario_id
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                f'/api/v1/torneios/rodadas/{rodada.id}/editar_emparelhamento/',
+                {'acao': 'mover_jogador_para_mesa', 'jogador_id': jogador, 'nova_mesa_id': segunda.id},
+                format='json'
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContadores(rodada, 2, 0)
+
+    def test_remover_mesa_reportada_desconta_dos_contadores(self):
+        rodada = self.iniciar()
+        primeira, segunda = rodada.mesas.order_by('numero_mesa')
+        self.reportar(primeira)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.delete(f'/api/v1/torneios/mesas/{primeira.id}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertContadores(rodada, 1, 0)
+
+        self.reportar(segunda)
+        self.assertContadores(rodada, 1, 1)
+
+
+class InscricaoEmLoteTests(TestCase):
+    """
+    Testes da inscrição em lote por e-mail (InscricaoViewSet.inscrever_em_lote).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.loja = Usuario.objects.create_user(
+            email='loja@teste.com', username='loja', password='senha', tipo='LOJA'
+        )
+        cls.jogadores = [
+            Usuario.objects.create_user(
+                email=f'jogador{i}@teste.com', username=f'jogador{i}', password='senha', tipo='JOGADOR'
+            )
+            for i in range(20)
+        ]
+        cls.torneio = Torneio.objects.create(
+            id_loja=cls.loja,
+            nome='Torneio Teste',
+            regras='Regras',
+            qnt_vagas=15,
+            data_inicio=timezone.now() + timedelta(days=1),
+        )
+        Inscricao.objects.create(id_usuario=cls.jogadores[0], id_torneio=cls.torneio)
+
+    def test_lote_com_numero_fixo_de_queries_e_relatorio(self):
+        client = APIClient()
+        client.force_authenticate(self.loja)
+        emails = [jogador.email for jogador in self.jogadores] + ['desconhecido@teste.com']
+
+        # Torneio (FOR UPDATE), usuários (IN), inscrições existentes, vagas e um único INSERT,
+        # mais os savepoints do atomic e do bulk_create
+        with self.assertNumQueries(9):
+            response = client.post(
+                '/api/v1/torneios/inscricoes/inscrever_em_lote/',
+                {'torneio_id': self.torneio.id, 'emails': emails},
+                format='json'
+            )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            (response.data['inscritos'], response.data['ignorados'], response.data['desconhecidos']), (14, 6, 1)
+        )
+        self.assertEqual(response.data['relatorio'][0]['motivo'], 'Já inscrito neste torneio')
+        self.assertEqual(response.data['relatorio'][-2]['motivo'], 'Limite de vagas atingido')
+        self.assertEqual(Inscricao.objects.filter(id_torneio=self.torneio).count(), 15)
+
+    def test_email_sem_diferenciar_maiusculas_e_usuario_inativo(self):
+        misto = Usuario.objects.create_user(
+            email='Jogador.Misto@Teste.com', username='misto', password='senha', tipo='JOGADOR'
+        )
+        Usuario.objects.create_user(
+            email='inativo@teste.com', username='inativo', password='senha', tipo='JOGADOR', status='inativo'
+        )
+        client = APIClient()
+        client.force_authenticate(self.loja)
+
+        response = client.post(
+            '/api/v1/torneios/inscricoes/inscrever_em_lote/',
+            {'torneio_id': self.torneio.id, 'emails': ['jogador.MISTO@teste.COM', 'inativo@teste.com']},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['relatorio'][0]['resultado'], 'inscrito')
+        self.assertEqual(response.data['relatorio'][0]['id_usuario'], misto.id)
+        self.assertEqual(response.data['relatorio'][1]['motivo'], 'Usuário não está ativo')
+        self.assertFalse(Inscricao.objects.filter(id_torneio=self.torneio, id_usuario__username='inativo').exists())
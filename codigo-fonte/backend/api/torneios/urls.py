@@ -1,7 +1,9 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from .views import TorneioViewSet, InscricaoViewSet, RodadaViewSet, MesaViewSet
+from .views import (
+    TorneioViewSet, InscricaoViewSet, RodadaViewSet, MesaViewSet, EstatisticaJogadorViewSet, eventos_torneio
+)
 
 # O DefaultRouter do DRF cria automaticamente as URLs para as ViewSets.
 # Ex: /torneios/ (GET, POST), /torneios/1/ (GET, PUT, DELETE)
@@ -13,8 +15,11 @@ router.register(r'torneios', TorneioViewSet, basename='torneio')
 router.register(r'inscricoes', InscricaoViewSet, basename='inscricao')
 router.register(r'rodadas', RodadaViewSet, basename='rodada')
 router.register(r'mesas', MesaViewSet, basename='mesa')
+router.register(r'estatisticas', EstatisticaJogadorViewSet, basename='estatistica')
 
 # As URLs da API são determinadas automaticamente pelo router.
 urlpatterns = [
+    # Stream SSE de eventos do torneio (view assíncrona; sob WSGI responde 404, ver core/asgi.py)
+    path('torneios/<int:torneio_id>/eventos/', eventos_torneio, name='torneio-eventos'),
     path('', include(router.urls)),
 ]
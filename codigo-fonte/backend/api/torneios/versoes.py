@@ -0,0 +1,142 @@
+"""
+Versões de torneio para GET condicional (ETag / If-None-Match).
+
+Cada torneio tem uma coluna `versao` que é incrementada sempre que algo que afeta
+o torneio é gravado (o próprio torneio, inscrições, rodadas, mesas e assentos).
+Os endpoints de leitura mais consultados leem apenas essa versão (uma leitura pela
+chave primária) e, se o cliente já tem a resposta daquela versão, devolvem
+`304 Not Modified` sem executar as queries pesadas nem o serializer.
+
+Os incrementos são acumulados por transação (por savepoint) e aplicados após o
+commit: um emparelhamento que cria 60 mesas gera um incremento só, e uma transação
+desfeita não gera incremento próprio (o que ela marcou pode, no máximo, ser incrementado
+junto com a próxima transação da mesma thread, o que apenas invalida uma ETag a mais).
+"""
+
+import threading
+
+from django.db import transaction
+from django.db.models import F
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+
+from . import cache_respostas
+
+# Acumuladores da thread por (conexão, savepoints abertos); cada conexão pertence a uma thread
+_local = threading.local()
+
+
+class _VersoesPendentes:
+    """Callback de on_commit que acumula os torneios/rodadas alterados na transação."""
+
+    def __init__(self, chave):
+        self.chave = chave
+        self.torneios = set()
+        self.rodadas = set()
+        self.aplicado = False
+
+    def __call__(self):
+        # Registrado a cada marcação: só a primeira execução incrementa
+        if self.aplicado:
+            return
+        self.aplicado = True
+        # Após o commit nenhum acumulador da conexão é reutilizável (os de savepoints desfeitos
+        # também saem daqui; os já registrados continuam na fila do on_commit)
+        acumuladores = _acumuladores()
+        for chave in [chave for chave in acumuladores if chave[0] == self.chave[0]]:
+            del acumuladores[chave]
+        _incrementar(self.torneios, self.rodadas)
+
+
+def _acumuladores():
+    if not hasattr(_local, 'pendentes'):
+        _local.pendentes = {}
+    return _local.pendentes
+
+
+def _incrementar(torneios, rodadas=()):
+    from .models import Torneio, Rodada
+
+    ids = set(torneios)
+    if rodadas:
+        ids.update(Rodada.objects.filter(pk__in=rodadas).values_list('id_torneio_id', flat=True))
+    if ids:
+        Torneio.objects.filter(pk__in=ids).update(versao=F('versao') + 1)
+        # O feed de torneios é invalidado junto com as versões
+        cache_respostas.avancar_geracao_feed()
+
+
+def _marcar(campo, valor):
+    """
+    Acumula a marcação no acumulador do savepoint atual e (re)registra o acumulador em
+    on_commit. Fora de transação retorna False.
+
+    O registro é refeito a cada marcação (as execuções repetidas não fazem nada): se a transação
+    for desfeita, o Django descarta os callbacks dela, e um acumulador que tenha sobrado na
+    thread volta a ser registrado pela próxima transação que o reutilizar. Em um rollback
+    parcial, o Django descarta apenas os callbacks registrados no savepoint desfeito.
+    """
+    conexao = transaction.get_connection()
+    if not conexao.in_atomic_block:
+        return False
+
+    chave = (conexao.alias, tuple(conexao.savepoint_ids))
+    acumuladores = _acumuladores()
+    pendentes = acumuladores.get(chave)
+    if pendentes is None:
+        pendentes = acumuladores[chave] = _VersoesPendentes(chave)
+    getattr(pendentes, campo).add(valor)
+    transaction.on_commit(pendentes)
+    return True
+
+
+def tocar_torneio(torneio_id):
+    """Marca o torneio como alterado (a versão é incrementada após o commit)."""
+    if not _marcar('torneios', torneio_id):
+        _incrementar([torneio_id])
+
+
+def tocar_rodada(rodada_id):
+    """Marca como alterado o torneio ao qual a rodada pertence."""
+    if not _marcar('rodadas', rodada_id):
+        _incrementar((), [rodada_id])
+
+
+def versao_por_rodada(rodada_id):
+    """Tupla (torneio_id, versao) a partir de uma rodada (None se não existir)."""
+    from .models import Rodada
+
+    try:
+        return Rodada.objects.filter(pk=rodada_id).values_list('id_torneio_id', 'id_torneio__versao').first()
+    except (TypeError, ValueError):
+        return None
+
+
+def gerar_etag(*partes):
+    """
+    ETag fraca a partir das partes informadas (ex.: torneio, versão e usuário).
+    O usuário entra na composição porque algumas respostas dependem de quem consulta.
+    """
+    return 'W/"%s"' % '-'.join(str(parte) for parte in partes)
+
+
+def resposta_nao_modificada(request, etag):
+    """Retorna uma resposta 304 se o If-None-Match do cliente corresponder à ETag; senão None."""
+    cabecalho = request.META.get('HTTP_IF_NONE_MATCH')
+    if not cabecalho:
+        return None
+
+    etags_cliente = parse_etags(cabecalho)
+    # Comparação fraca: ignora o prefixo W/
+    alvo = etag.removeprefix('W/')
+    if '*' in etags_cliente or any(e.removeprefix('W/') == alvo for e in etags_cliente):
+        return aplicar_etag(Response(status=status.HTTP_304_NOT_MODIFIED), etag)
+    return None
+
+
+def aplicar_etag(response, etag):
+    """Adiciona a ETag e força o cliente a revalidar a cada consulta."""
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
@@ -7,23 +7,53 @@ from rest_framework.decorators import action
 from rest_framework.response import Response
 
 from django.utils import timezone
-from datetime import timedelta
 
-from django.db import transaction
-from django.db.models import Sum, Count, Q, Case, When, Value, IntegerField
+from django.db import IntegrityError, transaction
+from django.db.models import (
+    Sum, Count, Q, Case, When, Value, IntegerField, F, OuterRef, Subquery, Prefetch, prefetch_related_objects
+)
+from django.db.models.functions import Coalesce, Greatest
+import asyncio
+import csv
+import io
+import json
 import random
-
-from .models import Torneio, Inscricao, Rodada, Mesa, MesaJogador, RankingParcial, RodadaJogador
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.handlers.asgi import ASGIRequest
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+
+from .models import (
+    Torneio, Inscricao, Rodada, Mesa, MesaJogador, RankingParcial, RodadaJogador,
+    EstatisticaJogador, ConfrontoJogador
+)
+from usuarios import busca
 from usuarios.models import Usuario
 from .permissoes import IsLojaOuAdmin, IsApenasLeitura, IsJogadorNaMesa
 from .serializers import (
-    TorneioSerializer, InscricaoSerializer, InscricaoCreateSerializer, InscricaoLojaSerializer, RodadaSerializer,
+    TorneioSerializer, InscricaoSerializer, InscricaoResumoSerializer, InscricaoCreateSerializer,
+    InscricaoLojaSerializer, RodadaSerializer,
     MesaSerializer, MesaDetailSerializer, ReportarResultadoSerializer,
-    EditarJogadoresMesaSerializer, VisualizacaoMesaJogadorSerializer, InscricaoResponseSerializer, IniciarRodadaSerializer
+    EditarJogadoresMesaSerializer, VisualizacaoMesaJogadorSerializer, InscricaoResponseSerializer, IniciarRodadaSerializer,
+    EstatisticaJogadorSerializer
 )
-from .ranking_utils import calcular_e_salvar_ranking_parcial
+from .ranking_utils import calcular_e_salvar_ranking_parcial, garantir_ranking_parcial
+from . import cache_respostas, estatisticas, eventos, versoes
+from core.campos_esparsos import CamposEsparsosFilter
+from core.paginacao import PaginacaoKeyset
 
 
+# Tempo (segundos) que um snapshot de torneio fica em cache. A chave inclui a versão do torneio,
+# então qualquer alteração gera um snapshot novo; o tempo só limita a memória ocupada.
+TEMPO_CACHE_SNAPSHOT = 600
+
+# Máximo de e-mails por requisição de inscrição em lote
+MAXIMO_INSCRICOES_LOTE = 500
+
 # ViewSets fornecem uma implementação completa de CRUD (Create, Retrieve, Update, Destroy)
 # com pouco código. A lógica de permissão define quem pode fazer o quê em cada endpoint.
 
@@ -105,53 +135,77 @@ class TorneioViewSet(viewsets.ModelViewSet):
     http_method_names = ['get', 'post', 'put', 'delete', 'head', 'options']
     permission_classes = [IsLojaOuAdmin | IsApenasLeitura]
 
-    filter_backends = [filters.DjangoFilterBackend]
+    # ?fields= / ?omit= reduzem a resposta e as colunas lidas (ver core/campos_esparsos.py)
+    filter_backends = [filters.DjangoFilterBackend, CamposEsparsosFilter]
     filterset_class = TorneioFilter  # Usa o filtro customizado para aceitar múltiplos status
 
+    # Paginação opcional (?limite= / ?cursor=) seguindo a mesma ordenação da listagem
+    pagination_class = PaginacaoKeyset
+    ordenacao_keyset = ('prioridade', 'data_inicio', 'id')
+
     def get_queryset(self):
         """
         Retorna lista de torneios com filtros apropriados e ordenação híbrida.
 
         Ordenação:
-        1. Por status (prioridade):
+        1. Por status (coluna `prioridade`, mantida pelo model a cada mudança de status):
            - Em Andamento (prioridade 1)
            - Aberto (prioridade 2)
            - Outros status (prioridade 3)
         2. Por data de início (crescente)
+        A ordenação e o filtro usam apenas colunas indexadas (prioridade, data_inicio).
+
+        Cada torneio já vem com a loja (select_related) e com `inscritos_ativos` e
+        `vagas_restantes` anotados na mesma query, sem consultas extras por torneio.
 
         Filtros:
         - Admins: Veem todos os torneios
         - Lojas: Veem apenas seus próprios torneios
         - Outros: Veem todos (somente leitura)
-        - Torneios com status "Aberto" são ocultados após 1h de tolerância do horário de início
-          (permite inscrições de última hora e pequenos atrasos)
+        - Torneios expirados são ocultados: torneios "Aberto" não iniciados até 1h após o horário
+          de início passam para "Expirado" em segundo plano (ver expiracao.py)
         """
-        agora = timezone.now()
-
-        # Tolerância de 1 hora após o início do torneio
-        limite_tolerancia = agora - timedelta(hours=1)
+        # Inscrições ativas (não canceladas) contadas por subquery correlacionada
+        inscritos_ativos = Inscricao.objects.filter(
+            id_torneio=OuterRef('pk')
+        ).exclude(status='Cancelado').order_by().values('id_torneio').annotate(
+            total=Count('id')
+        ).values('total')
 
         # Define a ordenação híbrida por status e data
-        queryset_base = Torneio.objects.annotate(
-            prioridade=Case(
-                When(status='Em Andamento', then=Value(1)),
-                When(status='Aberto', then=Value(2)),
-                default=Value(3),
+        return self._torneios_visiveis().select_related('id_loja').annotate(
+            inscritos_ativos=Coalesce(Subquery(inscritos_ativos, output_field=IntegerField()), 0),
+            vagas_restantes=Case(
+                When(
+                    vagas_limitadas=True,
+                    qnt_vagas__isnull=False,
+                    then=Greatest(F('qnt_vagas') - F('inscritos_ativos'), Value(0))
+                ),
+                default=None,
                 output_field=IntegerField()
-            )
-        ).order_by('prioridade', 'data_inicio')
+            ),
+        ).order_by('prioridade', 'data_inicio', 'id')
 
-        # Filtra torneios "Aberto" com data/hora passada (com tolerância de 1h)
-        # Mantém torneios que NÃO são "Aberto" OU que são "Aberto" mas iniciaram há menos de 1h
-        queryset_base = queryset_base.filter(
-            Q(~Q(status='Aberto') | Q(status='Aberto', data_inicio__gte=limite_tolerancia))
-        )
+    def _torneios_visiveis(self):
+        """
+        Torneios que o usuário pode ver, sem anotações: base do get_queryset e da leitura
+        de versão do GET condicional (a 304 não pode revelar torneios de outras lojas).
+        """
+        # Oculta torneios expirados (faixa do índice de prioridade)
+        queryset = Torneio.objects.filter(prioridade__lt=Torneio.PRIORIDADE_EXPIRADO)
 
         # Aplica filtro específico para lojas
         if self.request.user.is_authenticated and self.request.user.tipo == 'LOJA':
-            return queryset_base.filter(id_loja=self.request.user)
+            queryset = queryset.filter(id_loja=self.request.user)
+
+        return queryset
 
-        return queryset_base
+    def _versao_visivel(self, pk):
+        """Versão do torneio se ele existir e for visível para o usuário; None caso contrário."""
+        try:
+            return self._torneios_visiveis().filter(pk=pk).values_list('versao', flat=True).first()
+        except (TypeError, ValueError):
+            return None
 
     @swagger_auto_schema(
         request_body=TorneioSerializer,
@@ -197,6 +251,11 @@ class TorneioViewSet(viewsets.ModelViewSet):
         else:
             serializer.save()
 
+    def perform_destroy(self, instance):
+        """Retira das estatísticas dos jogadores as partidas, byes e participação do torneio."""
+        with transaction.atomic(), estatisticas.alteracao_de_rodadas(Rodada.objects.filter(id_torneio=instance)):
+            instance.delete()
+
     def get_object(self):
         """
         Retorna um torneio específico após verificar permissões.
@@ -207,6 +266,35 @@ class TorneioViewSet(viewsets.ModelViewSet):
             self.check_object_permissions(self.request, obj)
         return obj
 
+    def list(self, request, *args, **kwargs):
+        """
+        Feed de torneios. Com cache compartilhado, servido do cache de respostas enquanto
+        nenhum torneio, inscrição ou loja mudar (ver cache_respostas.geracao_feed).
+        """
+        if not settings.CACHE_COMPARTILHADO:
+            return super().list(request, *args, **kwargs)
+
+        listar = super().list
+        chave = cache_respostas.chave('torneios', request, cache_respostas.geracao_feed())
+        return cache_respostas.resposta_em_cache(chave, lambda: listar(request, *args, **kwargs))
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Detalhes do torneio com GET condicional: se o If-None-Match do cliente corresponde
+        à versão atual do torneio, responde 304 sem consultar o torneio nem serializar.
+        A versão só é lida de torneios visíveis para o usuário.
+        """
+        versao = self._versao_visivel(kwargs.get('pk'))
+        if versao is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag = versoes.gerar_etag(kwargs['pk'], versao, request.user.pk or 0)
+        nao_modificada = versoes.resposta_nao_modificada(request, etag)
+        if nao_modificada:
+            return nao_modificada
+
+        return versoes.aplicar_etag(super().retrieve(request, *args, **kwargs), etag)
+
     @swagger_auto_schema(
         method='post',
         responses={
@@ -378,6 +466,13 @@ class TorneioViewSet(viewsets.ModelViewSet):
                     )
                 
                 mesas_criadas += 1
+
+            # Contadores de progresso da rodada (mesas novas ainda sem resultado)
+            rodada.atualizar_contadores(mesas_criadas)
+
+            # A rodada 1 já nasce emparelhada e em andamento (eventos enviados após o commit)
+            eventos.publicar_evento(torneio.id, eventos.RODADA_CRIADA, _dados_evento_rodada(rodada))
+            eventos.publicar_evento(torneio.id, eventos.EMPARELHAMENTO_PUBLICADO, _dados_evento_rodada(rodada))
             
             # Jogadores restantes (se houver) recebem bye implícito
             # (não jogam nesta rodada)
@@ -460,10 +555,8 @@ class TorneioViewSet(viewsets.ModelViewSet):
             )
 
         # Validação: Todas as mesas devem ter resultado reportado
-        mesas_sem_resultado = Mesa.objects.filter(
-            id_rodada=rodada_atual,
-            time_vencedor__isnull=True
-        ).count()
+        # (contadores mantidos na própria rodada, sem contar as mesas)
+        mesas_sem_resultado = rodada_atual.mesas_pendentes
 
         if mesas_sem_resultado > 0:
             return Response(
@@ -482,6 +575,7 @@ class TorneioViewSet(viewsets.ModelViewSet):
             # Finaliza rodada atual
             rodada_atual.status = 'Finalizada'
             rodada_atual.save(update_fields=['status'])
+            estatisticas.registrar_rodada_finalizada(rodada_atual)
 
             # Calcula e salva ranking da rodada que acabou de finalizar
             try:
@@ -558,6 +652,12 @@ class TorneioViewSet(viewsets.ModelViewSet):
             else:
                 mesas_criadas_count = 0
 
+            # Contadores de progresso da nova rodada
+            nova_rodada.atualizar_contadores(mesas_criadas_count)
+
+            eventos.publicar_evento(torneio.id, eventos.RODADA_FINALIZADA, _dados_evento_rodada(rodada_atual))
+            eventos.publicar_evento(torneio.id, eventos.RODADA_CRIADA, _dados_evento_rodada(nova_rodada))
+
             # Atualiza a mensagem de resposta
             message = f"Rodada {rodada_atual.numero_rodada} finalizada. Nova rodada {nova_rodada.numero_rodada} criada com {mesas_criadas_count} mesa(s) emparelhada(s) automaticamente."
 
@@ -634,10 +734,8 @@ class TorneioViewSet(viewsets.ModelViewSet):
             )
         
         # Validação: Todas as mesas devem ter resultado reportado
-        mesas_sem_resultado = Mesa.objects.filter(
-            id_rodada=rodada_atual,
-            time_vencedor__isnull=True
-        ).count()
+        # (contadores mantidos na própria rodada, sem contar as mesas)
+        mesas_sem_resultado = rodada_atual.mesas_pendentes
         
         if mesas_sem_resultado > 0:
             return Response(
@@ -649,6 +747,7 @@ class TorneioViewSet(viewsets.ModelViewSet):
             # Finaliza rodada atual
             rodada_atual.status = 'Finalizada'
             rodada_atual.save(update_fields=['status'])
+            estatisticas.registrar_rodada_finalizada(rodada_atual)
 
             # Calcula e salva ranking final com todas as métricas
             ranking_calculado = calcular_e_salvar_ranking_parcial(torneio, rodada_atual.numero_rodada)
@@ -676,6 +775,13 @@ class TorneioViewSet(viewsets.ModelViewSet):
             # Muda status do torneio para 'Finalizado'
             torneio.status = 'Finalizado'
             torneio.save(update_fields=['status'])
+            estatisticas.registrar_torneio_finalizado(torneio)
+
+            eventos.publicar_evento(
+                torneio.id,
+                eventos.RODADA_FINALIZADA,
+                dict(_dados_evento_rodada(rodada_atual), torneio_finalizado=True)
+            )
 
             total_rodadas = Rodada.objects.filter(id_torneio=torneio).count()
 
@@ -824,8 +930,8 @@ class TorneioViewSet(viewsets.ModelViewSet):
         """
         Retorna o ranking parcial até uma rodada específica.
         Usa cache de RankingParcial quando disponível, calcula sob demanda caso contrário.
+        Suporta GET condicional (ETag pela versão do torneio).
         """
-        torneio = self.get_object()
         rodada_id = request.query_params.get('rodada_id')
 
         if not rodada_id:
@@ -834,6 +940,26 @@ class TorneioViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        # Verifica a versão (e a visibilidade) antes de qualquer query pesada
+        versao = self._versao_visivel(pk)
+        etag = versoes.gerar_etag(pk, versao, request.user.pk or 0) if versao is not None else None
+        if etag:
+            nao_modificada = versoes.resposta_nao_modificada(request, etag)
+            if nao_modificada:
+                return nao_modificada
+
+        if not etag:
+            return self._resposta_ranking_rodada(rodada_id)
+
+        # Cache de respostas pela versão do torneio: rankings de rodadas finalizadas não mudam
+        chave = cache_respostas.chave('ranking_rodada', request, pk, versao)
+        response = cache_respostas.resposta_em_cache(chave, lambda: self._resposta_ranking_rodada(rodada_id))
+        return versoes.aplicar_etag(response, etag)
+
+    def _resposta_ranking_rodada(self, rodada_id):
+        """Monta a resposta do ranking parcial até a rodada informada."""
+        torneio = self.get_object()
+
         try:
             rodada_alvo = Rodada.objects.get(id=rodada_id, id_torneio=torneio)
         except Rodada.DoesNotExist:
@@ -865,8 +991,9 @@ class TorneioViewSet(viewsets.ModelViewSet):
         else:
             # Cache não existe - calcula sob demanda
             if rodada_alvo.status == 'Finalizada':
-                # Rodada finalizada - calcula e salva no cache
-                calcular_e_salvar_ranking_parcial(torneio, rodada_alvo.numero_rodada)
+                # Rodada finalizada - calcula e salva no cache (uma única vez, mesmo com
+                # várias requisições simultâneas; as demais aguardam e leem o resultado)
+                garantir_ranking_parcial(torneio, rodada_alvo.numero_rodada)
 
                 # Busca do cache recém criado
                 ranking_cache = RankingParcial.objects.filter(
@@ -896,25 +1023,25 @@ class TorneioViewSet(viewsets.ModelViewSet):
                 ).order_by('-numero_rodada').first()
 
                 if ultima_rodada_finalizada:
-                    # Calcula ranking detalhado até a última rodada finalizada
-                    ranking_ordenado = calcular_e_salvar_ranking_parcial(
-                        torneio,
-                        ultima_rodada_finalizada.numero_rodada
-                    )
+                    # Ranking detalhado até a última rodada finalizada (calculado uma única vez)
+                    garantir_ranking_parcial(torneio, ultima_rodada_finalizada.numero_rodada)
+
+                    ranking_cache = RankingParcial.objects.filter(
+                        id_torneio=torneio,
+                        rodada_numero=ultima_rodada_finalizada.numero_rodada
+                    ).select_related('id_usuario').order_by('posicao')
 
                     ranking = []
-                    for idx, metricas in enumerate(ranking_ordenado):
-                        from usuarios.models import Usuario
-                        usuario = Usuario.objects.get(id=metricas['jogador_id'])
+                    for item in ranking_cache:
                         ranking.append({
-                            'posicao': idx + 1,
-                            'jogador_id': metricas['jogador_id'],
-                            'jogador_nome': usuario.username,
-                            'pontos': metricas['pontos'],
-                            'mw_percentage': float(metricas['mw']),
-                            'omw_percentage': float(metricas['omw']),
-                            'pmw_percentage': float(metricas['pmw']),
-                            'balanco': float(metricas['balanco'])
+                            'posicao': item.posicao,
+                            'jogador_id': item.id_usuario.id,
+                            'jogador_nome': item.id_usuario.username,
+                            'pontos': item.pontos_totais,
+                            'mw_percentage': float(item.mw_percentage),
+                            'omw_percentage': float(item.omw_percentage),
+                            'pmw_percentage': float(item.pmw_percentage),
+                            'balanco': float(item.balanco)
                         })
                 else:
                     # Nenhuma rodada finalizada ainda - retorna ranking vazio com jogadores inscritos
@@ -940,6 +1067,217 @@ class TorneioViewSet(viewsets.ModelViewSet):
             'ranking': ranking
         }, status=status.HTTP_200_OK)
 
+    @swagger_auto_schema(
+        method='get',
+        responses={
+            200: openapi.Response(
+                description='Participantes do torneio',
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'torneio_id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'total_ativos': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'participantes': openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                properties={
+                                    'id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                                    'id_usuario': openapi.Schema(type=openapi.TYPE_INTEGER),
+                                    'username': openapi.Schema(type=openapi.TYPE_STRING),
+                                    'status': openapi.Schema(type=openapi.TYPE_STRING),
+                                    'data_inscricao': openapi.Schema(type=openapi.TYPE_STRING, format='date-time'),
+                                }
+                            )
+                        ),
+                    }
+                )
+            ),
+            304: 'Participantes não mudaram desde a ETag informada',
+            403: 'Acesso negado a este torneio',
+            404: 'Torneio não encontrado'
+        },
+        operation_summary="Participantes do torneio",
+        operation_description="""
+        Lista enxuta dos participantes de um torneio, pensada para consultas frequentes
+        (ex.: painel da loja): sem decklist e sem e-mail, lida em uma única query.
+        Restrita à loja dona do torneio e a administradores.
+
+        Suporta GET condicional: envie a ETag recebida em If-None-Match para receber 304
+        enquanto nenhuma inscrição do torneio mudar.
+        """
+    )
+    @action(detail=True, methods=['get'], permission_classes=[IsLojaOuAdmin])
+    def participantes(self, request, pk=None):
+        """Lista de participantes (roster) de um torneio, com GET condicional."""
+        try:
+            torneio = Torneio.objects.filter(pk=pk).values_list('versao', 'id_loja_id').first()
+        except (TypeError, ValueError):
+            torneio = None
+        if torneio is None:
+            return Response({"detail": "Torneio não encontrado"}, status=status.HTTP_404_NOT_FOUND)
+        versao, loja_id = torneio
+        if request.user.tipo != 'ADMIN' and loja_id != request.user.id:
+            return Response({"detail": "Acesso negado a este torneio"}, status=status.HTTP_403_FORBIDDEN)
+
+        etag = versoes.gerar_etag(pk, versao, 'participantes')
+        nao_modificada = versoes.resposta_nao_modificada(request, etag)
+        if nao_modificada:
+            return nao_modificada
+
+        participantes = list(
+            Inscricao.objects.filter(id_torneio_id=pk).order_by('id').values(
+                'id', 'id_usuario', 'status', 'data_inscricao', username=F('id_usuario__username')
+            )
+        )
+
+        response = Response({
+            'torneio_id': int(pk),
+            'total_ativos': sum(1 for p in participantes if p['status'] != 'Cancelado'),
+            'participantes': participantes,
+        })
+        return versoes.aplicar_etag(response, etag)
+
+    @swagger_auto_schema(
+        method='get',
+        responses={
+            200: openapi.Response(
+                description='Snapshot do torneio',
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'versao': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'torneio': openapi.Schema(type=openapi.TYPE_OBJECT),
+                        'rodadas': openapi.Schema(
+                            type=openapi.TYPE_ARRAY,
+                            items=openapi.Schema(
+                                type=openapi.TYPE_OBJECT,
+                                description='Rodada com `mesas` (jogadores incluídos) e `sobressalentes`'
+                            )
+                        ),
+                        'ranking': openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            description='Ranking parcial mais recente ({rodada_numero, ranking}) ou null',
+                            x_nullable=True
+                        ),
+                    }
+                )
+            ),
+            304: 'Torneio não mudou desde a ETag informada',
+            404: 'Torneio não encontrado'
+        },
+        operation_summary="Snapshot completo do torneio",
+        operation_description="""
+        Retorna em uma única resposta tudo o que a página do torneio precisa: dados do torneio,
+        rodadas com mesas e jogadores, sobressalentes de cada rodada e o ranking parcial mais recente.
+        Os jogadores vêm sem e-mail (o snapshot é o mesmo para qualquer leitor).
+
+        Montado com número fixo de queries e guardado em cache pela versão do torneio:
+        enquanto nada mudar, as consultas seguintes não recalculam o snapshot.
+        Suporta GET condicional (If-None-Match → 304).
+        """
+    )
+    @action(detail=True, methods=['get'], permission_classes=[IsLojaOuAdmin | IsApenasLeitura])
+    def snapshot(self, request, pk=None):
+        """Snapshot agregado do torneio (torneio, rodadas, mesas, sobressalentes e ranking)."""
+        # A leitura da versão também confirma que o torneio é visível para o usuário
+        versao = self._versao_visivel(pk)
+        if versao is None:
+            raise Http404
+
+        etag = versoes.gerar_etag(pk, versao, 'snapshot')
+        nao_modificada = versoes.resposta_nao_modificada(request, etag)
+        if nao_modificada:
+            return nao_modificada
+
+        # O conteúdo é o mesmo para todos; a visibilidade segue a do retrieve
+        chave = f'torneio_snapshot:{pk}:{versao}'
+        dados = cache.get(chave)
+        if dados is None:
+            torneio = self.get_queryset().filter(pk=pk).first()
+            if torneio is None:
+                raise Http404
+            dados = self._montar_snapshot(torneio)
+            cache.set(chave, dados, TEMPO_CACHE_SNAPSHOT)
+
+        return versoes.aplicar_etag(Response(dados), etag)
+
+    def _montar_snapshot(self, torneio):
+        """
+        Monta o snapshot com número fixo de queries: rodadas, mesas (com rodada/torneio),
+        assentos com usuários, inscrições ativas e o ranking parcial mais recente.
+        """
+        rodadas = list(Rodada.objects.filter(id_torneio=torneio).order_by('numero_rodada'))
+        mesas = _mesas_com_assentos(
+            Mesa.objects.filter(id_rodada__id_torneio=torneio)
+        ).order_by('id_rodada_id', 'numero_mesa')
+
+        mesas_por_rodada = {}
+        for mesa in mesas:
+            mesas_por_rodada.setdefault(mesa.id_rodada_id, []).append(mesa)
+
+        inscritos_ativos = list(
+            Inscricao.objects.filter(id_torneio=torneio).exclude(status='Cancelado')
+            .select_related('id_usuario').order_by('id')
+        )
+
+        dados_rodadas = []
+        for rodada in rodadas:
+            mesas_rodada = mesas_por_rodada.get(rodada.id, [])
+            # Sobressalentes: inscritos ativos que não estão em nenhuma mesa da rodada
+            em_mesas = {
+                assento.id_usuario_id for mesa in mesas_rodada for assento in mesa.jogadores_na_mesa.all()
+            }
+            dados_rodada = RodadaSerializer(rodada).data
+            dados_rodada['mesas'] = MesaDetailSerializer(mesas_rodada, many=True).data
+            # O snapshot fica em cache para qualquer leitor: sem e-mails dos jogadores
+            for mesa in dados_rodada['mesas']:
+                for jogador in mesa['jogadores']:
+                    jogador.pop('email', None)
+            dados_rodada['sobressalentes'] = [
+                {
+                    'id': inscricao.id_usuario.id,
+                    'username': inscricao.id_usuario.username,
+                }
+                for inscricao in inscritos_ativos if inscricao.id_usuario_id not in em_mesas
+            ]
+            dados_rodadas.append(dados_rodada)
+
+        # Ranking parcial da última rodada já calculada
+        ultima_rodada_ranking = RankingParcial.objects.filter(
+            id_torneio=torneio
+        ).order_by('-rodada_numero').values('rodada_numero')[:1]
+        itens_ranking = list(
+            RankingParcial.objects.filter(
+                id_torneio=torneio, rodada_numero=Subquery(ultima_rodada_ranking)
+            ).select_related('id_usuario').order_by('posicao')
+        )
+        ranking = None
+        if itens_ranking:
+            ranking = {
+                'rodada_numero': itens_ranking[0].rodada_numero,
+                'ranking': [
+                    {
+                        'posicao': item.posicao,
+                        'jogador_id': item.id_usuario.id,
+                        'jogador_nome': item.id_usuario.username,
+                        'pontos': item.pontos_totais,
+                        'mw_percentage': float(item.mw_percentage),
+                        'omw_percentage': float(item.omw_percentage),
+                        'pmw_percentage': float(item.pmw_percentage),
+                        'balanco': float(item.balanco)
+                    }
+                    for item in itens_ranking
+                ],
+            }
+
+        return {
+            'versao': torneio.versao,
+            'torneio': TorneioSerializer(torneio).data,
+            'rodadas': dados_rodadas,
+            'ranking': ranking,
+        }
+
     def _criar_mesas_swiss(self, rodada, jogadores_ordenados, torneio):
         """
         Cria mesas usando sistema Swiss pairing.
@@ -1020,13 +1358,19 @@ class InscricaoViewSet(viewsets.ModelViewSet):
     serializer_class = InscricaoSerializer
     http_method_names = ['get', 'post', 'put', 'delete', 'head', 'options']  # remove patch
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = PaginacaoKeyset
+    ordenacao_keyset = ('id',)
+    filter_backends = [CamposEsparsosFilter]
 
     def get_queryset(self):
         """
         Filtra as inscrições visíveis baseado no tipo do usuário.
         Suporta filtro por id_torneio via query params.
+        Usuário e torneio vêm na mesma query; na listagem a decklist só é lida se solicitada.
         """
-        queryset = Inscricao.objects.all()
+        queryset = Inscricao.objects.select_related('id_usuario', 'id_torneio')
+        if self.action == 'list' and not self._incluir_decklist():
+            queryset = queryset.defer('decklist')
         user = self.request.user
 
         # Filtro por torneio via query params
@@ -1045,12 +1389,18 @@ class InscricaoViewSet(viewsets.ModelViewSet):
         """
         Define serializer baseado na ação e tipo de usuário:
         - Create: InscricaoCreateSerializer (jogador) ou InscricaoLojaSerializer (loja/admin)
+        - List: InscricaoResumoSerializer (sem decklist), exceto com ?incluir_decklist=true
         - Outras ações: InscricaoSerializer padrão
         """
         if self.action == 'create':
             return InscricaoCreateSerializer if self.request.user.tipo == 'JOGADOR' else InscricaoLojaSerializer
+        if self.action == 'list' and not self._incluir_decklist():
+            return InscricaoResumoSerializer
         return InscricaoSerializer
 
+    def _incluir_decklist(self):
+        return self.request.query_params.get('incluir_decklist', '').lower() in ('true', '1')
+
     def perform_create(self, serializer):
         """
         Define o usuário da inscrição antes de salvar:
@@ -1278,6 +1628,277 @@ class InscricaoViewSet(viewsets.ModelViewSet):
             'inscricao': serializer.data
         }, status=status.HTTP_201_CREATED)
 
+    @swagger_auto_schema(
+        method='post',
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'torneio_id': openapi.Schema(type=openapi.TYPE_INTEGER, description='ID do torneio'),
+                'emails': openapi.Schema(
+                    type=openapi.TYPE_ARRAY, items=openapi.Schema(type=openapi.TYPE_STRING),
+                    description='Lista de e-mails (ou texto separado por vírgulas/linhas)'
+                ),
+            },
+            required=['torneio_id']
+        ),
+        responses={
+            201: 'Relatório por linha (ao menos um jogador inscrito)',
+            200: 'Relatório por linha (nenhum jogador inscrito)',
+            400: 'Dados inválidos',
+            403: 'Acesso negado a este torneio',
+            404: 'Torneio não encontrado'
+        },
+        operation_summary="Inscrever jogadores em lote",
+        operation_description=f"""
+        Inscreve vários jogadores de uma vez a partir de uma lista de e-mails (`emails`) ou de um
+        arquivo CSV enviado como multipart (`arquivo`, coluna `email` ou primeira coluna).
+        Máximo de {MAXIMO_INSCRICOES_LOTE} e-mails por requisição.
+
+        Retorna um relatório por linha com `resultado`:
+        - `inscrito`: inscrição criada
+        - `ignorado`: já inscrito, repetido na lista, usuário que não é jogador ou não está ativo, ou sem vagas
+          (ver `motivo`)
+        - `desconhecido`: nenhum usuário com o e-mail
+
+        Número fixo de queries, independente da quantidade de e-mails.
+        """
+    )
+    @action(detail=False, methods=['post'], permission_classes=[IsLojaOuAdmin])
+    def inscrever_em_lote(self, request):
+        """Inscreve jogadores em lote por lista de e-mails ou CSV, com relatório por linha."""
+        torneio_id = request.data.get('torneio_id')
+        if not torneio_id:
+            return Response({"detail": "torneio_id é obrigatório"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            emails = self._emails_do_lote(request)
+        except (UnicodeDecodeError, csv.Error):
+            return Response({"detail": "Arquivo CSV inválido (use UTF-8)."}, status=status.HTTP_400_BAD_REQUEST)
+        if not emails:
+            return Response({"detail": "Informe 'emails' ou um arquivo CSV em 'arquivo'."}, status=status.HTTP_400_BAD_REQUEST)
+        if len(emails) > MAXIMO_INSCRICOES_LOTE:
+            return Response(
+                {"detail": f"Máximo de {MAXIMO_INSCRICOES_LOTE} e-mails por requisição."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        with transaction.atomic():
+            # Trava o torneio: lotes simultâneos não ultrapassam o limite de vagas
+            torneio = Torneio.objects.select_for_update().filter(id=torneio_id).first()
+            if torneio is None:
+                return Response({"detail": "Torneio não encontrado"}, status=status.HTTP_404_NOT_FOUND)
+            if request.user.tipo != 'ADMIN' and torneio.id_loja_id != request.user.id:
+                return Response({"detail": "Acesso negado a este torneio"}, status=status.HTTP_403_FORBIDDEN)
+            if torneio.status not in ['Aberto', 'Em Andamento']:
+                return Response(
+                    {"detail": "Só é possível inscrever jogadores em torneios com status 'Aberto' ou 'Em Andamento'"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            # Todos os usuários em uma query (e-mail sem diferenciar maiúsculas, índice sobre LOWER(email))
+            usuarios = {
+                usuario.email_minusculo: usuario
+                for usuario in busca.usuarios_por_email(emails).only('id', 'email', 'username', 'tipo', 'status')
+            }
+            inscricoes_existentes = dict(
+                Inscricao.objects.filter(
+                    id_torneio=torneio, id_usuario__in=[usuario.id for usuario in usuarios.values()]
+                ).values_list('id_usuario_id', 'status')
+            )
+
+            vagas = None
+            if torneio.vagas_limitadas and torneio.qnt_vagas is not None:
+                ativos = Inscricao.objects.filter(id_torneio=torneio).exclude(status='Cancelado').count()
+                vagas = max(torneio.qnt_vagas - ativos, 0)
+
+            relatorio, novas, vistos = [], [], set()
+            for linha, email in enumerate(emails, start=1):
+                item = {'linha': linha, 'email': email}
+                usuario = usuarios.get(email.lower())
+                if usuario is None:
+                    item.update(resultado='desconhecido', motivo='Nenhum usuário com este e-mail')
+                elif usuario.id in vistos:
+                    item.update(resultado='ignorado', motivo='E-mail repetido na lista')
+                elif usuario.tipo != 'JOGADOR':
+                    item.update(resultado='ignorado', motivo='Usuário não é jogador')
+                elif usuario.status != 'ativo':
+                    item.update(resultado='ignorado', motivo='Usuário não está ativo')
+                elif usuario.id in inscricoes_existentes:
+                    motivo = ('Inscrição cancelada (use reativar)'
+                              if inscricoes_existentes[usuario.id] == 'Cancelado' else 'Já inscrito neste torneio')
+                    item.update(resultado='ignorado', motivo=motivo)
+                elif vagas is not None and len(novas) >= vagas:
+                    item.update(resultado='ignorado', motivo='Limite de vagas atingido')
+                else:
+                    novas.append(Inscricao(id_usuario=usuario, id_torneio=torneio, status='Inscrito'))
+                    item.update(resultado='inscrito', username=usuario.username)
+                if usuario is not None:
+                    vistos.add(usuario.id)
+                    item.setdefault('id_usuario', usuario.id)
+                relatorio.append(item)
+
+            if novas:
+                try:
+                    with transaction.atomic():
+                        Inscricao.objects.bulk_create(novas)
+                except IntegrityError:
+                    # Algum jogador foi inscrito por outra requisição entre a verificação e o INSERT
+                    return Response(
+                        {"detail": "As inscrições do torneio mudaram durante o lote. Envie novamente."},
+                        status=status.HTTP_409_CONFLICT
+                    )
+                # bulk_create não dispara signals: versão do torneio (ETag e feed de torneios)
+                versoes.tocar_torneio(torneio.id)
+
+        totais = {resultado: 0 for resultado in ('inscrito', 'ignorado', 'desconhecido')}
+        for item in relatorio:
+            totais[item['resultado']] += 1
+
+        return Response({
+            'message': f'{totais["inscrito"]} jogador(es) inscrito(s) no torneio',
+            'inscritos': totais['inscrito'],
+            'ignorados': totais['ignorado'],
+            'desconhecidos': totais['desconhecido'],
+            'relatorio': relatorio,
+        }, status=status.HTTP_201_CREATED if novas else status.HTTP_200_OK)
+
+    def _emails_do_lote(self, request):
+        """E-mails enviados em `arquivo` (CSV) ou em `emails` (lista ou texto separado por vírgulas/linhas)."""
+        arquivo = request.FILES.get('arquivo')
+        if arquivo is not None:
+            linhas = [
+                linha for linha in csv.reader(io.StringIO(arquivo.read().decode('utf-8-sig')))
+                if any(celula.strip() for celula in linha)
+            ]
+            coluna = 0
+            cabecalho = [celula.strip().lower() for celula in linhas[0]] if linhas else []
+            if 'email' in cabecalho or 'e-mail' in cabecalho:
+                coluna = cabecalho.index('email' if 'email' in cabecalho else 'e-mail')
+                linhas = linhas[1:]
+            return [linha[coluna].strip() if len(linha) > coluna else '' for linha in linhas]
+
+        emails = request.data.get('emails') or []
+        if isinstance(emails, str):
+            emails = re.split(r'[\s,;]+', emails)
+        return [str(email).strip() for email in emails if str(email).strip()]
+
+    @swagger_auto_schema(
+        method='get',
+        responses={200: 'Painel do jogador'},
+        operation_summary="Painel inicial do jogador",
+        operation_description="""
+        Reúne em uma única resposta o que a tela inicial do jogador precisa, para cada inscrição
+        ativa (não cancelada) em torneio aberto ou em andamento:
+
+        - `torneio`: dados resumidos do torneio
+        - `rodada_atual`: última rodada criada no torneio (ou null)
+        - `mesa_atual`: mesa do jogador na rodada atual, com `meu_time`, `companheiros` e `oponentes` (ou null)
+        - `ranking`: posição do jogador no ranking parcial mais recente (ou null)
+
+        Montado com número fixo de queries, independente da quantidade de torneios.
+        """
+    )
+    @action(detail=False, methods=['get'], permission_classes=[permissions.IsAuthenticated])
+    def painel(self, request):
+        """Painel do jogador logado: inscrições ativas, rodada e mesa atuais e posição no ranking."""
+        user = request.user
+
+        inscricoes = list(
+            Inscricao.objects.filter(
+                id_usuario=user,
+                id_torneio__prioridade__lte=Torneio.PRIORIDADE_ABERTO,
+            ).exclude(status='Cancelado').select_related('id_torneio__id_loja').order_by(
+                'id_torneio__prioridade', 'id_torneio__data_inicio', 'id'
+            )
+        )
+        if not inscricoes:
+            return Response({'inscricoes': []})
+
+        torneio_ids = [inscricao.id_torneio_id for inscricao in inscricoes]
+
+        # Rodada atual de cada torneio: a de maior número
+        rodadas_atuais = {}
+        for rodada in Rodada.objects.filter(id_torneio_id__in=torneio_ids).order_by('id_torneio_id', '-numero_rodada'):
+            rodadas_atuais.setdefault(rodada.id_torneio_id, rodada)
+
+        # Todos os assentos das mesas do jogador nas rodadas atuais, com os usuários
+        mesas_do_jogador = MesaJogador.objects.filter(
+            id_usuario=user,
+            id_mesa__id_rodada_id__in=[rodada.id for rodada in rodadas_atuais.values()],
+        ).values('id_mesa_id')
+        assentos_por_mesa = {}
+        for assento in MesaJogador.objects.filter(id_mesa_id__in=Subquery(mesas_do_jogador)).select_related(
+            'id_mesa', 'id_usuario'
+        ).order_by('id'):
+            assentos_por_mesa.setdefault(assento.id_mesa_id, []).append(assento)
+        mesa_por_rodada = {
+            assentos[0].id_mesa.id_rodada_id: assentos for assentos in assentos_por_mesa.values()
+        }
+
+        # Ranking parcial mais recente do jogador em cada torneio
+        rankings = {}
+        for item in RankingParcial.objects.filter(
+            id_usuario=user, id_torneio_id__in=torneio_ids
+        ).order_by('id_torneio_id', '-rodada_numero'):
+            rankings.setdefault(item.id_torneio_id, item)
+
+        resultado = []
+        for inscricao in inscricoes:
+            torneio = inscricao.id_torneio
+            rodada = rodadas_atuais.get(torneio.id)
+            assentos = mesa_por_rodada.get(rodada.id) if rodada else None
+            ranking = rankings.get(torneio.id)
+
+            resultado.append({
+                'id': inscricao.id,
+                'status': inscricao.status,
+                'data_inscricao': inscricao.data_inscricao,
+                'torneio': {
+                    'id': torneio.id,
+                    'nome': torneio.nome,
+                    'status': torneio.status,
+                    'data_inicio': torneio.data_inicio,
+                    'banner': torneio.banner,
+                    'quantidade_rodadas': torneio.quantidade_rodadas,
+                    'loja_nome': torneio.id_loja.username,
+                },
+                'rodada_atual': {
+                    'id': rodada.id,
+                    'numero_rodada': rodada.numero_rodada,
+                    'status': rodada.status,
+                } if rodada else None,
+                'mesa_atual': self._mesa_do_painel(assentos, user) if assentos else None,
+                'ranking': {
+                    'rodada_numero': ranking.rodada_numero,
+                    'posicao': ranking.posicao,
+                    'pontos': ranking.pontos_totais,
+                } if ranking else None,
+            })
+
+        return Response({'inscricoes': resultado})
+
+    def _mesa_do_painel(self, assentos, user):
+        """Mesa do jogador com companheiros de time e oponentes, a partir dos assentos já carregados."""
+        mesa = assentos[0].id_mesa
+        meu_time = next(assento.time for assento in assentos if assento.id_usuario_id == user.id)
+
+        def jogador(assento):
+            return {'id': assento.id_usuario_id, 'username': assento.id_usuario.username}
+
+        return {
+            'id': mesa.id,
+            'numero_mesa': mesa.numero_mesa,
+            'meu_time': meu_time,
+            'companheiros': [
+                jogador(assento) for assento in assentos
+                if assento.time == meu_time and assento.id_usuario_id != user.id
+            ],
+            'oponentes': [jogador(assento) for assento in assentos if assento.time != meu_time],
+            'time_vencedor': mesa.time_vencedor,
+            'pontuacao_time_1': mesa.pontuacao_time_1,
+            'pontuacao_time_2': mesa.pontuacao_time_2,
+        }
+
 
 class RodadaViewSet(viewsets.ModelViewSet):
     """
@@ -1286,6 +1907,9 @@ class RodadaViewSet(viewsets.ModelViewSet):
     queryset = Rodada.objects.all()
     serializer_class = RodadaSerializer
     permission_classes = [IsLojaOuAdmin | IsApenasLeitura]
+    pagination_class = PaginacaoKeyset
+    ordenacao_keyset = ('numero_rodada', 'id')
+    filter_backends = [CamposEsparsosFilter]
 
     @swagger_auto_schema(
         method='post',
@@ -1357,7 +1981,10 @@ class RodadaViewSet(viewsets.ModelViewSet):
         if self.request.user.tipo != 'ADMIN' and rodada.id_torneio.id_loja != self.request.user:
             return Response({"detail": "Acesso negado a este torneio"}, status=status.HTTP_403_FORBIDDEN)
 
-        with transaction.atomic():
+        with transaction.atomic(), estatisticas.alteracao_de_rodadas(Rodada.objects.filter(pk=rodada.pk)):
+            # Alterações de assentos não disparam signals: marca o torneio como alterado
+            versoes.tocar_torneio(rodada.id_torneio_id)
+
             if jogador_id == 0:
                 # Remover jogador da posição específica do time nesta mesa
                 jogadores_time = MesaJogador.objects.filter(
@@ -1428,11 +2055,67 @@ class RodadaViewSet(viewsets.ModelViewSet):
 
     @action(detail=True, methods=['get'])
     def mesas(self, request, pk=None):
-        """Retorna todas as mesas de uma rodada específica"""
+        """Retorna todas as mesas de uma rodada específica (com GET condicional pela versão do torneio)"""
+        # A leitura da versão também confirma que a rodada existe
+        torneio_versao = versoes.versao_por_rodada(pk)
+        if not torneio_versao:
+            raise Http404
+
+        etag = versoes.gerar_etag(*torneio_versao, request.user.pk or 0)
+        nao_modificada = versoes.resposta_nao_modificada(request, etag)
+        if nao_modificada:
+            return nao_modificada
+
+        chave = cache_respostas.chave('rodada_mesas', request, pk, *torneio_versao)
+        response = cache_respostas.resposta_em_cache(chave, lambda: self._resposta_mesas(pk))
+        return versoes.aplicar_etag(response, etag)
+
+    def _resposta_mesas(self, rodada_id):
+        # Mesas com rodada/torneio em uma query e assentos com usuários em outra
+        mesas = _mesas_com_assentos(Mesa.objects.filter(id_rodada_id=rodada_id)).order_by('numero_mesa')
+        return Response(MesaDetailSerializer(mesas, many=True).data)
+
+    @swagger_auto_schema(
+        method='get',
+        operation_summary="Progresso da rodada",
+        operation_description="""
+        Retorna quantas mesas da rodada já tiveram resultado reportado.
+
+        Os valores vêm de contadores mantidos na própria rodada (atualizados no emparelhamento
+        e no reporte de resultados), portanto a consulta é apenas uma leitura pela chave primária.
+        """,
+        responses={
+            200: openapi.Response(
+                description="Progresso da rodada",
+                schema=openapi.Schema(
+                    type=openapi.TYPE_OBJECT,
+                    properties={
+                        'rodada_id': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'numero_rodada': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'status': openapi.Schema(type=openapi.TYPE_STRING),
+                        'total_mesas': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'mesas_reportadas': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'mesas_pendentes': openapi.Schema(type=openapi.TYPE_INTEGER),
+                        'completa': openapi.Schema(type=openapi.TYPE_BOOLEAN),
+                    }
+                )
+            ),
+            404: 'Rodada não encontrada'
+        }
+    )
+    @action(detail=True, methods=['get'], permission_classes=[IsLojaOuAdmin | IsApenasLeitura])
+    def progresso(self, request, pk=None):
+        """Retorna o progresso de reporte de resultados da rodada (X de Y mesas)"""
         rodada = self.get_object()
-        mesas = Mesa.objects.filter(id_rodada=rodada).order_by('numero_mesa')
-        serializer = MesaDetailSerializer(mesas, many=True)
-        return Response(serializer.data)
+        return Response({
+            'rodada_id': rodada.id,
+            'numero_rodada': rodada.numero_rodada,
+            'status': rodada.status,
+            'total_mesas': rodada.total_mesas,
+            'mesas_reportadas': rodada.mesas_reportadas,
+            'mesas_pendentes': rodada.mesas_pendentes,
+            'completa': rodada.mesas_pendentes == 0,
+        }, status=status.HTTP_200_OK)
 
     @swagger_auto_schema(
         operation_summary="Listar sobressalentes da rodada",
@@ -1606,10 +2289,11 @@ class RodadaViewSet(viewsets.ModelViewSet):
 
         tipo = serializer.validated_data['tipo']
 
-        with transaction.atomic():
+        with transaction.atomic(), estatisticas.alteracao_de_rodadas(Rodada.objects.filter(pk=rodada.pk)):
             # Remove emparelhamentos existentes
             MesaJogador.objects.filter(id_mesa__id_rodada=rodada).delete()
             Mesa.objects.filter(id_rodada=rodada).delete()
+            rodada.atualizar_contadores(0)
 
             # Busca jogadores inscritos
             jogadores_inscritos = list(Inscricao.objects.filter(
@@ -1630,6 +2314,8 @@ class RodadaViewSet(viewsets.ModelViewSet):
                 )
                 mesas_criadas = self._emparelhar_swiss_novo(rodada, jogadores_ordenados, jogadores_inscritos)
 
+            rodada.atualizar_contadores(mesas_criadas)
+
             return Response({
                 'message': f'Emparelhamento automático ({tipo}) realizado',
                 'mesas_criadas': mesas_criadas,
@@ -1660,7 +2346,7 @@ class RodadaViewSet(viewsets.ModelViewSet):
                 "detail": "Rodada deve estar em fase de emparelhamento."
             }, status=status.HTTP_400_BAD_REQUEST)
 
-        with transaction.atomic():
+        with transaction.atomic(), estatisticas.alteracao_de_rodadas(Rodada.objects.filter(pk=rodada.pk)):
             # Remove mesas existentes (mas mantém a rodada)
             Mesa.objects.filter(id_rodada=rodada).delete()
             MesaJogador.objects.filter(id_mesa__id_rodada=rodada).delete()
@@ -1719,6 +2405,8 @@ class RodadaViewSet(viewsets.ModelViewSet):
             else:
                 mesas_criadas_count = 0
 
+            rodada.atualizar_contadores(mesas_criadas_count)
+
             return Response({
                 'message': f'Emparelhamento resetado e re-executado automaticamente. {mesas_criadas_count} mesa(s) criada(s).',
                 'rodada_id': rodada.id,
@@ -1813,6 +2501,9 @@ class RodadaViewSet(viewsets.ModelViewSet):
         rodada.status = 'Em Andamento'
         rodada.save()
 
+        # Emparelhamento passa a ser visível para os jogadores
+        eventos.publicar_evento(rodada.id_torneio_id, eventos.EMPARELHAMENTO_PUBLICADO, _dados_evento_rodada(rodada))
+
         return Response({
             'message': 'Rodada iniciada com sucesso. Jogadores podem agora reportar resultados das mesas.',
             'mesas_criadas': mesas.count()
@@ -1867,44 +2558,51 @@ class RodadaViewSet(viewsets.ModelViewSet):
 
     def _mover_jogador_para_mesa(self, rodada, jogador_id, mesa_id):
         """Move jogador para uma mesa específica ou remove de mesa"""
-        if mesa_id is None:
-            # Remove jogador da mesa atual
-            count = MesaJogador.objects.filter(
-                id_mesa__id_rodada=rodada,
-                id_usuario_id=jogador_id
-            ).delete()
-            return count[0] > 0  # Retorna True se removeu alguma linha
-        else:
-            # Remove de mesa atual se estiver em uma
-            MesaJogador.objects.filter(
-                id_mesa__id_rodada=rodada,
-                id_usuario_id=jogador_id
-            ).delete()
+        versoes.tocar_torneio(rodada.id_torneio_id)
+        with estatisticas.alteracao_de_rodadas(Rodada.objects.filter(pk=rodada.pk)):
+            if mesa_id is None:
+                # Remove jogador da mesa atual
+                count = MesaJogador.objects.filter(
+                    id_mesa__id_rodada=rodada,
+                    id_usuario_id=jogador_id
+                ).delete()
+                return count[0] > 0  # Retorna True se removeu alguma linha
+            else:
+                # Remove de mesa atual se estiver em uma
+                MesaJogador.objects.filter(
+                    id_mesa__id_rodada=rodada,
+                    id_usuario_id=jogador_id
+                ).delete()
 
-            # Adiciona à nova mesa
-            MesaJogador.objects.create(
-                id_mesa_id=mesa_id,
-                id_usuario_id=jogador_id,
-                time=1  # Por padrão Time 1
-            )
-            return True
+                # Adiciona à nova mesa
+                MesaJogador.objects.create(
+                    id_mesa_id=mesa_id,
+                    id_usuario_id=jogador_id,
+                    time=1  # Por padrão Time 1
+                )
+                return True
 
     def _remover_mesa(self, rodada, mesa_id):
         """Remove mesa e seus jogadores"""
-        MesaJogador.objects.filter(id_mesa_id=mesa_id).delete()
-        Mesa.objects.filter(id=mesa_id).delete()
+        with estatisticas.alteracao_de_rodadas(Rodada.objects.filter(pk=rodada.pk)):
+            MesaJogador.objects.filter(id_mesa_id=mesa_id).delete()
+            Mesa.objects.filter(id=mesa_id).delete()
+        rodada.recalcular_contadores()
 
     def _adicionar_mesa_vazia(self, rodada):
         """Adiciona mesa vazia"""
         numero_mesa = Mesa.objects.filter(id_rodada=rodada).count() + 1
         Mesa.objects.create(id_rodada=rodada, numero_mesa=numero_mesa)
+        rodada.recalcular_contadores()
 
     def _alterar_time_jogador(self, rodada, jogador_id, novo_time):
         """Altera time do jogador"""
-        count = MesaJogador.objects.filter(
-            id_mesa__id_rodada=rodada,
-            id_usuario_id=jogador_id
-        ).update(time=novo_time)
+        versoes.tocar_torneio(rodada.id_torneio_id)
+        with estatisticas.alteracao_de_rodadas(Rodada.objects.filter(pk=rodada.pk)):
+            count = MesaJogador.objects.filter(
+                id_mesa__id_rodada=rodada,
+                id_usuario_id=jogador_id
+            ).update(time=novo_time)
 
         return count > 0
 
@@ -1957,6 +2655,11 @@ class RodadaViewSet(viewsets.ModelViewSet):
                 'jogador_id': jogador_id
             }, status=status.HTTP_200_OK)
 
+    def perform_destroy(self, instance):
+        """Retira das estatísticas dos jogadores as partidas e byes da rodada removida."""
+        with transaction.atomic(), estatisticas.alteracao_de_rodadas(Rodada.objects.filter(pk=instance.pk)):
+            instance.delete()
+
     def get_queryset(self):
         """
         Filtra as rodadas por torneio se o parâmetro for fornecido
@@ -1970,6 +2673,44 @@ class RodadaViewSet(viewsets.ModelViewSet):
         return queryset.order_by('numero_rodada')
 
 
+def _dados_evento_rodada(rodada):
+    """Dados de uma rodada enviados nos eventos do stream SSE."""
+    return {
+        'rodada_id': rodada.id,
+        'numero_rodada': rodada.numero_rodada,
+        'status': rodada.status,
+        'total_mesas': rodada.total_mesas,
+    }
+
+
+def _dados_evento_mesa(mesa):
+    """Dados do resultado de uma mesa enviados nos eventos do stream SSE."""
+    return {
+        'rodada_id': mesa.id_rodada_id,
+        'mesa_id': mesa.id,
+        'numero_mesa': mesa.numero_mesa,
+        'time_vencedor': mesa.time_vencedor,
+        'pontuacao_time_1': mesa.pontuacao_time_1,
+        'pontuacao_time_2': mesa.pontuacao_time_2,
+        'versao': mesa.versao,
+    }
+
+
+def _prefetch_assentos():
+    """Assentos da mesa com os usuários, em ordem de id (prefetch de `jogadores_na_mesa`)."""
+    return Prefetch(
+        'jogadores_na_mesa', queryset=MesaJogador.objects.select_related('id_usuario').order_by('id')
+    )
+
+
+def _mesas_com_assentos(queryset):
+    """
+    Carrega rodada e torneio junto com as mesas e os assentos (com usuários) em uma única
+    query adicional, para serializar qualquer quantidade de mesas com número fixo de queries.
+    """
+    return queryset.select_related('id_rodada__id_torneio').prefetch_related(_prefetch_assentos())
+
+
 class MesaViewSet(viewsets.ModelViewSet):
     """
     Endpoint para visualizar e gerenciar as mesas de uma rodada.
@@ -1978,6 +2719,9 @@ class MesaViewSet(viewsets.ModelViewSet):
     queryset = Mesa.objects.all()
     serializer_class = MesaSerializer
     permission_classes = [IsLojaOuAdmin | IsApenasLeitura]
+    pagination_class = PaginacaoKeyset
+    ordenacao_keyset = ('id_rodada_id', 'numero_mesa', 'id')
+    filter_backends = [CamposEsparsosFilter]
 
     def get_queryset(self):
         """
@@ -1987,10 +2731,10 @@ class MesaViewSet(viewsets.ModelViewSet):
         rodada_id = self.request.query_params.get('rodada_id')
 
         if rodada_id:
-            queryset = queryset.filter(id_rodada_id=rodada_id).prefetch_related(
-                'jogadores_na_mesa',
-                'jogadores_na_mesa__id_usuario'
-            ).order_by('numero_mesa')
+            queryset = queryset.filter(id_rodada_id=rodada_id).order_by('numero_mesa')
+
+        if self.action in ['list', 'retrieve']:
+            queryset = _mesas_com_assentos(queryset)
 
         return queryset
 
@@ -2000,6 +2744,56 @@ class MesaViewSet(viewsets.ModelViewSet):
             return MesaDetailSerializer
         return MesaSerializer
 
+    def list(self, request, *args, **kwargs):
+        """
+        Lista mesas. Quando filtrada por rodada_id, suporta GET condicional
+        (ETag pela versão do torneio da rodada).
+        """
+        rodada_id = request.query_params.get('rodada_id')
+        torneio_versao = versoes.versao_por_rodada(rodada_id) if rodada_id else None
+        if not torneio_versao:
+            return super().list(request, *args, **kwargs)
+
+        listar = super().list
+        chave = cache_respostas.chave('mesas', request, *torneio_versao)
+
+        # Páginas de keyset dependem do cursor: não entram no GET condicional
+        if 'cursor' in request.query_params or 'limite' in request.query_params:
+            return cache_respostas.resposta_em_cache(chave, lambda: listar(request, *args, **kwargs))
+
+        etag = versoes.gerar_etag(*torneio_versao, request.user.pk or 0)
+        nao_modificada = versoes.resposta_nao_modificada(request, etag)
+        if nao_modificada:
+            return nao_modificada
+
+        response = cache_respostas.resposta_em_cache(chave, lambda: listar(request, *args, **kwargs))
+        return versoes.aplicar_etag(response, etag)
+
+    def perform_create(self, serializer):
+        """Mantém os contadores de mesas da rodada ao criar mesa manualmente."""
+        with transaction.atomic():
+            mesa = serializer.save()
+            mesa.id_rodada.recalcular_contadores()
+
+    def perform_update(self, serializer):
+        """Mantém os contadores de mesas e as estatísticas da(s) rodada(s) envolvida(s) ao editar mesa."""
+        rodadas = {serializer.instance.id_rodada_id}
+        if 'id_rodada' in serializer.validated_data:
+            rodadas.add(serializer.validated_data['id_rodada'].pk)
+        with transaction.atomic(), estatisticas.alteracao_de_rodadas(Rodada.objects.filter(pk__in=rodadas)):
+            rodada_anterior = serializer.instance.id_rodada
+            mesa = serializer.save()
+            mesa.id_rodada.recalcular_contadores()
+            if rodada_anterior.pk != mesa.id_rodada_id:
+                rodada_anterior.recalcular_contadores()
+
+    def perform_destroy(self, instance):
+        """Mantém os contadores de mesas e as estatísticas da rodada ao remover mesa."""
+        rodada = instance.id_rodada
+        with transaction.atomic(), estatisticas.alteracao_de_rodadas(Rodada.objects.filter(pk=rodada.pk)):
+            instance.delete()
+            rodada.recalcular_contadores()
+
     @swagger_auto_schema(
         method="post",
         request_body=ReportarResultadoSerializer,
@@ -2007,7 +2801,8 @@ class MesaViewSet(viewsets.ModelViewSet):
             200: openapi.Response("Resultado registrado com sucesso", schema=MesaDetailSerializer),
             400: "Erro de validação (placar, composição 2v2, payload)",
             403: "A rodada não está 'Em Andamento' ou permissão negada",
-            404: "Mesa não encontrada"
+            404: "Mesa não encontrada",
+            409: "Resultado alterado por outro jogador (retorna o resultado vencedor)"
         },
         operation_summary="Reportar resultado da mesa (RF-012)",
         operation_description=(
@@ -2019,56 +2814,126 @@ class MesaViewSet(viewsets.ModelViewSet):
                 "Campos:\n"
                 "- `pontuacao_time_1` (int ≥ 0)\n"
                 "- `pontuacao_time_2` (int ≥ 0)\n"
-                "- `time_vencedor` (0=Empate, 1=Time 1, 2=Time 2)"
+                "- `time_vencedor` (0=Empate, 1=Time 1, 2=Time 2)\n"
+                "- `versao` (int, opcional): versão da mesa que o jogador está vendo; "
+                "obrigatória para alterar um resultado já reportado\n\n"
+                "Concorrência:\n"
+                "- A gravação só acontece se a mesa ainda estiver na versão esperada "
+                "(informada em `versao` ou, sem ela, a de uma mesa ainda sem resultado).\n"
+                "- Se outro jogador gravou antes, retorna 409 com o resultado que prevaleceu."
         ),
     )
 
     @action(detail=True, methods=['post'], permission_classes=[IsJogadorNaMesa])
     def reportar_resultado(self, request, pk=None):
-        # Aqui é um bloqueio transacional > evitar processamento de dois reports simultâneos
-        with (transaction.atomic()):
-            # lock pessimista na mesa
-            # É um bloqueio exclusivo de linha feito pelo banco quando usamos select_for_update().
-            # Enquanto uma transação está rodando (no bloco with transaction.atomic():),
-            # a dada linha da tabela (neste caso, a mesa específica) fica bloqueada para escrita por outros usuários/processos.
-            # impede que dois jogadores tentem reportar o resultado da mesma mesa, ao mesmo tempo, teríamos uma inconsistência.
-            mesa = Mesa.objects.select_for_update().select_related('id_rodada').get(pk=pk)
-
-            # para evitar um 500 se o pk não existir
-            if not mesa:
-                return Response({"detail": "Mesa não encontrada."}, status=status.HTTP_404_NOT_FOUND)
+        # Controle de concorrência otimista: nenhuma linha fica travada durante a validação.
+        # Os quatro jogadores da mesa costumam reportar quase ao mesmo tempo; com lock pessimista
+        # (select_for_update) as requisições ficavam enfileiradas segurando workers do gunicorn.
+        # Agora a gravação é um compare-and-set na coluna `versao` da mesa: quem chega depois
+        # não espera, apenas recebe 409 com o resultado que prevaleceu.
+        #
+        # Duas queries carregam a mesa com rodada e torneio (JOIN) e os assentos com os usuários.
+        # Permissão, status da rodada, validação 2v2 e a resposta são feitos em cima desses dados.
+        mesa = _mesas_com_assentos(Mesa.objects.filter(pk=pk)).first()
+
+        # para evitar um 500 se o pk não existir
+        if not mesa:
+            return Response({"detail": "Mesa não encontrada."}, status=status.HTTP_404_NOT_FOUND)
+
+        assentos = list(mesa.jogadores_na_mesa.all())
+
+        # IsJogadorNaMesa usa os assentos já carregados (sem EXISTS extra)
+        self.check_object_permissions(request, mesa)
+
+        # é necessário que Rodada precisa estar 'Em Andamento'
+        if getattr(mesa.id_rodada, 'status', None) != 'Em Andamento':
+            return Response(
+                {"detail": "Não é possível reportar resultado: a rodada não está 'Em Andamento'."},
+                status=status.HTTP_403_FORBIDDEN
+            )
 
-            # é necessário que Rodada precisa estar 'Em Andamento'
-            if getattr(mesa.id_rodada, 'status', None) != 'Em Andamento':
-                return Response(
-                    {"detail": "Não é possível reportar resultado: a rodada não está 'Em Andamento'."},
-                    status=status.HTTP_403_FORBIDDEN
+        # Mesa precisa estar completa: 2v2
+        if len(assentos) != 4 or sum(j.time == 1 for j in assentos) != 2 or sum(j.time == 2 for j in assentos) != 2:
+            return Response(
+                {"detail": "Mesa inválida: é necessário haver 2 jogadores no Time 1 e 2 no Time 2 (2x2)."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # validacao de payload
+        serializer = ReportarResultadoSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        resultado = {
+            'pontuacao_time_1': serializer.validated_data['pontuacao_time_1'],
+            'pontuacao_time_2': serializer.validated_data['pontuacao_time_2'],
+            'time_vencedor': serializer.validated_data['time_vencedor'],
+        }
+        if 'versao' in serializer.validated_data:
+            versao_esperada = serializer.validated_data['versao']
+        elif mesa.time_vencedor is not None:
+            # Sem `versao` o jogador não viu resultado nenhum: não sobrescreve o que já foi reportado
+            return self._resposta_conflito(mesa)
+        else:
+            versao_esperada = mesa.versao
+
+        if versao_esperada != mesa.versao:
+            # O jogador está vendo uma versão que já foi sobrescrita: o resultado carregado é o vencedor
+            return self._resposta_conflito(mesa)
+
+        with transaction.atomic():
+            # compare-and-set: UPDATE ... WHERE id = ? AND versao = ?
+            atualizadas = Mesa.objects.filter(pk=mesa.pk, versao=versao_esperada).update(
+                versao=F('versao') + 1,
+                **resultado
+            )
+
+            # Primeiro resultado desta mesa: conta como reportada na rodada, na mesma transação.
+            # O compare-and-set garante que `mesa.time_vencedor` é o estado anterior à gravação.
+            if atualizadas and mesa.time_vencedor is None:
+                Rodada.objects.filter(pk=mesa.id_rodada_id).update(
+                    mesas_reportadas=F('mesas_reportadas') + 1
                 )
 
-            # Mesa precisa estar completa: 2v2
-            jogadores = list(MesaJogador.objects.filter(id_mesa=mesa).only('time'))
-            if len(jogadores) != 4 or sum(j.time == 1 for j in jogadores) != 2 or sum(j.time == 2 for j in jogadores) != 2:
-                return Response(
-                    {"detail": "Mesa inválida: é necessário haver 2 jogadores no Time 1 e 2 no Time 2 (2x2)."},
-                    status=status.HTTP_400_BAD_REQUEST
+            # QuerySet.update não dispara signals: marca o torneio como alterado (ETag)
+            if atualizadas:
+                versoes.tocar_torneio(mesa.id_rodada.id_torneio_id)
+
+            # Estatísticas dos jogadores: troca a contribuição do resultado anterior pela do novo
+            if atualizadas and mesa.time_vencedor != resultado['time_vencedor']:
+                estatisticas.registrar_alteracao_mesa(
+                    assentos, mesa.time_vencedor, assentos, resultado['time_vencedor']
                 )
 
-            # validacao de payload
-            serializer = ReportarResultadoSerializer(data=request.data)
-            serializer.is_valid(raise_exception=True)
+        if not atualizadas:
+            # Outro report foi gravado antes: busca o resultado vencedor (assentos já estão carregados)
+            vencedor = Mesa.objects.filter(pk=mesa.pk).values(
+                'pontuacao_time_1', 'pontuacao_time_2', 'time_vencedor', 'versao'
+            ).first()
+            if vencedor is None:
+                return Response({"detail": "Mesa não encontrada."}, status=status.HTTP_404_NOT_FOUND)
+            for campo, valor in vencedor.items():
+                setattr(mesa, campo, valor)
+            return self._resposta_conflito(mesa)
+
+        for campo, valor in resultado.items():
+            setattr(mesa, campo, valor)
+        mesa.versao = versao_esperada + 1
 
-            # aplicacao de resultado
-            mesa.pontuacao_time_1 = serializer.validated_data['pontuacao_time_1']
-            mesa.pontuacao_time_2 = serializer.validated_data['pontuacao_time_2']
-            mesa.time_vencedor    = serializer.validated_data['time_vencedor']
-            mesa.save(update_fields=['pontuacao_time_1', 'pontuacao_time_2', 'time_vencedor'])
+        eventos.publicar_evento(mesa.id_rodada.id_torneio_id, eventos.RESULTADO_REPORTADO, _dados_evento_mesa(mesa))
 
-        # resposta
+        # resposta (serializada a partir dos dados já carregados)
         return Response({
             'message': 'Resultado reportado com sucesso',
             'mesa': MesaDetailSerializer(mesa).data
         }, status=status.HTTP_200_OK)
 
+    def _resposta_conflito(self, mesa):
+        """Resposta 409 para reports concorrentes, com o resultado que prevaleceu."""
+        return Response({
+            'detail': 'O resultado desta mesa foi alterado por outro jogador. Confira o resultado atual.',
+            'mesa': MesaDetailSerializer(mesa).data
+        }, status=status.HTTP_409_CONFLICT)
+
     @action(detail=True, methods=['patch'], permission_classes=[IsLojaOuAdmin])
     def editar_manual(self, request, pk=None):
         """Permite que lojas editem manualmente a mesa"""
@@ -2076,7 +2941,40 @@ class MesaViewSet(viewsets.ModelViewSet):
         serializer = MesaSerializer(mesa, data=request.data, partial=True)
 
         if serializer.is_valid():
-            serializer.save()
+            try:
+                versao_esperada = int(request.data.get('versao', mesa.versao))
+            except (TypeError, ValueError):
+                return Response({"versao": ["Informe um número inteiro."]}, status=status.HTTP_400_BAD_REQUEST)
+            if versao_esperada != mesa.versao:
+                return self._resposta_conflito(mesa)
+
+            with transaction.atomic():
+                rodada_anterior = mesa.id_rodada
+                vencedor_anterior = mesa.time_vencedor
+                # Mesmo compare-and-set do reportar_resultado: um report dos jogadores gravado
+                # depois da leitura da mesa não é sobrescrito (a loja recebe 409)
+                atualizadas = Mesa.objects.filter(pk=mesa.pk, versao=versao_esperada).update(
+                    versao=F('versao') + 1, **serializer.validated_data
+                )
+                if not atualizadas:
+                    mesa.refresh_from_db()
+                    return self._resposta_conflito(mesa)
+
+                for campo, valor in serializer.validated_data.items():
+                    setattr(mesa, campo, valor)
+                mesa.versao = versao_esperada + 1
+                # QuerySet.update não dispara signals: marca o torneio como alterado (ETag)
+                versoes.tocar_rodada(mesa.id_rodada_id)
+
+                if mesa.time_vencedor != vencedor_anterior:
+                    assentos = list(mesa.jogadores_na_mesa.all())
+                    estatisticas.registrar_alteracao_mesa(assentos, vencedor_anterior, assentos, mesa.time_vencedor)
+                # Edição manual pode limpar/definir resultado ou trocar a mesa de rodada
+                mesa.id_rodada.recalcular_contadores()
+                if rodada_anterior.pk != mesa.id_rodada_id:
+                    rodada_anterior.recalcular_contadores()
+
+                eventos.publicar_evento(mesa.id_rodada.id_torneio_id, eventos.RESULTADO_REPORTADO, _dados_evento_mesa(mesa))
             return Response({
                 'message': 'Mesa editada manualmente com sucesso',
                 'mesa': MesaDetailSerializer(mesa).data
@@ -2092,16 +2990,30 @@ class MesaViewSet(viewsets.ModelViewSet):
         serializer = EditarJogadoresMesaSerializer(data=request.data)
 
         if serializer.is_valid():
-            # Remove jogadores atuais
-            MesaJogador.objects.filter(id_mesa=mesa).delete()
+            with transaction.atomic():
+                # Alterações de assentos não disparam signals: marca o torneio como alterado
+                versoes.tocar_rodada(mesa.id_rodada_id)
 
-            # Adiciona novos jogadores
-            for jogador_data in serializer.validated_data['jogadores']:
-                MesaJogador.objects.create(
-                    id_mesa=mesa,
-                    id_usuario_id=jogador_data['id_usuario'],
-                    time=jogador_data['time']
-                )
+                # Mesa com resultado: as estatísticas passam dos jogadores antigos para os novos
+                assentos_anteriores = list(MesaJogador.objects.filter(id_mesa=mesa)) if mesa.time_vencedor is not None else []
+
+                # Remove jogadores atuais
+                MesaJogador.objects.filter(id_mesa=mesa).delete()
+
+                # Adiciona novos jogadores
+                novos_assentos = [
+                    MesaJogador.objects.create(
+                        id_mesa=mesa,
+                        id_usuario_id=jogador_data['id_usuario'],
+                        time=jogador_data['time']
+                    )
+                    for jogador_data in serializer.validated_data['jogadores']
+                ]
+
+                if mesa.time_vencedor is not None:
+                    estatisticas.registrar_alteracao_mesa(
+                        assentos_anteriores, mesa.time_vencedor, novos_assentos, mesa.time_vencedor
+                    )
 
             return Response({
                 'message': 'Jogadores da mesa atualizados com sucesso',
@@ -2125,6 +3037,14 @@ class MesaViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        # GET condicional: a resposta depende do jogador, que entra na ETag
+        torneio_versao = versoes.versao_por_rodada(rodada_id)
+        etag = versoes.gerar_etag(*torneio_versao, request.user.pk) if torneio_versao else None
+        if etag:
+            nao_modificada = versoes.resposta_nao_modificada(request, etag)
+            if nao_modificada:
+                return nao_modificada
+
         # Encontra a mesa da RODADA ESPECÍFICA onde o jogador está
         try:
             mesa_jogador = MesaJogador.objects.select_related(
@@ -2140,8 +3060,138 @@ class MesaViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_404_NOT_FOUND
             )
 
-        serializer = VisualizacaoMesaJogadorSerializer(mesa_jogador.id_mesa)
+        # Carrega os 4 assentos da mesa com os usuários em uma query (times separados em Python)
+        mesa = mesa_jogador.id_mesa
+        prefetch_related_objects([mesa], _prefetch_assentos())
+
+        serializer = VisualizacaoMesaJogadorSerializer(mesa)
         response_data = serializer.data
         response_data['meu_time'] = mesa_jogador.time  # Adiciona em qual time o jogador está
 
-        return Response(response_data)
+        response = Response(response_data)
+        return versoes.aplicar_etag(response, etag) if etag else response
+
+
+class EstatisticaJogadorViewSet(viewsets.GenericViewSet):
+    """
+    Estatísticas dos jogadores entre todos os torneios (somente leitura).
+
+    Lidas das tabelas agregadas mantidas a cada resultado (ver estatisticas.py), sem
+    percorrer as mesas de todos os torneios:
+    - GET /estatisticas/{usuario_id}/: estatísticas de um jogador
+    - GET /estatisticas/minhas/: estatísticas do usuário logado
+    """
+    queryset = EstatisticaJogador.objects.all()
+    serializer_class = EstatisticaJogadorSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    lookup_value_regex = r'\d+'
+
+    # Quantidade de parceiros/oponentes mais frequentes na resposta
+    LIMITE_FREQUENTES = 5
+
+    @swagger_auto_schema(
+        operation_summary="Estatísticas de um jogador",
+        operation_description="""
+        Torneios disputados, partidas, vitórias, empates, derrotas, byes e taxa de vitória,
+        além dos parceiros e oponentes mais frequentes. Jogadores sem partidas recebem totais zerados.
+        """,
+        responses={200: EstatisticaJogadorSerializer, 404: 'Usuário não encontrado'}
+    )
+    def retrieve(self, request, pk=None):
+        return self._resposta_estatisticas(pk)
+
+    @swagger_auto_schema(
+        method='get',
+        operation_summary="Minhas estatísticas",
+        responses={200: EstatisticaJogadorSerializer}
+    )
+    @action(detail=False, methods=['get'])
+    def minhas(self, request):
+        return self._resposta_estatisticas(request.user.pk)
+
+    def _resposta_estatisticas(self, usuario_id):
+        estatistica = EstatisticaJogador.objects.select_related('id_usuario').filter(pk=usuario_id).first()
+        if estatistica is None:
+            # Ainda sem partidas registradas: totais zerados
+            usuario = Usuario.objects.filter(pk=usuario_id).first()
+            if usuario is None:
+                return Response({"detail": "Usuário não encontrado."}, status=status.HTTP_404_NOT_FOUND)
+            estatistica = EstatisticaJogador(id_usuario=usuario)
+
+        dados = self.get_serializer(estatistica).data
+        dados['parceiros_frequentes'] = self._mais_frequentes(usuario_id, 'partidas_como_parceiro')
+        dados['oponentes_frequentes'] = self._mais_frequentes(usuario_id, 'partidas_como_oponente')
+        return Response(dados)
+
+    def _mais_frequentes(self, usuario_id, campo):
+        confrontos = ConfrontoJogador.objects.filter(
+            id_usuario_id=usuario_id, **{f'{campo}__gt': 0}
+        ).select_related('id_outro').order_by(f'-{campo}', 'id_outro_id')[:self.LIMITE_FREQUENTES]
+        return [
+            {
+                'id': confronto.id_outro_id,
+                'username': confronto.id_outro.username,
+                'partidas': getattr(confronto, campo),
+            }
+            for confronto in confrontos
+        ]
+
+
+@require_GET
+async def eventos_torneio(request, torneio_id):
+    """
+    Stream SSE (Server-Sent Events) com os eventos de um torneio.
+
+    GET /api/v1/torneios/torneios/{id}/eventos/
+
+    Eventos enviados (campo `event`), com o JSON do evento em `data`:
+    - rodada_criada: nova rodada criada
+    - emparelhamento_publicado: mesas da rodada liberadas para os jogadores
+    - resultado_reportado: resultado de uma mesa gravado ou editado
+    - rodada_finalizada: rodada encerrada (`torneio_finalizado` indica o fim do torneio)
+
+    Comentários `: keep-alive` são enviados periodicamente para manter a conexão aberta.
+    Ao reconectar, o cliente deve recarregar o estado atual, pois eventos perdidos não são reenviados.
+
+    Exige usuário autenticado, como a permissão padrão (IsAuthenticated) dos endpoints REST.
+
+    É uma view Django assíncrona e só existe via ASGI (core/asgi.py), onde cada conexão aberta
+    ocupa apenas uma corrotina. Sob WSGI responde 404: o Django consumiria o stream infinito
+    inteiro antes de responder, prendendo o worker síncrono.
+    """
+    if not isinstance(request, ASGIRequest):
+        raise Http404("Stream de eventos disponível apenas via ASGI")
+
+    usuario = await request.auser()
+    if not usuario.is_authenticated:
+        return JsonResponse(
+            {"detail": "As credenciais de autenticação não foram fornecidas."}, status=status.HTTP_403_FORBIDDEN
+        )
+
+    if not await Torneio.objects.filter(pk=torneio_id).aexists():
+        raise Http404("Torneio não encontrado")
+
+    backend = eventos.obter_backend()
+    assinatura = backend.assinar(torneio_id)
+    intervalo_keep_alive = getattr(settings, 'EVENTOS_SSE_KEEP_ALIVE', 15)
+
+    async def fluxo():
+        try:
+            # Sugere ao EventSource o intervalo de reconexão (ms)
+            yield 'retry: 3000\n\n'
+            while True:
+                try:
+                    evento = await asyncio.wait_for(assinatura.fila.get(), timeout=intervalo_keep_alive)
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                dados = json.dumps(evento, cls=DjangoJSONEncoder)
+                yield f"id: {evento['id']}\nevent: {evento['tipo']}\ndata: {dados}\n\n"
+        finally:
+            # Cliente desconectou (o Django cancela o gerador) ou o servidor está encerrando
+            backend.cancelar(assinatura)
+
+    response = StreamingHttpResponse(fluxo(), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'  # Desativa buffering em proxies reversos (nginx)
+    return response
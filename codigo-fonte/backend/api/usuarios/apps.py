@@ -4,3 +4,14 @@ from django.apps import AppConfig
 class UsuariosConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'usuarios'
+
+    def ready(self):
+        # Registra os receivers que invalidam o usuário em cache da autenticação
+        from . import signals  # noqa: F401
+        # Verificações de sistema da configuração de cache (sessões)
+        from . import checks  # noqa: F401
+
+        # Envio da caixa de saída de e-mails: thread iniciada na primeira requisição do processo web
+        from django.core.signals import request_started
+        from .caixa_saida import iniciar_carteiro
+        request_started.connect(iniciar_carteiro, dispatch_uid='usuarios_iniciar_carteiro')
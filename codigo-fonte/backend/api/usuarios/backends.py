@@ -0,0 +1,67 @@
+"""
+Backend de autenticação com cache do usuário da sessão.
+
+Com o ModelBackend, toda requisição autenticada faz um SELECT em usuarios_usuario para montar
+`request.user`, só para as permissões e views lerem `tipo`, `status` e o id. Aqui o usuário é
+guardado no cache (chave por id, compartilhada pelas sessões do usuário) e `get_user`
+reconstrói a instância sem consultar o banco.
+
+Segredos não vão para o cache: `password` e `token_redefinir_senha` ficam adiados na instância
+(carregados do banco se algum código os ler). Para a verificação da sessão do Django, o cache
+guarda apenas o hash de sessão (HMAC do hash da senha com a SECRET_KEY), então uma troca de
+senha continua encerrando as outras sessões.
+
+O cache é invalidado (ver signals.py) a cada save()/delete() do usuário (troca de senha, de
+tipo, de status, desativação, last_login no login) e no logout; escritas em massa
+(QuerySet.update) devem chamar `invalidar_usuario`. A invalidação só alcança os outros workers
+com cache compartilhado: por isso o backend só entra em AUTHENTICATION_BACKENDS com
+CACHE_COMPARTILHADO, e a verificação usuarios.E002 (checks.py) recusa a configuração contrária.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+from django.db import transaction
+
+PREFIXO_CHAVE = 'usuarios:usuario:'
+
+# Campos que nunca são gravados no cache
+CAMPOS_SECRETOS = {'password', 'token_redefinir_senha'}
+CHAVE_HASH_SESSAO = '_hash_sessao'
+
+
+def _chave(usuario_id):
+    return f'{PREFIXO_CHAVE}{usuario_id}'
+
+
+def invalidar_usuario(usuario_id):
+    """Remove o usuário do cache agora e de novo após o commit (evita recarregar o valor antigo)."""
+    cache.delete(_chave(usuario_id))
+    transaction.on_commit(lambda: cache.delete(_chave(usuario_id)))
+
+
+class ModelBackendComCache(ModelBackend):
+    """ModelBackend cujo `get_user` lê o usuário do cache antes de ir ao banco."""
+
+    def get_user(self, user_id):
+        modelo = get_user_model()
+        campos = [
+            campo.attname for campo in modelo._meta.concrete_fields if campo.attname not in CAMPOS_SECRETOS
+        ]
+
+        dados = cache.get(_chave(user_id))
+        # Entrada gravada com outro conjunto de colunas (ex.: antes de uma migration) conta como miss
+        if dados is None or set(dados) != {*campos, CHAVE_HASH_SESSAO}:
+            usuario = super().get_user(user_id)
+            if usuario is not None:
+                dados = {campo: getattr(usuario, campo) for campo in campos}
+                dados[CHAVE_HASH_SESSAO] = usuario.get_session_auth_hash()
+                cache.set(_chave(user_id), dados, settings.USUARIO_CACHE_TEMPO)
+            return usuario
+
+        # Instância com os campos secretos adiados: só são lidos do banco se alguém os usar
+        usuario = modelo.from_db(modelo.objects.db, campos, [dados[campo] for campo in campos])
+        hash_sessao = dados[CHAVE_HASH_SESSAO]
+        usuario.get_session_auth_hash = lambda: hash_sessao
+        return usuario if self.user_can_authenticate(usuario) else None
@@ -0,0 +1,69 @@
+"""
+Busca de jogadores por username/e-mail (autocomplete da inscrição pela loja).
+
+Correspondências, da mais relevante para a menos relevante:
+0. username ou e-mail exatos
+1. username começando pelo termo
+2. e-mail começando pelo termo
+3. termo em qualquer parte do username ou do e-mail (apenas para termos com 3+ caracteres)
+
+No PostgreSQL as consultas usam índices parciais (somente tipo='JOGADOR') criados na
+migration 0002: btree `text_pattern_ops` sobre UPPER(campo) para o prefixo e GIN trigram
+(pg_trgm) para a busca por substring. Os lookups istartswith/icontains do Django geram
+exatamente `UPPER(campo::text) LIKE UPPER(...)`, a expressão indexada.
+Em outros bancos (ex.: SQLite no desenvolvimento) a mesma consulta funciona sem os índices.
+
+`usuarios_por_email` é a busca exata por e-mail sem diferenciar maiúsculas, compartilhada pela
+inscrição em lote e pela importação de jogadores; usa o índice sobre LOWER(email) (migration 0004).
+"""
+
+from django.db.models import Case, Exists, IntegerField, OuterRef, Q, Value, When
+from django.db.models.functions import Length, Lower
+
+from torneios.models import Inscricao
+from .models import Usuario
+
+TAMANHO_MINIMO_SUBSTRING = 3
+LIMITE_PADRAO = 10
+LIMITE_MAXIMO = 25
+
+
+def usuarios_por_email(emails):
+    """
+    Usuários cujo e-mail é igual, sem diferenciar maiúsculas, a algum de `emails`.
+    Cada usuário vem anotado com `email_minusculo`.
+    """
+    return Usuario.objects.annotate(email_minusculo=Lower('email')).filter(
+        email_minusculo__in={email.lower() for email in emails}
+    )
+
+
+def buscar_jogadores(termo, limite=LIMITE_PADRAO, torneio_id=None):
+    """
+    Jogadores ativos que correspondem a `termo`, ordenados por relevância e limitados a `limite`.
+    Com `torneio_id`, cada resultado indica se o jogador já está inscrito (não cancelado) no torneio.
+    """
+    filtro = Q(username__istartswith=termo) | Q(email__istartswith=termo)
+    if len(termo) >= TAMANHO_MINIMO_SUBSTRING:
+        filtro |= Q(username__icontains=termo) | Q(email__icontains=termo)
+
+    jogadores = Usuario.objects.filter(
+        filtro, tipo=Usuario.TipoUsuario.JOGADOR, status='ativo'
+    ).annotate(
+        relevancia=Case(
+            When(Q(username__iexact=termo) | Q(email__iexact=termo), then=Value(0)),
+            When(username__istartswith=termo, then=Value(1)),
+            When(email__istartswith=termo, then=Value(2)),
+            default=Value(3),
+            output_field=IntegerField(),
+        )
+    ).order_by('relevancia', Length('username'), 'username', 'id')
+
+    campos = ['id', 'username', 'email']
+    if torneio_id is not None:
+        jogadores = jogadores.annotate(inscrito=Exists(
+            Inscricao.objects.filter(id_usuario=OuterRef('pk'), id_torneio_id=torneio_id).exclude(status='Cancelado')
+        ))
+        campos.append('inscrito')
+
+    return list(jogadores.values(*campos)[:max(1, min(limite, LIMITE_MAXIMO))])
@@ -0,0 +1,191 @@
+"""
+Caixa de saída de e-mails em banco (EmailPendente).
+
+Enviar dentro da requisição prendia o worker do gunicorn na API do provedor (Resend via
+anymail). Agora as views chamam `enfileirar_email`, que só grava a linha, e o envio é feito:
+
+- por uma thread no processo web, acordada após o commit de cada e-mail enfileirado e, de
+  qualquer forma, a cada CAIXA_SAIDA_INTERVALO segundos (0 desativa a thread); ou
+- pelo comando `python manage.py enviar_emails` (via cron, ou `--continuo` como worker dedicado).
+
+Cada lote reserva até TAMANHO_LOTE e-mails (FOR UPDATE SKIP LOCKED onde o banco suporta,
+adiando `proxima_tentativa` por TEMPO_RESERVA), envia todos por uma única conexão do
+EMAIL_BACKEND e grava o resultado. Falhas são tentadas de novo com backoff exponencial até
+MAXIMO_TENTATIVAS; um processo que morrer no meio do envio libera os e-mails ao fim da reserva.
+O EMAIL_BACKEND continua o mesmo: em desenvolvimento, o console.
+
+Nenhuma senha passa pela caixa de saída: a redefinição de senha envia só o token, e a nova
+senha é escolhida pelo usuário. O conteúdo (como o token) é apagado da linha quando ela sai da
+fila, enviada ou descartada após MAXIMO_TENTATIVAS. As linhas já processadas são removidas por
+`purgar_processados` (chamada pelo comando `enviar_emails`) depois de CAIXA_SAIDA_RETENCAO_DIAS dias.
+"""
+
+import logging
+import random
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import close_old_connections, connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import EmailPendente
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_LOTE = 50
+MAXIMO_TENTATIVAS = 6
+BACKOFF_BASE = timedelta(seconds=30)
+BACKOFF_MAXIMO = timedelta(hours=1)
+# Tempo em que um lote fica reservado para o processo que o está enviando
+TEMPO_RESERVA = timedelta(minutes=5)
+
+
+def enfileirar_email(destinatario, assunto, corpo_texto, corpo_html=''):
+    """Grava o e-mail na caixa de saída; o envio é feito após o commit, fora da requisição."""
+    email = EmailPendente.objects.create(
+        destinatario=destinatario, assunto=assunto, corpo_texto=corpo_texto, corpo_html=corpo_html
+    )
+    transaction.on_commit(acordar_carteiro)
+    return email
+
+
+def _backoff(tentativas):
+    atraso = min(BACKOFF_BASE * 2 ** (tentativas - 1), BACKOFF_MAXIMO)
+    # Jitter para não reenviar tudo ao mesmo tempo quando o provedor volta
+    return atraso * random.uniform(0.8, 1.2)
+
+
+def _reservar_lote(limite):
+    """Reserva e retorna os e-mails pendentes já liberados para envio."""
+    agora = timezone.now()
+    with transaction.atomic():
+        pendentes = EmailPendente.objects.filter(
+            status=EmailPendente.Status.PENDENTE, proxima_tentativa__lte=agora
+        ).order_by('proxima_tentativa')
+        if connection.features.has_select_for_update_skip_locked:
+            pendentes = pendentes.select_for_update(skip_locked=True)
+        ids = list(pendentes.values_list('id', flat=True)[:limite])
+        if not ids:
+            return []
+        EmailPendente.objects.filter(id__in=ids).update(
+            proxima_tentativa=agora + TEMPO_RESERVA, tentativas=F('tentativas') + 1
+        )
+    return list(EmailPendente.objects.filter(id__in=ids).order_by('id'))
+
+
+def _mensagem(email, conexao):
+    mensagem = EmailMultiAlternatives(
+        subject=email.assunto,
+        body=email.corpo_texto,
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[email.destinatario],
+        connection=conexao,
+    )
+    if email.corpo_html:
+        mensagem.attach_alternative(email.corpo_html, "text/html")
+    return mensagem
+
+
+def processar_lote(limite=TAMANHO_LOTE):
+    """Envia um lote da caixa de saída. Retorna (enviados, falhas) do lote."""
+    lote = _reservar_lote(limite)
+    if not lote:
+        return 0, 0
+
+    enviados, falhas = [], []
+    with get_connection() as conexao:
+        for email in lote:
+            try:
+                _mensagem(email, conexao).send()
+                enviados.append(email.id)
+            except Exception as erro:
+                logger.warning("Falha ao enviar e-mail %s (tentativa %s): %s", email.id, email.tentativas, erro)
+                falhas.append((email, erro))
+
+    agora = timezone.now()
+    if enviados:
+        EmailPendente.objects.filter(id__in=enviados).update(
+            status=EmailPendente.Status.ENVIADO, enviado_em=agora, corpo_texto='', corpo_html='', ultimo_erro=''
+        )
+    for email, erro in falhas:
+        if email.tentativas >= MAXIMO_TENTATIVAS:
+            logger.error("E-mail %s descartado após %s tentativas", email.id, email.tentativas)
+            alteracoes = {'status': EmailPendente.Status.FALHOU, 'corpo_texto': '', 'corpo_html': ''}
+        else:
+            alteracoes = {'proxima_tentativa': agora + _backoff(email.tentativas)}
+        EmailPendente.objects.filter(id=email.id).update(ultimo_erro=str(erro)[:1000], **alteracoes)
+    return len(enviados), len(falhas)
+
+
+def purgar_processados(dias):
+    """Apaga e-mails enviados ou descartados há mais de `dias` dias. Retorna quantos apagou."""
+    limite = timezone.now() - timedelta(days=dias)
+    apagados, _ = EmailPendente.objects.filter(
+        status__in=[EmailPendente.Status.ENVIADO, EmailPendente.Status.FALHOU], criado_em__lt=limite
+    ).delete()
+    return apagados
+
+
+def processar_fila():
+    """Envia lotes até não haver e-mails liberados. Retorna (enviados, falhas)."""
+    total_enviados = total_falhas = 0
+    while True:
+        enviados, falhas = processar_lote()
+        total_enviados += enviados
+        total_falhas += falhas
+        if enviados + falhas < TAMANHO_LOTE:
+            return total_enviados, total_falhas
+
+
+class _Carteiro(threading.Thread):
+    """Thread daemon que esvazia a caixa de saída quando acordada ou a cada intervalo."""
+
+    def __init__(self, intervalo):
+        super().__init__(name='caixa-saida-emails', daemon=True)
+        self.intervalo = intervalo
+        self.acordar = threading.Event()
+
+    def run(self):
+        while True:
+            self.acordar.wait(self.intervalo)
+            self.acordar.clear()
+            try:
+                enviados, falhas = processar_fila()
+                if enviados or falhas:
+                    logger.info("Caixa de saída: %s e-mail(s) enviado(s), %s falha(s)", enviados, falhas)
+            except Exception:
+                logger.exception("Erro ao processar a caixa de saída de e-mails")
+            finally:
+                close_old_connections()
+
+
+_carteiro = None
+_carteiro_lock = threading.Lock()
+
+
+def acordar_carteiro():
+    """Pede à thread do processo (se houver) que envie agora, sem esperar o intervalo."""
+    if _carteiro is not None:
+        _carteiro.acordar.set()
+
+
+def iniciar_carteiro(**kwargs):
+    """
+    Inicia (uma vez por processo) a thread da caixa de saída.
+    Conectada ao signal `request_started`; desativada quando CAIXA_SAIDA_INTERVALO é 0.
+    """
+    global _carteiro
+    if _carteiro is not None:
+        return
+
+    intervalo = getattr(settings, 'CAIXA_SAIDA_INTERVALO', 0)
+    if intervalo <= 0:
+        return
+
+    with _carteiro_lock:
+        if _carteiro is None:
+            _carteiro = _Carteiro(intervalo)
+            _carteiro.start()
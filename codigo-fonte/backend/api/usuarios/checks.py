@@ -0,0 +1,41 @@
+"""
+Verificações de sistema (`python manage.py check`, também executadas por migrate e runserver)
+da configuração de cache usada pelas sessões e pelo usuário da sessão.
+"""
+
+from django.conf import settings
+from django.core.checks import Error, register
+
+# Backends de cache que não são compartilhados entre processos/workers
+BACKENDS_CACHE_LOCAL = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+
+
+def cache_compartilhado():
+    """True se o cache padrão é visto por todos os workers (ex.: Redis, Memcached, arquivo)."""
+    return settings.CACHES['default']['BACKEND'] not in BACKENDS_CACHE_LOCAL
+
+
+@register()
+def verificar_cache_das_sessoes(app_configs, **kwargs):
+    if settings.SESSION_ENGINE == 'usuarios.sessoes' and not cache_compartilhado():
+        return [Error(
+            "SESSION_ENGINE 'usuarios.sessoes' exige um cache compartilhado entre os workers.",
+            hint="Configure CACHE_URL (ex.: Redis ou filecache) ou use 'django.contrib.sessions.backends.db'.",
+            id='usuarios.E001',
+        )]
+    return []
+
+
+@register()
+def verificar_cache_do_usuario(app_configs, **kwargs):
+    if 'usuarios.backends.ModelBackendComCache' in settings.AUTHENTICATION_BACKENDS and not cache_compartilhado():
+        return [Error(
+            "O backend 'usuarios.backends.ModelBackendComCache' exige um cache compartilhado entre os workers.",
+            hint="Configure CACHE_URL (ex.: Redis ou filecache) ou use apenas "
+                 "'django.contrib.auth.backends.ModelBackend'.",
+            id='usuarios.E002',
+        )]
+    return []
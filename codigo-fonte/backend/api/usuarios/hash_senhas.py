@@ -0,0 +1,19 @@
+"""
+Funções executadas nos processos do pool de hashing da importação em lote (ver importacao.py).
+
+Os processos são iniciados com `spawn` (seguro mesmo com threads no processo web), então
+não herdam o Django configurado: `inicializar` roda `django.setup()` em cada processo.
+Este módulo não importa models no nível do módulo, pois é importado antes do setup.
+"""
+
+import django
+
+
+def inicializar():
+    django.setup()
+
+
+def gerar_hash(senha):
+    """Hash da senha com o hasher padrão (PASSWORD_HASHERS[0]), como em `create_user`."""
+    from django.contrib.auth.hashers import make_password
+    return make_password(senha)
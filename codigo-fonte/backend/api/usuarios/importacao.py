@@ -0,0 +1,240 @@
+"""
+Importação em lote de contas de jogadores (lojas migrando de planilhas).
+
+Criar as contas uma a uma com `create_user` gasta quase todo o tempo no hash PBKDF2 da senha,
+feito em série. Aqui:
+
+- as linhas são validadas antes (e-mail, username, repetições no próprio arquivo);
+- e-mails já cadastrados (sem diferenciar maiúsculas) são ignorados sem calcular hash, então
+  reexecutar a mesma planilha é seguro (idempotente pelo e-mail);
+- as senhas das contas novas passam pelos AUTH_PASSWORD_VALIDATORS;
+- no comando, os hashes são calculados em um pool de processos (IMPORTACAO_PROCESSOS); o
+  endpoint calcula no próprio processo, para não iniciar processos dentro do worker web;
+- as contas são gravadas com `bulk_create`, um lote de TAMANHO_LOTE por vez, informando o
+  progresso a cada lote.
+
+Linhas sem senha criam a conta com senha inutilizável; o jogador define a senha pelo
+fluxo de "esqueci minha senha".
+
+Uso: `python manage.py importar_jogadores planilha.csv` ou POST /auth/usuarios/importar_jogadores/.
+"""
+
+import csv
+import io
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.password_validation import validate_password
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from . import busca, hash_senhas
+from .models import Usuario
+
+logger = logging.getLogger(__name__)
+
+TAMANHO_LOTE = 200
+
+# Abaixo disso o custo de iniciar os processos supera o ganho
+MINIMO_SENHAS_POOL = 8
+
+COLUNAS_EMAIL = ('email', 'e-mail')
+COLUNAS_USERNAME = ('username', 'usuario', 'usuário', 'nome')
+COLUNAS_SENHA = ('password', 'senha')
+
+
+def _coluna(cabecalho, nomes):
+    return next((cabecalho.index(nome) for nome in nomes if nome in cabecalho), None)
+
+
+def ler_csv(conteudo):
+    """
+    Linhas de um CSV (bytes ou texto, UTF-8) com cabeçalho. Colunas reconhecidas:
+    email/e-mail (obrigatória), username/usuario/nome e password/senha.
+    Retorna dicts com linha, email, username e password.
+    """
+    if isinstance(conteudo, bytes):
+        conteudo = conteudo.decode('utf-8-sig')
+    linhas = list(csv.reader(io.StringIO(conteudo)))
+    if not linhas:
+        return []
+
+    cabecalho = [celula.strip().lower() for celula in linhas[0]]
+    coluna_email = _coluna(cabecalho, COLUNAS_EMAIL)
+    if coluna_email is None:
+        raise ValueError("O CSV precisa de uma coluna 'email' no cabeçalho.")
+    coluna_username = _coluna(cabecalho, COLUNAS_USERNAME)
+    coluna_senha = _coluna(cabecalho, COLUNAS_SENHA)
+
+    def celula(linha, coluna):
+        return linha[coluna].strip() if coluna is not None and len(linha) > coluna else ''
+
+    return [
+        {
+            'linha': numero,
+            'email': celula(linha, coluna_email),
+            'username': celula(linha, coluna_username),
+            'password': linha[coluna_senha] if coluna_senha is not None and len(linha) > coluna_senha else '',
+        }
+        for numero, linha in enumerate(linhas[1:], start=2)
+        if any(valor.strip() for valor in linha)
+    ]
+
+
+def _validar(linhas):
+    """Separa as linhas válidas (normalizadas) dos itens de relatório das inválidas."""
+    campo_email = Usuario._meta.get_field('email')
+    campo_username = Usuario._meta.get_field('username')
+    validas, invalidas = [], []
+    emails_vistos, usernames_vistos = set(), set()
+
+    for numero, linha in enumerate(linhas, start=1):
+        email = (linha.get('email') or '').strip()
+        username = (linha.get('username') or '').strip() or email
+        item = {'linha': linha.get('linha', numero), 'email': email}
+        try:
+            email = campo_email.clean(email, None)
+            username = campo_username.clean(username, None)
+        except ValidationError as erro:
+            invalidas.append({**item, 'resultado': 'invalido', 'motivo': '; '.join(erro.messages)})
+            continue
+
+        if email.lower() in emails_vistos:
+            invalidas.append({**item, 'resultado': 'invalido', 'motivo': 'E-mail repetido no arquivo.'})
+            continue
+        if username.lower() in usernames_vistos:
+            invalidas.append({**item, 'resultado': 'invalido', 'motivo': 'Username repetido no arquivo.'})
+            continue
+        emails_vistos.add(email.lower())
+        usernames_vistos.add(username.lower())
+        validas.append({**item, 'email': email, 'username': username, 'password': linha.get('password') or ''})
+
+    return validas, invalidas
+
+
+def _numero_processos(processos):
+    processos = processos if processos is not None else settings.IMPORTACAO_PROCESSOS
+    return processos or os.cpu_count() or 1
+
+
+def _pool(processos):
+    if processos <= 1:
+        return None
+    return ProcessPoolExecutor(
+        max_workers=processos,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=hash_senhas.inicializar,
+    )
+
+
+def _hashes(senhas, pool, processos):
+    """Hash de cada senha (senha vazia: senha inutilizável, sem custo de PBKDF2)."""
+    com_senha = [senha for senha in senhas if senha]
+    if pool is not None and len(com_senha) >= MINIMO_SENHAS_POOL:
+        calculados = iter(pool.map(
+            hash_senhas.gerar_hash, com_senha, chunksize=max(1, len(com_senha) // (processos * 4))
+        ))
+    else:
+        calculados = iter([make_password(senha) for senha in com_senha])
+    return [next(calculados) if senha else make_password(None) for senha in senhas]
+
+
+def _importar_lote(lote, pool, processos):
+    """Grava um lote de linhas válidas. Retorna os itens de relatório do lote."""
+    existentes = set(
+        busca.usuarios_por_email(linha['email'] for linha in lote).values_list('email_minusculo', flat=True)
+    )
+    relatorio, novas = [], []
+    for linha in lote:
+        if linha['email'].lower() in existentes:
+            relatorio.append({'linha': linha['linha'], 'email': linha['email'], 'resultado': 'existente',
+                              'motivo': 'E-mail já cadastrado.'})
+        else:
+            novas.append(linha)
+
+    usernames_em_uso = set(
+        username.lower() for username in Usuario.objects.filter(
+            username__in=[linha['username'] for linha in novas]
+        ).values_list('username', flat=True)
+    ) if novas else set()
+    a_criar = []
+    for linha in novas:
+        if linha['username'].lower() in usernames_em_uso:
+            relatorio.append({'linha': linha['linha'], 'email': linha['email'], 'resultado': 'invalido',
+                              'motivo': 'Username já em uso por outra conta.'})
+            continue
+        if linha['password']:
+            try:
+                validate_password(
+                    linha['password'], Usuario(email=linha['email'], username=linha['username'])
+                )
+            except ValidationError as erro:
+                relatorio.append({'linha': linha['linha'], 'email': linha['email'], 'resultado': 'invalido',
+                                  'motivo': '; '.join(erro.messages)})
+                continue
+        a_criar.append(linha)
+    if not a_criar:
+        return relatorio
+
+    senhas = _hashes([linha['password'] for linha in a_criar], pool, processos)
+    usuarios = [
+        Usuario(email=linha['email'], username=linha['username'], password=senha,
+                tipo=Usuario.TipoUsuario.JOGADOR)
+        for linha, senha in zip(a_criar, senhas)
+    ]
+    try:
+        with transaction.atomic():
+            Usuario.objects.bulk_create(usuarios)
+        resultado, motivo = 'criado', ''
+    except IntegrityError:
+        # Conta criada em paralelo entre a verificação e o INSERT: reexecutar resolve
+        resultado, motivo = 'erro', 'Conflito ao gravar o lote; execute a importação novamente.'
+    relatorio.extend(
+        {'linha': linha['linha'], 'email': linha['email'], 'resultado': resultado, 'motivo': motivo}
+        for linha in a_criar
+    )
+    return relatorio
+
+
+def importar_jogadores(linhas, processos=None, progresso=None):
+    """
+    Cria contas de jogador para as `linhas` (dicts com email, username e password; ver ler_csv).
+
+    `processos`: processos do pool de hashing (padrão: settings.IMPORTACAO_PROCESSOS; 0 usa
+    todos os núcleos, 1 calcula no próprio processo, como no endpoint). `progresso(processadas, total)` é
+    chamada após cada lote.
+
+    Retorna {'criados', 'existentes', 'invalidos', 'erros', 'relatorio'}, com um item por linha
+    (linha, email, resultado: criado/existente/invalido/erro, motivo), na ordem do arquivo.
+    """
+    validas, relatorio = _validar(linhas)
+    total = len(validas)
+    processos = _numero_processos(processos)
+
+    pool = _pool(processos) if total >= MINIMO_SENHAS_POOL else None
+    try:
+        for inicio in range(0, total, TAMANHO_LOTE):
+            relatorio.extend(_importar_lote(validas[inicio:inicio + TAMANHO_LOTE], pool, processos))
+            processadas = min(inicio + TAMANHO_LOTE, total)
+            logger.info("Importação de jogadores: %s/%s linha(s) processada(s)", processadas, total)
+            if progresso is not None:
+                progresso(processadas, total)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    relatorio.sort(key=lambda item: item['linha'])
+    contagem = {resultado: 0 for resultado in ('criado', 'existente', 'invalido', 'erro')}
+    for item in relatorio:
+        contagem[item['resultado']] += 1
+    return {
+        'criados': contagem['criado'],
+        'existentes': contagem['existente'],
+        'invalidos': contagem['invalido'],
+        'erros': contagem['erro'],
+        'relatorio': relatorio,
+    }
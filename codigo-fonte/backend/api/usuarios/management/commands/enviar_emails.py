@@ -0,0 +1,46 @@
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from usuarios.caixa_saida import processar_fila, purgar_processados
+
+# Intervalo mínimo, em segundos, entre limpezas no modo contínuo
+INTERVALO_LIMPEZA = 3600
+
+
+class Command(BaseCommand):
+    help = (
+        "Envia os e-mails pendentes da caixa de saída (em lotes, com novas tentativas e backoff) e "
+        "apaga os já processados há mais de --retencao dias. Pode ser agendado via cron ou, com "
+        "--continuo, rodar como worker dedicado."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--continuo', action='store_true', help="Não termina: verifica a fila a cada --intervalo")
+        parser.add_argument('--intervalo', type=float, default=5, help="Segundos entre verificações no modo contínuo")
+        parser.add_argument(
+            '--retencao', type=int, default=settings.CAIXA_SAIDA_RETENCAO_DIAS,
+            help="Dias que e-mails enviados ou descartados são mantidos (0 desativa a limpeza)"
+        )
+
+    def handle(self, *args, **options):
+        ultima_limpeza = None
+        while True:
+            enviados, falhas = processar_fila()
+            if enviados or falhas or not options['continuo']:
+                self.stdout.write(self.style.SUCCESS(f"{enviados} e-mail(s) enviado(s), {falhas} falha(s)."))
+
+            if options['retencao'] > 0 and (
+                ultima_limpeza is None or time.monotonic() - ultima_limpeza >= INTERVALO_LIMPEZA
+            ):
+                apagados = purgar_processados(options['retencao'])
+                ultima_limpeza = time.monotonic()
+                if apagados or not options['continuo']:
+                    self.stdout.write(self.style.SUCCESS(f"{apagados} e-mail(s) antigo(s) apagado(s)."))
+
+            if not options['continuo']:
+                return
+            close_old_connections()
+            time.sleep(options['intervalo'])
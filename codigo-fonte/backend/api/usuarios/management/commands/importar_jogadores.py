@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from usuarios.importacao import importar_jogadores, ler_csv
+
+
+class Command(BaseCommand):
+    help = (
+        "Cria contas de jogador a partir de um CSV (colunas email, username e senha). "
+        "E-mails já cadastrados são ignorados, então a mesma planilha pode ser importada de novo."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('arquivo', help="Caminho do CSV (UTF-8, com cabeçalho)")
+        parser.add_argument(
+            '--processos', type=int,
+            help="Processos para o hash das senhas (padrão: IMPORTACAO_PROCESSOS; 0 usa todos os núcleos)"
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['arquivo'], 'rb') as arquivo:
+                linhas = ler_csv(arquivo.read())
+        except OSError as erro:
+            raise CommandError(f"Não foi possível ler o arquivo: {erro}")
+        except (UnicodeDecodeError, ValueError) as erro:
+            raise CommandError(f"CSV inválido: {erro}")
+
+        self.stdout.write(f"{len(linhas)} linha(s) lida(s).")
+        resultado = importar_jogadores(
+            linhas, processos=options['processos'],
+            progresso=lambda processadas, total: self.stdout.write(f"  {processadas}/{total} linha(s) válidas processadas")
+        )
+
+        for item in resultado['relatorio']:
+            if item['resultado'] in ('invalido', 'erro'):
+                self.stdout.write(self.style.WARNING(f"  linha {item['linha']} ({item['email']}): {item['motivo']}"))
+        self.stdout.write(self.style.SUCCESS(
+            f"{resultado['criados']} conta(s) criada(s), {resultado['existentes']} já existente(s), "
+            f"{resultado['invalidos']} inválida(s), {resultado['erros']} com erro."
+        ))
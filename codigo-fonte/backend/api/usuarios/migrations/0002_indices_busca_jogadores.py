@@ -0,0 +1,62 @@
+import logging
+
+from django.db import migrations, transaction
+
+logger = logging.getLogger(__name__)
+
+# Índices parciais (somente jogadores) sobre as mesmas expressões geradas pelos lookups
+# istartswith/icontains do Django no PostgreSQL. Ver usuarios/busca.py.
+INDICES_PREFIXO = [
+    "CREATE INDEX IF NOT EXISTS usuario_jogador_username_prefixo_idx ON usuarios_usuario "
+    "(UPPER(username::text) text_pattern_ops) WHERE tipo = 'JOGADOR'",
+    "CREATE INDEX IF NOT EXISTS usuario_jogador_email_prefixo_idx ON usuarios_usuario "
+    "(UPPER(email::text) text_pattern_ops) WHERE tipo = 'JOGADOR'",
+]
+INDICES_TRIGRAMA = [
+    "CREATE INDEX IF NOT EXISTS usuario_jogador_username_trgm_idx ON usuarios_usuario "
+    "USING gin (UPPER(username::text) gin_trgm_ops) WHERE tipo = 'JOGADOR'",
+    "CREATE INDEX IF NOT EXISTS usuario_jogador_email_trgm_idx ON usuarios_usuario "
+    "USING gin (UPPER(email::text) gin_trgm_ops) WHERE tipo = 'JOGADOR'",
+]
+NOMES_INDICES = [
+    'usuario_jogador_username_prefixo_idx',
+    'usuario_jogador_email_prefixo_idx',
+    'usuario_jogador_username_trgm_idx',
+    'usuario_jogador_email_trgm_idx',
+]
+
+
+def criar_indices_busca(apps, schema_editor):
+    """Cria os índices apenas no PostgreSQL; nos demais bancos a busca roda sem eles."""
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+
+    for sql in INDICES_PREFIXO:
+        schema_editor.execute(sql)
+
+    # CREATE EXTENSION pode exigir privilégios: sem pg_trgm, a busca por substring fica sem índice
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+            for sql in INDICES_TRIGRAMA:
+                schema_editor.execute(sql)
+    except Exception:
+        logger.warning("Não foi possível habilitar pg_trgm; índices trigram de busca não criados", exc_info=True)
+
+
+def remover_indices_busca(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for nome in NOMES_INDICES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {nome}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(criar_indices_busca, remover_indices_busca),
+    ]
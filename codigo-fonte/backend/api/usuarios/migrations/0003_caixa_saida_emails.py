@@ -0,0 +1,33 @@
+# Generated by Django 5.2.6 on 2026-10-19 18:38
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('usuarios', '0002_indices_busca_jogadores'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailPendente',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('destinatario', models.EmailField(help_text='Endereço de destino.', max_length=254)),
+                ('assunto', models.CharField(max_length=255)),
+                ('corpo_texto', models.TextField(help_text='Corpo em texto puro (apagado após o envio).')),
+                ('corpo_html', models.TextField(blank=True, help_text='Alternativa HTML (apagada após o envio).')),
+                ('status', models.CharField(choices=[('PENDENTE', 'Pendente'), ('ENVIADO', 'Enviado'), ('FALHOU', 'Falhou')], default='PENDENTE', max_length=10)),
+                ('tentativas', models.PositiveSmallIntegerField(default=0, help_text='Tentativas de envio já feitas.')),
+                ('proxima_tentativa', models.DateTimeField(default=django.utils.timezone.now, help_text='A partir de quando o e-mail pode ser (re)enviado; também reserva o e-mail durante o envio.')),
+                ('ultimo_erro', models.TextField(blank=True, help_text='Erro da última tentativa que falhou.')),
+                ('criado_em', models.DateTimeField(auto_now_add=True)),
+                ('enviado_em', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'proxima_tentativa'], name='email_pendente_fila_idx')],
+            },
+        ),
+    ]
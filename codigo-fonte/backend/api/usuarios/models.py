@@ -1,5 +1,7 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.db.models.functions import Lower
+from django.utils import timezone
 
 
 class Usuario(AbstractUser):
@@ -45,5 +47,45 @@ class Usuario(AbstractUser):
     USERNAME_FIELD = 'email'
     REQUIRED_FIELDS = []
 
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Busca exata por e-mail sem diferenciar maiúsculas (ver busca.usuarios_por_email)
+            models.Index(Lower('email'), name='usuario_email_minusculo_idx'),
+        ]
+
     def __str__(self):
         return self.email
+
+
+class EmailPendente(models.Model):
+    """
+    Caixa de saída de e-mails (ver caixa_saida.py). As views apenas enfileiram; o envio ao
+    provedor é feito fora da requisição, em lotes, com novas tentativas e backoff.
+    """
+
+    class Status(models.TextChoices):
+        PENDENTE = 'PENDENTE', 'Pendente'
+        ENVIADO = 'ENVIADO', 'Enviado'
+        FALHOU = 'FALHOU', 'Falhou'
+
+    destinatario = models.EmailField(help_text="Endereço de destino.")
+    assunto = models.CharField(max_length=255)
+    corpo_texto = models.TextField(help_text="Corpo em texto puro (apagado após o envio).")
+    corpo_html = models.TextField(blank=True, help_text="Alternativa HTML (apagada após o envio).")
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDENTE)
+    tentativas = models.PositiveSmallIntegerField(default=0, help_text="Tentativas de envio já feitas.")
+    proxima_tentativa = models.DateTimeField(
+        default=timezone.now,
+        help_text="A partir de quando o e-mail pode ser (re)enviado; também reserva o e-mail durante o envio."
+    )
+    ultimo_erro = models.TextField(blank=True, help_text="Erro da última tentativa que falhou.")
+    criado_em = models.DateTimeField(auto_now_add=True)
+    enviado_em = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'proxima_tentativa'], name='email_pendente_fila_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.assunto} para {self.destinatario} ({self.status})'
@@ -1,9 +1,10 @@
 from rest_framework import serializers
 
+from core.campos_esparsos import CamposEsparsosMixin
 from .models import Usuario
 
 
-class UsuarioSerializer(serializers.ModelSerializer):
+class UsuarioSerializer(CamposEsparsosMixin, serializers.ModelSerializer):
     """
     Serializer padrão para o modelo Usuario.
     Usado para exibir os dados dos usuários. O campo 'password' não é incluído
@@ -58,6 +59,8 @@ class RequisitarTrocaSenhaSerializer(serializers.Serializer):
 class ValidarTokenRedefinirSenhaSerializer(serializers.Serializer):
     email = serializers.EmailField()
     token = serializers.CharField(max_length=16)
+    # Escolhida pelo usuário: a senha nunca é gerada pelo servidor nem enviada por email
+    nova_senha = serializers.CharField(write_only=True)
 
     def validate(self, data):
         email = data.get('email')
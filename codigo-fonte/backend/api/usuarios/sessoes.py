@@ -0,0 +1,105 @@
+"""
+Sessões com poucas escritas.
+
+Com o engine `db` e SESSION_SAVE_EVERY_REQUEST, toda requisição autenticada (inclusive os
+polls) fazia um UPDATE em django_session só para renovar a expiração. Aqui:
+
+- SessionStore (SESSION_ENGINE = 'usuarios.sessoes'): sessões em banco com cache na frente
+  (cached_db). As leituras vêm do cache; o banco só é lido em cache miss e escrito quando a
+  sessão muda. Exige cache compartilhado entre os workers (CACHE_URL), senão um logout feito
+  em um worker não valeria nos outros: com o cache local padrão (locmem), settings.py usa o
+  engine `db` e a verificação de sistema usuarios.E001 recusa este engine. O tempo no cache
+  é limitado a SESSOES_CACHE_TEMPO.
+- RenovacaoSessaoMiddleware: substitui SESSION_SAVE_EVERY_REQUEST. Renova a expiração
+  (banco, cache e cookie) apenas quando já passou a fração SESSOES_FRACAO_RENOVACAO de
+  SESSION_COOKIE_AGE desde a última renovação. Funciona com qualquer engine.
+- Limpeza: `python manage.py clearsessions` (via cron) apaga as sessões expiradas; com este
+  engine, em lotes de TAMANHO_LOTE_LIMPEZA.
+"""
+
+import time
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.contrib.sessions.models import Session
+from django.utils import timezone
+
+# Chave na sessão com o instante (epoch) da última renovação da expiração
+CHAVE_RENOVACAO = '_renovada_em'
+
+TAMANHO_LOTE_LIMPEZA = 1000
+
+
+class _CacheComTempoLimitado:
+    """Repassa ao cache de sessões, limitando o timeout de cada escrita."""
+
+    def __init__(self, cache, limite):
+        self._cache = cache
+        self._limite = limite
+
+    def _timeout(self, timeout):
+        return self._limite if timeout is None else min(timeout, self._limite)
+
+    def set(self, chave, valor, timeout=None):
+        return self._cache.set(chave, valor, self._timeout(timeout))
+
+    async def aset(self, chave, valor, timeout=None):
+        return await self._cache.aset(chave, valor, self._timeout(timeout))
+
+    def __contains__(self, chave):
+        return chave in self._cache
+
+    def __getattr__(self, nome):
+        return getattr(self._cache, nome)
+
+
+class SessionStore(CachedDBStore):
+    """Sessões em banco com cache (cached_db), com tempo de cache limitado."""
+
+    def __init__(self, session_key=None):
+        super().__init__(session_key)
+        self._cache = _CacheComTempoLimitado(self._cache, settings.SESSOES_CACHE_TEMPO)
+
+    @classmethod
+    def clear_expired(cls):
+        """Usado pelo comando clearsessions."""
+        limpar_sessoes_expiradas()
+
+
+class RenovacaoSessaoMiddleware:
+    """
+    Renova a expiração da sessão de forma fracionada. Deve vir depois do SessionMiddleware
+    (a resposta passa por aqui antes de o SessionMiddleware decidir se grava a sessão).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+
+        # Só sessões autenticadas (cookie inválido ou anônimo não cria sessão)
+        sessao = getattr(request, 'session', None)
+        if sessao is None or SESSION_KEY not in sessao:
+            return response
+
+        agora = time.time()
+        intervalo = settings.SESSION_COOKIE_AGE * settings.SESSOES_FRACAO_RENOVACAO
+        if sessao.modified or agora - sessao.get(CHAVE_RENOVACAO, 0) >= intervalo:
+            # Sessão modificada é gravada pelo SessionMiddleware, que também reenvia o cookie
+            sessao[CHAVE_RENOVACAO] = int(agora)
+        return response
+
+
+def limpar_sessoes_expiradas(agora=None):
+    """Apaga as sessões expiradas em lotes (transações curtas). Retorna quantas apagou."""
+    agora = agora or timezone.now()
+    apagadas = 0
+    while True:
+        chaves = list(
+            Session.objects.filter(expire_date__lt=agora).values_list('pk', flat=True)[:TAMANHO_LOTE_LIMPEZA]
+        )
+        if not chaves:
+            return apagadas
+        apagadas += Session.objects.filter(pk__in=chaves).delete()[0]
@@ -0,0 +1,22 @@
+"""
+Receivers que invalidam o usuário em cache do backend de autenticação (ver backends.py).
+"""
+
+from django.contrib.auth.signals import user_logged_out
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from .backends import invalidar_usuario
+from .models import Usuario
+
+
+@receiver([post_save, post_delete], sender=Usuario)
+def usuario_alterado(sender, instance, **kwargs):
+    # Troca de senha, tipo ou status e o last_login gravado no login
+    invalidar_usuario(instance.pk)
+
+
+@receiver(user_logged_out)
+def usuario_saiu(sender, request, user, **kwargs):
+    if user is not None:
+        invalidar_usuario(user.pk)
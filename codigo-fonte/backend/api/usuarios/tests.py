@@ -0,0 +1,377 @@
+import importlib
+import io
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.sessions.models import Session
+from django.core import mail
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from . import backends, caixa_saida, checks
+from .caixa_saida import processar_fila
+from .models import EmailPendente, Usuario
+
+
+class ImportacaoJogadoresTests(TestCase):
+    """
+    Testes da importação em lote de contas de jogador (UsuariosViewSet.importar_jogadores).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = Usuario.objects.create_user(
+            email='admin@teste.com', username='admin', password='senha', tipo='ADMIN'
+        )
+        Usuario.objects.create_user(
+            email='existente@teste.com', username='existente', password='senha', tipo='JOGADOR'
+        )
+        Usuario.objects.create_user(
+            email='Misto@Teste.com', username='misto', password='senha', tipo='JOGADOR'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+        self.url = '/api/v1/auth/usuarios/importar_jogadores/'
+
+    def test_importacao_idempotente_pelo_email(self):
+        csv = (
+            "email,username,senha\n"
+            "novo1@teste.com,novo1,senha-forte-1\n"
+            "Existente@teste.com,outro,senha\n"
+            "nao-e-email,novo2,senha\n"
+            "novo1@teste.com,novo3,senha\n"
+            "novo4@teste.com,,\n"
+        )
+        arquivo = SimpleUploadedFile('jogadores.csv', csv.encode(), content_type='text/csv')
+
+        response = self.client.post(self.url, {'arquivo': arquivo})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [item['resultado'] for item in response.data['relatorio']],
+            ['criado', 'existente', 'invalido', 'invalido', 'criado']
+        )
+        novo = Usuario.objects.get(email='novo1@teste.com')
+        self.assertEqual(novo.tipo, 'JOGADOR')
+        self.assertTrue(novo.check_password('senha-forte-1'))
+        sem_senha = Usuario.objects.get(email='novo4@teste.com')
+        self.assertEqual(sem_senha.username, 'novo4@teste.com')
+        self.assertFalse(sem_senha.has_usable_password())
+
+        # Reenviar a mesma planilha não cria nada
+        arquivo.seek(0)
+        response = self.client.post(self.url, {'arquivo': arquivo})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['criados'], response.data['existentes']), (0, 3))
+
+    def test_email_cadastrado_com_maiusculas_conta_como_existente(self):
+        response = self.client.post(
+            self.url, {'jogadores': [{'email': 'misto@teste.com', 'username': 'outro-misto'}]}, format='json'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['relatorio'][0]['resultado'], 'existente')
+        self.assertFalse(Usuario.objects.filter(username='outro-misto').exists())
+
+    def test_senha_fraca_recusada_pelos_validadores(self):
+        response = self.client.post(self.url, {'jogadores': [
+            {'email': 'fraca@teste.com', 'username': 'fraca', 'password': '12345678'},
+            {'email': 'forte@teste.com', 'username': 'forte', 'password': 'cartas-e-dados-9'},
+        ]}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        fraca, forte = response.data['relatorio']
+        self.assertEqual(fraca['resultado'], 'invalido')
+        self.assertIn('comum', fraca['motivo'])
+        self.assertEqual(forte['resultado'], 'criado')
+        self.assertFalse(Usuario.objects.filter(email='fraca@teste.com').exists())
+
+    def test_acima_do_limite_por_requisicao_recusa_o_lote(self):
+        jogadores = [
+            {'email': f'novo{i}@teste.com', 'username': f'novo{i}', 'password': 'cartas-e-dados-9'}
+            for i in range(settings.MAXIMO_IMPORTACAO_REQUISICAO + 1)
+        ]
+
+        response = self.client.post(self.url, {'jogadores': jogadores}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Usuario.objects.filter(email='novo0@teste.com').exists())
+
+
+class BuscaJogadoresTests(TestCase):
+    """
+    Testes da busca de jogadores (UsuariosViewSet.buscar_jogadores) e dos índices da migration 0002.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.loja = Usuario.objects.create_user(
+            email='loja-ana@teste.com', username='loja-ana', password='senha', tipo='LOJA'
+        )
+        for username, email in [
+            ('mariana', 'mari@teste.com'),      # trecho no username
+            ('souza', 'ana.souza@teste.com'),   # início do e-mail
+            ('Anabela', 'bela@teste.com'),      # início do username
+            ('ana', 'ana@teste.com'),           # exato
+        ]:
+            Usuario.objects.create_user(email=email, username=username, password='senha', tipo='JOGADOR')
+        Usuario.objects.create_user(
+            email='anastacia@teste.com', username='anastacia', password='senha', tipo='JOGADOR', status='inativo'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.loja)
+
+    def _buscar(self, termo):
+        response = self.client.get('/api/v1/auth/usuarios/buscar_jogadores/', {'q': termo})
+        self.assertEqual(response.status_code, 200)
+        return [jogador['username'] for jogador in response.data]
+
+    def test_exato_e_prefixos_antes_de_trecho(self):
+        self.assertEqual(self._buscar('ana'), ['ana', 'Anabela', 'souza', 'mariana'])
+
+    def test_busca_ignora_maiusculas(self):
+        self.assertEqual(self._buscar('ANA'), self._buscar('ana'))
+        self.assertEqual(self._buscar('aNaBe'), ['Anabela'])
+
+    def test_trecho_exige_tres_caracteres(self):
+        self.assertEqual(self._buscar('an'), ['ana', 'Anabela', 'souza'])
+
+    def test_migration_de_indices_nao_faz_nada_fora_do_postgresql(self):
+        migration = importlib.import_module('usuarios.migrations.0002_indices_busca_jogadores')
+
+        # collect_sql: o que a migration executaria é coletado em vez de enviado ao banco
+        editor = connection.schema_editor(collect_sql=True)
+        with CaptureQueriesContext(connection) as consultas:
+            migration.criar_indices_busca(None, editor)
+            migration.remover_indices_busca(None, editor)
+
+        self.assertNotEqual(connection.vendor, 'postgresql')
+        self.assertEqual(editor.collected_sql, [])
+        self.assertEqual(len(consultas), 0)
+
+
+@override_settings(SESSION_ENGINE='usuarios.sessoes')
+class SessoesTests(TestCase):
+    """
+    Testes das sessões com cache e renovação fracionada (usuarios/sessoes.py).
+    Em produção o engine exige cache compartilhado; aqui o locmem basta (um único processo).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.jogador = Usuario.objects.create_user(
+            email='jogador@teste.com', username='jogador', password='senha', tipo='JOGADOR'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.post('/api/v1/auth/login/', {'email': 'jogador@teste.com', 'password': 'senha'}, format='json')
+
+    def _queries_de_sessao(self):
+        with CaptureQueriesContext(connection) as contexto:
+            response = self.client.get('/api/v1/auth/validar-sessao/')
+        self.assertEqual(response.status_code, 200)
+        return [query['sql'] for query in contexto.captured_queries if 'django_session' in query['sql']]
+
+    def test_requisicao_autenticada_nao_grava_sessao(self):
+        # Sessão lida do cache, sem SELECT nem UPDATE em django_session
+        self.assertEqual(self._queries_de_sessao(), [])
+
+    @override_settings(SESSOES_FRACAO_RENOVACAO=0)
+    def test_renovacao_grava_sessao(self):
+        queries = self._queries_de_sessao()
+        self.assertEqual(len(queries), 1)
+        self.assertTrue(queries[0].startswith('UPDATE'))
+
+    def test_engine_com_cache_local_falha_na_verificacao(self):
+        self.assertEqual([erro.id for erro in checks.verificar_cache_das_sessoes(None)], ['usuarios.E001'])
+
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                                                   'LOCATION': 'redis://localhost:6379'}}):
+            self.assertEqual(checks.verificar_cache_das_sessoes(None), [])
+
+    def test_clearsessions_apaga_expiradas(self):
+        Session.objects.create(
+            session_key='expirada', session_data='', expire_date=timezone.now() - timedelta(days=1)
+        )
+
+        call_command('clearsessions')
+
+        self.assertFalse(Session.objects.filter(session_key='expirada').exists())
+        self.assertEqual(Session.objects.count(), 1)  # a sessão do login continua
+
+
+@override_settings(
+    SESSION_ENGINE='usuarios.sessoes',
+    AUTHENTICATION_BACKENDS=[
+        'usuarios.backends.ModelBackendComCache', 'django.contrib.auth.backends.ModelBackend'
+    ],
+)
+class UsuarioEmCacheTests(TestCase):
+    """
+    Testes do usuário da sessão em cache (usuarios/backends.py).
+    Em produção o backend exige cache compartilhado; aqui o locmem basta (um único processo).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.jogador = Usuario.objects.create_user(
+            email='jogador@teste.com', username='jogador', password='senha', tipo='JOGADOR'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.post('/api/v1/auth/login/', {'email': 'jogador@teste.com', 'password': 'senha'}, format='json')
+        self.client.get('/api/v1/auth/validar-sessao/')
+
+    def test_requisicao_autenticada_sem_queries(self):
+        # Sessão e usuário vêm do cache
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/v1/auth/validar-sessao/')
+        self.assertEqual(response.data['email'], 'jogador@teste.com')
+
+    def test_segredos_fora_do_cache(self):
+        dados = cache.get(backends._chave(self.jogador.pk))
+        self.assertNotIn('password', dados)
+        self.assertNotIn('token_redefinir_senha', dados)
+        self.assertNotIn(self.jogador.password, dados.values())
+
+        # Os campos adiados continuam acessíveis, lidos do banco
+        usuario = backends.ModelBackendComCache().get_user(self.jogador.pk)
+        self.assertTrue(usuario.check_password('senha'))
+
+    def test_alteracoes_do_usuario_invalidam_cache(self):
+        self.jogador.tipo = 'LOJA'
+        self.jogador.save()
+        self.assertEqual(self.client.get('/api/v1/auth/validar-sessao/').data['tipo'], 'LOJA')
+
+        # Troca de senha encerra a sessão
+        self.jogador.set_password('nova-senha')
+        self.jogador.save()
+        self.assertEqual(self.client.get('/api/v1/auth/validar-sessao/').status_code, 204)
+
+    def test_desativacao_encerra_sessao(self):
+        self.jogador.is_active = False
+        self.jogador.save()
+
+        self.assertEqual(self.client.get('/api/v1/auth/validar-sessao/').status_code, 204)
+
+    def test_backend_com_cache_local_falha_na_verificacao(self):
+        self.assertEqual([erro.id for erro in checks.verificar_cache_do_usuario(None)], ['usuarios.E002'])
+
+        with override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+                                                   'LOCATION': 'redis://localhost:6379'}}):
+            self.assertEqual(checks.verificar_cache_do_usuario(None), [])
+
+
+class BackendEmailComFalha(BaseEmailBackend):
+    """Backend de e-mail que sempre falha (provedor fora do ar)."""
+
+    def send_messages(self, email_messages):
+        raise ConnectionError('provedor indisponível')
+
+
+class CaixaSaidaEmailsTests(TestCase):
+    """
+    Testes da caixa de saída de e-mails (usuarios/caixa_saida.py).
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        Usuario.objects.create_user(
+            email='jogador@teste.com', username='jogador', password='senha', tipo='JOGADOR'
+        )
+
+    def _requisitar_troca(self):
+        response = APIClient().post(
+            '/api/v1/auth/requisitar-troca-senha/', {'email': 'jogador@teste.com'}, format='json'
+        )
+        self.assertEqual(response.status_code, 200)
+        return EmailPendente.objects.get()
+
+    def test_requisicao_enfileira_e_fila_envia(self):
+        pendente = self._requisitar_troca()
+        # Nada é enviado dentro da requisição
+        self.assertEqual(len(mail.outbox), 0)
+
+        self.assertEqual(processar_fila(), (1, 0))
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['jogador@teste.com'])
+        self.assertEqual(len(mail.outbox[0].alternatives), 1)
+        pendente.refresh_from_db()
+        self.assertEqual(pendente.status, EmailPendente.Status.ENVIADO)
+        self.assertEqual(pendente.corpo_texto, '')
+
+    @override_settings(EMAIL_BACKEND='usuarios.tests.BackendEmailComFalha')
+    def test_falha_reagenda_com_backoff(self):
+        pendente = self._requisitar_troca()
+
+        self.assertEqual(processar_fila(), (0, 1))
+        # Ainda não liberado para nova tentativa
+        self.assertEqual(processar_fila(), (0, 0))
+
+        pendente.refresh_from_db()
+        self.assertEqual((pendente.status, pendente.tentativas), (EmailPendente.Status.PENDENTE, 1))
+        self.assertGreater(pendente.proxima_tentativa, timezone.now())
+        self.assertIn('provedor indisponível', pendente.ultimo_erro)
+
+    def test_redefinicao_de_senha_nao_grava_a_senha(self):
+        self._requisitar_troca()
+        token = Usuario.objects.get().token_redefinir_senha
+
+        response = APIClient().post('/api/v1/auth/validar-token-redefinir-senha/', {
+            'email': 'jogador@teste.com', 'token': token, 'nova_senha': 'senha-escolhida'
+        }, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        usuario = Usuario.objects.get()
+        self.assertTrue(usuario.check_password('senha-escolhida'))
+        self.assertIsNone(usuario.token_redefinir_senha)
+        aviso = EmailPendente.objects.latest('id')
+        self.assertNotIn('senha-escolhida', aviso.corpo_texto + aviso.corpo_html)
+
+    @override_settings(EMAIL_BACKEND='usuarios.tests.BackendEmailComFalha')
+    def test_descarte_apaga_conteudo(self):
+        pendente = self._requisitar_troca()
+        EmailPendente.objects.filter(pk=pendente.pk).update(tentativas=caixa_saida.MAXIMO_TENTATIVAS - 1)
+
+        self.assertEqual(processar_fila(), (0, 1))
+
+        pendente.refresh_from_db()
+        self.assertEqual(pendente.status, EmailPendente.Status.FALHOU)
+        self.assertEqual((pendente.corpo_texto, pendente.corpo_html), ('', ''))
+
+    def test_comando_apaga_processados_antigos(self):
+        antigo = timezone.now() - timedelta(days=31)
+        for status in EmailPendente.Status.values:
+            email = EmailPendente.objects.create(
+                destinatario='jogador@teste.com', assunto='Teste', corpo_texto='x', status=status,
+                proxima_tentativa=timezone.now() + timedelta(hours=1)
+            )
+            EmailPendente.objects.filter(pk=email.pk).update(criado_em=antigo)
+        recente = EmailPendente.objects.create(
+            destinatario='jogador@teste.com', assunto='Teste', corpo_texto='', status=EmailPendente.Status.ENVIADO
+        )
+
+        call_command('enviar_emails', '--retencao', '30', stdout=io.StringIO())
+
+        self.assertQuerySetEqual(
+            EmailPendente.objects.order_by('id').values_list('status', flat=True),
+            [EmailPendente.Status.PENDENTE, EmailPendente.Status.ENVIADO]
+        )
+        self.assertTrue(EmailPendente.objects.filter(pk=recente.pk).exists())
+
@@ -1,19 +1,25 @@
+import csv
+
 from django.conf import settings
 from django.contrib.auth import authenticate, login, logout
-from django.core.mail import EmailMultiAlternatives
 from django.template.loader import render_to_string
 from django.utils.crypto import get_random_string
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_exempt
+from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.status import HTTP_200_OK, HTTP_401_UNAUTHORIZED, HTTP_400_BAD_REQUEST, HTTP_404_NOT_FOUND, \
-    HTTP_204_NO_CONTENT
+    HTTP_204_NO_CONTENT, HTTP_201_CREATED
 from rest_framework.views import APIView
 
-from torneios.permissoes import IsOwnerOrAdmin
+from core.campos_esparsos import CamposEsparsosFilter
+from core.paginacao import PaginacaoKeyset
+from torneios.permissoes import IsAdmin, IsOwnerOrAdmin, IsLojaOuAdmin
+from . import busca, caixa_saida, importacao
 from .authentication import SessionAuthenticationSemCSRF
 from .models import Usuario
 from .serializers import (RequisitarTrocaSenhaSerializer, ValidarTokenRedefinirSenhaSerializer,
@@ -144,25 +150,18 @@ class RequisitarTrocaSenhaView(APIView):
         # Fallback em texto puro
         email_texto_puro = f'Seu token para redefinição de senha é: {token}'
 
-        # Configurar email com HTML
-        email_msg = EmailMultiAlternatives(
-            subject='Redefinição de senha - Commander150',
-            body=email_texto_puro,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[email],
-        )
-        email_msg.attach_alternative(email_html, "text/html")
-        email_msg.send()
+        # Enfileira o email com HTML; o envio ao provedor é feito fora da requisição (caixa_saida.py)
+        caixa_saida.enfileirar_email(email, 'Redefinição de senha - Commander150', email_texto_puro, email_html)
 
         return Response({"message": f"Token enviado para o email {email} com sucesso."}, status=HTTP_200_OK)
 
 
 class ValidarTokenRedefinirSenhaView(APIView):
     """
-        Endpoint para requisitar a Nova Senha
+        Endpoint para definir a Nova Senha
 
-        Utilizado após estar em posse do Token.
-        Em caso de sucesso, envia o a Nova Senha para o email do usuário.
+        Utilizado após estar em posse do Token, com a nova senha escolhida pelo usuário.
+        Em caso de sucesso, envia um aviso (sem a senha) para o email do usuário.
         """
     permission_classes = [AllowAny]
 
@@ -179,30 +178,18 @@ class ValidarTokenRedefinirSenhaView(APIView):
 
         usuario = Usuario.objects.get(email=email, token_redefinir_senha=token)
 
-        # Gerar nova senha
-        nova_senha = get_random_string(length=8)
-        usuario.set_password(nova_senha)
+        usuario.set_password(serializer.validated_data['nova_senha'])
         usuario.token_redefinir_senha = None  # Limpar o token após uso
         usuario.save()
 
-        # Renderizar o HTML do email
-        email_html = render_to_string('emails/sucesso_redefinir_senha.html',
-                                      {'nova_senha': nova_senha, 'nome': usuario.username})
-        email_texto_puro = f'Sua nova senha é: {nova_senha}. Recomendamos alterá-la assim que possível.'
-
-        # Configurar email com HTML
-        email_msg = EmailMultiAlternatives(
-            subject='Sua nova senha - Commander150',
-            body=email_texto_puro,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            to=[email],
-        )
-        email_msg.attach_alternative(email_html, "text/html")
-        email_msg.send()
+        # Renderizar o HTML do email (apenas o aviso: a senha não passa pela caixa de saída)
+        email_html = render_to_string('emails/sucesso_redefinir_senha.html', {'nome': usuario.username})
+        email_texto_puro = 'Sua senha foi redefinida. Se não foi você, redefina-a novamente e fale com a loja.'
+
+        # Enfileira o email com HTML; o envio ao provedor é feito fora da requisição (caixa_saida.py)
+        caixa_saida.enfileirar_email(email, 'Senha redefinida - Commander150', email_texto_puro, email_html)
 
-        return Response(
-            {"message": f"Senha redefinida com sucesso. Verifique seu email {email} para obter a nova senha."},
-            status=HTTP_200_OK)
+        return Response({"message": "Senha redefinida com sucesso."}, status=HTTP_200_OK)
 
 
 class AlterarSenhaView(APIView):
@@ -274,6 +261,9 @@ class UsuariosViewSet(viewsets.ModelViewSet):
     """
     queryset = Usuario.objects.all()
     serializer_class = UsuarioSerializer
+    pagination_class = PaginacaoKeyset
+    ordenacao_keyset = ('id',)
+    filter_backends = [CamposEsparsosFilter]
 
     def get_queryset(self):
         """
@@ -328,10 +318,106 @@ class UsuariosViewSet(viewsets.ModelViewSet):
         - Create: Livre acesso (AllowAny)
         - Ações individuais: Requer autenticação + ser dono ou admin
         - Listagem: Apenas autenticação (filtro é feito no get_queryset)
+        - Busca de jogadores: Apenas Lojas e Admins
+        - Importação em lote de jogadores: Apenas Admins
         """
         if self.action == 'create':
             return [AllowAny()]
         elif self.action in ['retrieve', 'update', 'partial_update', 'destroy']:
             return [IsAuthenticated(), IsOwnerOrAdmin()]
+        elif self.action == 'buscar_jogadores':
+            return [IsLojaOuAdmin()]
+        elif self.action == 'importar_jogadores':
+            return [IsAdmin()]
         else:
             return [IsAuthenticated()]
+
+    @swagger_auto_schema(
+        method='get',
+        manual_parameters=[
+            openapi.Parameter('q', openapi.IN_QUERY, type=openapi.TYPE_STRING, required=True,
+                              description='Início do username/e-mail (ou trecho, com 3+ caracteres)'),
+            openapi.Parameter('limite', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description=f'Máximo de resultados (padrão {busca.LIMITE_PADRAO}, máximo {busca.LIMITE_MAXIMO})'),
+            openapi.Parameter('torneio_id', openapi.IN_QUERY, type=openapi.TYPE_INTEGER,
+                              description='Indica em cada resultado se o jogador já está inscrito neste torneio'),
+        ],
+        responses={200: 'Lista de jogadores: id, username, email (e inscrito, com torneio_id)',
+                   400: 'Parâmetro q ausente'},
+        operation_summary="Buscar jogadores (autocomplete)",
+        operation_description="""
+        Busca jogadores ativos por username ou e-mail para a inscrição pela loja (check-in).
+        Resultados ordenados por relevância: correspondência exata, início do username,
+        início do e-mail e, para termos com 3+ caracteres, trecho em qualquer posição.
+        """
+    )
+    @action(detail=False, methods=['get'])
+    def buscar_jogadores(self, request):
+        """Autocomplete de jogadores por username/e-mail, limitado e ordenado por relevância."""
+        termo = request.query_params.get('q', '').strip()
+        if not termo:
+            return Response({"detail": "Parâmetro 'q' é obrigatório."}, status=HTTP_400_BAD_REQUEST)
+
+        try:
+            limite = int(request.query_params.get('limite', busca.LIMITE_PADRAO))
+            torneio_id = request.query_params.get('torneio_id')
+            torneio_id = int(torneio_id) if torneio_id else None
+        except ValueError:
+            return Response({"detail": "limite e torneio_id devem ser números inteiros."},
+                            status=HTTP_400_BAD_REQUEST)
+
+        return Response(busca.buscar_jogadores(termo, limite, torneio_id))
+
+    @swagger_auto_schema(
+        method='post',
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                'jogadores': openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(type=openapi.TYPE_OBJECT, properties={
+                        'email': openapi.Schema(type=openapi.TYPE_STRING),
+                        'username': openapi.Schema(type=openapi.TYPE_STRING),
+                        'password': openapi.Schema(type=openapi.TYPE_STRING),
+                    }),
+                    description='Contas a criar (alternativa ao arquivo CSV)'
+                ),
+                'arquivo': openapi.Schema(type=openapi.TYPE_FILE,
+                                          description='CSV com cabeçalho: email, username, senha (multipart)'),
+            }
+        ),
+        responses={201: 'Relatório por linha e totais (criados, existentes, invalidos, erros)',
+                   200: 'Nenhuma conta criada (relatório por linha)',
+                   400: 'Entrada ausente, CSV inválido ou acima do limite de linhas'},
+        operation_summary="Importar jogadores em lote",
+        operation_description=f"""
+        Cria contas de jogador a partir de uma planilha (CSV) ou lista JSON. E-mails já cadastrados
+        são ignorados (reenviar a mesma planilha é seguro); sem username, usa o e-mail; sem senha,
+        a conta é criada com senha inutilizável (o jogador define a senha por "esqueci minha senha");
+        senhas informadas passam pelos validadores de senha do Django.
+        Máximo de {settings.MAXIMO_IMPORTACAO_REQUISICAO} linhas por requisição; para planilhas
+        maiores use `python manage.py importar_jogadores`.
+        """
+    )
+    @action(detail=False, methods=['post'])
+    def importar_jogadores(self, request):
+        """Criação em lote de contas de jogador (hash das senhas em paralelo, bulk_create)."""
+        arquivo = request.FILES.get('arquivo')
+        try:
+            linhas = importacao.ler_csv(arquivo.read()) if arquivo is not None else request.data.get('jogadores')
+        except (UnicodeDecodeError, csv.Error, ValueError) as erro:
+            return Response({"detail": f"Arquivo CSV inválido: {erro}"}, status=HTTP_400_BAD_REQUEST)
+
+        if not linhas or not isinstance(linhas, list) or not all(isinstance(linha, dict) for linha in linhas):
+            return Response({"detail": "Informe 'jogadores' (lista de objetos) ou um arquivo CSV em 'arquivo'."},
+                            status=HTTP_400_BAD_REQUEST)
+        if len(linhas) > settings.MAXIMO_IMPORTACAO_REQUISICAO:
+            return Response(
+                {"detail": f"Máximo de {settings.MAXIMO_IMPORTACAO_REQUISICAO} linhas por requisição; "
+                           f"use o comando importar_jogadores."},
+                status=HTTP_400_BAD_REQUEST
+            )
+
+        # Hash no próprio processo: o pool de processos fica para o comando importar_jogadores
+        resultado = importacao.importar_jogadores(linhas, processos=1)
+        return Response(resultado, status=HTTP_201_CREATED if resultado['criados'] else HTTP_200_OK)
@@ -11,8 +11,9 @@ import Swal from 'sweetalert2';
 export default function PaginaRecuperarSenha() {
     const [email, setEmail] = useState("");
     const [token, setToken] = useState("");
+    const [novaSenha, setNovaSenha] = useState("");
     const [etapa, setEtapa] = useState<"email" | "token" | "finalizado">("email");
-    const {qtdCaracteresToken } = useSessao();
+    const {qtdCaracteresToken, qtdCaracteresSenha } = useSessao();
     const [isLoading, setIsLoading] = useState(false);
     const corTextInputs = "var(--cor-texto-principal)";
   const corBackgroundInputs = "var(--cor-branca)";
@@ -41,18 +42,18 @@ export default function PaginaRecuperarSenha() {
 };
 
 
-    // Função para enviar o Token e solicitar nova senha
+    // Função para enviar o Token e a nova senha
     const handleEnviarToken = async (e: React.FormEvent) => {
   e.preventDefault();
   setIsLoading(true);
 
   let resposta;
   try {
-    resposta = await validarTokenRecuperacao(email, token);
+    resposta = await validarTokenRecuperacao(email, token, novaSenha);
   } catch {
     Swal.fire(
       "Erro na Recuperação de Senha",
-      "Não foi possível enviar a Nova Senha utilizando o Token informado. Verifique o Token.",
+      "Não foi possível redefinir a senha utilizando o Token informado. Verifique o Token.",
       "error"
     );
   } finally {
@@ -69,6 +70,7 @@ export default function PaginaRecuperarSenha() {
     const handleTrocarEmail = () => {
         setEmail("");
         setToken("");
+        setNovaSenha("");
         setEtapa("email");
     };
 
@@ -79,7 +81,7 @@ export default function PaginaRecuperarSenha() {
             <>
                 <h2 className={styles.title}>Redefinir senha</h2>
                 <p className={styles.subtitle}>
-                Digite o seu email no campo abaixo e lhe enviaremos uma nova senha.
+                Digite o seu email no campo abaixo e lhe enviaremos um token para redefinir sua senha.
                 </p>
                 <Input
                 type="email"
@@ -99,7 +101,7 @@ export default function PaginaRecuperarSenha() {
             <>
                 <h2 className={styles.title}>Validar token</h2>
                 <p className={styles.subtitle}>
-                Enviamos um código para o seu email. Cole abaixo para confirmar sua identidade.
+                Enviamos um código para o seu email. Cole abaixo para confirmar sua identidade e escolha sua nova senha.
                 </p>
                 <Input
                 type="text"
@@ -113,6 +115,18 @@ export default function PaginaRecuperarSenha() {
                 backgroundColor={corBackgroundInputs}
                 textColor={corTextInputs}
                 />
+                <Input
+                type="password"
+                name="nova-senha"
+                label="Nova Senha"
+                placeholder="**********"
+                value={novaSenha}
+                onChange={(e) => setNovaSenha(e.target.value)}
+                required
+                minLength={qtdCaracteresSenha}
+                backgroundColor={corBackgroundInputs}
+                textColor={corTextInputs}
+                />
                 
                 <Button
                     label="Retornar e Alterar Email"
@@ -125,9 +139,9 @@ export default function PaginaRecuperarSenha() {
         case "finalizado":
             return (
             <>
-                <h2 className={styles.title}>Senha enviada!</h2>
+                <h2 className={styles.title}>Senha redefinida!</h2>
                 <p className={styles.subtitle}>
-                Sua nova senha foi enviada para o email informado. Recomendamos que você a altere após o login.
+                Sua senha foi redefinida. Faça login com a nova senha.
                 </p>
                 <div className={styles.finalActions}>
                 <Link to="/login/" className={styles.link}>
@@ -150,7 +164,7 @@ export default function PaginaRecuperarSenha() {
         {etapa !== "finalizado" && (
           <div className={styles.buttonRow}>
             <Button
-                label={isLoading ? "Aguarde..." : etapa === "email" ? "Enviar" : "Enviar token"}
+                label={isLoading ? "Aguarde..." : etapa === "email" ? "Enviar" : "Redefinir senha"}
                 type="submit"
                 disabled={isLoading}
             />
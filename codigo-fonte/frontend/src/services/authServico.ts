@@ -68,12 +68,12 @@ export const solicitarTokenRecuperacaoSenha = async (email: string): Promise<boo
 
 
 /**
- * Envia para a API o token de recuperação para validação.
- * Se der certo, envia a nova senha para o email do usuário.
+ * Envia para a API o token de recuperação e a nova senha escolhida pelo usuário.
+ * Se der certo, a senha é redefinida (a API apenas avisa por email, sem enviar a senha).
  * Se a chamada falhar, o erro será propagado para ser tratado.
  */
-export const validarTokenRecuperacao = async (email: string, token: string): Promise<boolean> => {
-  const resposta = await api.post('/auth/validar-token-redefinir-senha/', {"email": email, "token": token});
+export const validarTokenRecuperacao = async (email: string, token: string, novaSenha: string): Promise<boolean> => {
+  const resposta = await api.post('/auth/validar-token-redefinir-senha/', {"email": email, "token": token, "nova_senha": novaSenha});
   // A API de login retorna um objeto com uma chave "dados" que contém o usuário.
   if (resposta.status === 200) {
     return true;